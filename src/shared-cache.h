@@ -0,0 +1,17 @@
+#ifndef _SHARED_CACHE_H
+#define _SHARED_CACHE_H
+
+#include <stdint.h>
+
+/* Atomically increment the 64-bit integer at `p` and return its new value.
+   It is used for the clock of caches shared among processes, which is not
+   guarded by a lock. */
+#if defined(_MSC_VER)
+#include <intrin.h>
+#define shared_cache_tick(p) \
+  ((uint64_t)_InterlockedIncrement64((volatile __int64 *)(p)))
+#else
+#define shared_cache_tick(p) __sync_add_and_fetch((p), (uint64_t)1)
+#endif
+
+#endif /* _SHARED_CACHE_H */
@@ -394,6 +394,96 @@ PyObject *Giterate(hid_t parent_id, hid_t loc_id, const char *name) {
   return t;
 }
 
+/****************************************************************
+**
+**  namescb(): Link iteration callback routine for Gnames_iterate().
+**
+****************************************************************/
+typedef struct {
+  PyObject *names;
+  PyObject *types;
+  hsize_t  nmax;
+} names_info_t;
+
+herr_t namescb(hid_t loc_id, const char *name, const H5L_info_t *info,
+               void *data) {
+  names_info_t *ninfo = (names_info_t *)data;
+  PyObject *strname, *ltype;
+
+  strname = PyString_FromString(name);
+  ltype = PyLong_FromLong((long)info->type);
+  PyList_Append(ninfo->names, strname);
+  PyList_Append(ninfo->types, ltype);
+  Py_DECREF(strname);
+  Py_DECREF(ltype);
+
+  /* Stop the iteration once the batch is full */
+  if ((hsize_t)PyList_GET_SIZE(ninfo->names) >= ninfo->nmax)
+    return 1;
+  return 0;
+}
+
+/****************************************************************
+**
+**  Gnames_iterate(): Get a batch of link names of a group.
+**
+**  At most `nmax` links are listed, starting at position `*idx`
+**  of the name index; `*idx` is then set to the position where
+**  the iteration may be resumed.  The types of the objects are
+**  not looked up, only the types of the links.  The last item of
+**  the returned tuple tells whether all the links have been listed.
+**
+****************************************************************/
+PyObject *Gnames_iterate(hid_t loc_id, hsize_t *idx, hsize_t nmax) {
+  PyObject *t;
+  names_info_t ninfo;
+  H5G_info_t ginfo;
+  herr_t ret;
+
+  if (H5Gget_info(loc_id, &ginfo) < 0) {
+    Py_INCREF(Py_None);
+    return Py_None;
+  }
+
+  ninfo.names = PyList_New(0);
+  ninfo.types = PyList_New(0);
+  ninfo.nmax = nmax;
+
+  /* HDF5 does not accept starting the iteration past the last link */
+  if (*idx >= ginfo.nlinks)
+    ret = 0;
+  else
+    ret = H5Literate(loc_id, H5_INDEX_NAME, H5_ITER_NATIVE, idx,
+                     namescb, &ninfo);
+  if (ret < 0) {
+    Py_DECREF(ninfo.names);
+    Py_DECREF(ninfo.types);
+    Py_INCREF(Py_None);
+    return Py_None;
+  }
+
+  /* Create the tuple with the names, the link types and the end flag */
+  t = PyTuple_New(3);
+  PyTuple_SetItem(t, 0, ninfo.names);
+  PyTuple_SetItem(t, 1, ninfo.types);
+  PyTuple_SetItem(t, 2, PyBool_FromLong(ret == 0));
+
+  return t;
+}
+
+/****************************************************************
+**
+**  get_nlinks(): Get the number of links in a group.
+**
+****************************************************************/
+hssize_t get_nlinks(hid_t loc_id) {
+  H5G_info_t ginfo;
+
+  if (H5Gget_info(loc_id, &ginfo) < 0)
+    return -1;
+  return (hssize_t)ginfo.nlinks;
+}
+
 /****************************************************************
 **
 **  aitercb(): Custom attribute iteration callback routine.
@@ -1004,6 +1094,28 @@ ssize_t pt_H5Fget_file_image(hid_t file_id, void *buf_ptr, size_t buf_len) {
 #endif /* (H5_HAVE_IMAGE_FILE != 1) */
 
 
+#if (H5_HAVE_DIRECT_CHUNK != 1)
+/* HDF5 version < 1.10.3 */
+
+herr_t pt_H5Dget_chunk_storage_size(hid_t dset_id, const hsize_t *offset,
+                                    hsize_t *chunk_nbytes) {
+ return -1;
+}
+
+herr_t pt_H5Dread_chunk(hid_t dset_id, hid_t dxpl_id, const hsize_t *offset,
+                        uint32_t *filters, void *buf) {
+ return -1;
+}
+
+herr_t pt_H5Dwrite_chunk(hid_t dset_id, hid_t dxpl_id, uint32_t filters,
+                         const hsize_t *offset, size_t data_size,
+                         const void *buf) {
+ return -1;
+}
+
+#endif /* (H5_HAVE_DIRECT_CHUNK != 1) */
+
+
 #if H5_VERSION_LE(1,8,12)
 
 herr_t pt_H5free_memory(void *buf) {
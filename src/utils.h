@@ -52,6 +52,14 @@
 #define H5_HAVE_IMAGE_FILE 0
 #endif
 
+#if (H5_VERS_MAJOR == 1 && H5_VERS_MINOR == 10 && H5_VERS_RELEASE >= 3) || (H5_VERS_MAJOR == 1 && H5_VERS_MINOR > 10)
+/* HDF5 version >= 1.10.3 */
+#define H5_HAVE_DIRECT_CHUNK 1
+#else
+/* HDF5 version < 1.10.3 */
+#define H5_HAVE_DIRECT_CHUNK 0
+#endif
+
 /* COMAPTIBILITY: H5_VERSION_LE has been introduced in HDF5 1.8.7 */
 #ifndef H5_VERSION_LE
 #define H5_VERSION_LE(Maj,Min,Rel) \
@@ -92,6 +100,10 @@ int get_linkinfo(hid_t loc_id, const char *name);
 
 PyObject *Giterate(hid_t parent_id, hid_t loc_id, const char *name);
 
+PyObject *Gnames_iterate(hid_t loc_id, hsize_t *idx, hsize_t nmax);
+
+hssize_t get_nlinks(hid_t loc_id);
+
 PyObject *Aiterate(hid_t loc_id);
 
 H5T_class_t getHDF5ClassID(hid_t loc_id,
@@ -154,6 +166,23 @@ ssize_t pt_H5Fget_file_image(hid_t file_id, void *buf_ptr, size_t buf_len);
 #endif /* (H5_HAVE_IMAGE_FILE != 1) */
 
 
+#if (H5_HAVE_DIRECT_CHUNK != 1)
+/* HDF5 version < 1.10.3 */
+herr_t pt_H5Dget_chunk_storage_size(hid_t dset_id, const hsize_t *offset,
+                                    hsize_t *chunk_nbytes);
+herr_t pt_H5Dread_chunk(hid_t dset_id, hid_t dxpl_id, const hsize_t *offset,
+                        uint32_t *filters, void *buf);
+herr_t pt_H5Dwrite_chunk(hid_t dset_id, hid_t dxpl_id, uint32_t filters,
+                         const hsize_t *offset, size_t data_size,
+                         const void *buf);
+#else /* (H5_HAVE_DIRECT_CHUNK != 1) */
+/* HDF5 version >= 1.10.3 */
+#define pt_H5Dget_chunk_storage_size H5Dget_chunk_storage_size
+#define pt_H5Dread_chunk H5Dread_chunk
+#define pt_H5Dwrite_chunk H5Dwrite_chunk
+#endif /* (H5_HAVE_DIRECT_CHUNK != 1) */
+
+
 #if H5_VERSION_LE(1,8,12)
 herr_t pt_H5free_memory(void *buf);
 #else
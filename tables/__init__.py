@@ -126,7 +126,7 @@ from .table import Table, Cols, Column
 from .array import Array
 from .carray import CArray
 from .earray import EArray
-from .vlarray import VLArray
+from .vlarray import VLArray, PagedVLArray
 from .unimplemented import UnImplemented, Unknown
 from .expression import Expr
 from .tests import print_versions, test
@@ -170,6 +170,7 @@ __all__ = [
     'EnumCol',
     # Node classes:
     'Node', 'Group', 'Leaf', 'Table', 'Array', 'CArray', 'EArray', 'VLArray',
+    'PagedVLArray',
     'UnImplemented', 'Unknown',
     # The File class:
     'File',
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 18, 2026
+#
+# $Id$
+#
+########################################################################
+
+"""Asyncio front end for reading data from PyTables files.
+
+The reads of HDF5 data block the calling thread, so running them from
+a coroutine stalls the whole event loop.  This module dispatches the
+``read()``, ``read_coordinates()``, ``read_where()``, ``__getitem__()``
+and ``iter_batches()`` calls of :class:`Table`, :class:`Array` and
+:class:`VLArray` nodes to a bounded pool of threads tied to their
+:class:`File`, and returns awaitable futures for their results.  It is
+normally used through the ``aread*()``, ``agetitem()`` and
+``aiter_batches()`` methods of those classes.
+
+Since the nodes of a file are used from the pool threads while the
+event loop thread may keep using them too, only files opened with the
+``THREAD_SAFE`` parameter set (whose calls to HDF5 are serialized under
+:data:`tables.utils.hdf5_lock`) can be read through this module.
+
+Reads that are requested while an identical one (or, for ranges of
+rows, one that covers all the requested rows) is still running are
+coalesced: they wait for the running read and get a copy of (the
+relevant part of) its result instead of reading the data again.
+
+This module requires Python 3.5 or higher.
+
+"""
+
+from __future__ import absolute_import
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
+from .table import Table
+
+
+def get_reader(h5file):
+    """Get the :class:`FileReader` for the `h5file` file.
+
+    The reader is created the first time and shut down when the file is
+    closed.  A ValueError is raised if `h5file` was not opened with the
+    ``THREAD_SAFE`` parameter set.
+
+    """
+
+    h5file._check_open()
+    if h5file._v_lock is None:
+        raise ValueError("asynchronous reads require the file to be opened "
+                         "with the ``THREAD_SAFE`` parameter set")
+    reader = h5file._v_aio
+    if reader is None:
+        with _create_lock:
+            reader = h5file._v_aio
+            if reader is None:
+                reader = h5file._v_aio = FileReader(h5file)
+    return reader
+
+_create_lock = threading.Lock()
+
+
+def _copy_of(value):
+    """Get a copy of `value` not sharing memory with the original."""
+
+    if isinstance(value, numpy.ndarray):
+        return value.copy()
+    elif isinstance(value, list):
+        return list(value)
+    return value
+
+
+def _hashable_key(key):
+    """Get a hashable version of the `key` of ``__getitem__()``.
+
+    None is returned for keys (like lists or arrays of coordinates)
+    which are not worth comparing, so that their reads are never
+    coalesced.
+
+    """
+
+    if isinstance(key, slice):
+        return ('slice', key.start, key.stop, key.step)
+    elif isinstance(key, tuple):
+        keys = tuple(_hashable_key(k) for k in key)
+        if None in keys:
+            return None
+        return ('tuple',) + keys
+    elif key is Ellipsis or isinstance(key, (int, numpy.integer)):
+        return ('index', key)
+    return None
+
+
+class FileReader(object):
+    """Thread pool dispatching the blocking reads of a file.
+
+    Up to ``AIO_MAX_WORKERS`` threads are used.  The file must have been
+    opened with the ``THREAD_SAFE`` parameter set, so that its nodes can
+    be used concurrently from the pool and from any other thread.
+
+    Every method returns an asyncio future which must be awaited from
+    the event loop running in the calling thread.
+
+    """
+
+    def __init__(self, h5file):
+        self._executor = ThreadPoolExecutor(h5file.params['AIO_MAX_WORKERS'])
+        self._lock = threading.Lock()
+        self._pending = {}
+        """Running reads by (loop, node, call) key."""
+        self._pending_ranges = {}
+        """Running reads of ranges of rows by (loop, node, field) key."""
+
+        self.coalesced = 0
+        """The number of reads served from other running reads."""
+
+    def _follow(self, base, transform=None):
+        """Get a future for the result of `base`, after `transform`."""
+
+        loop = asyncio.get_event_loop()
+        out = loop.create_future()
+
+        def transfer(base):
+            if out.cancelled():
+                return
+            if base.cancelled():
+                out.cancel()
+            elif base.exception() is not None:
+                out.set_exception(base.exception())
+            elif transform is None:
+                out.set_result(base.result())
+            else:
+                try:
+                    out.set_result(transform(base.result()))
+                except Exception as exc:
+                    out.set_exception(exc)
+
+        base.add_done_callback(transfer)
+        return out
+
+    def _submit(self, key, func, *args):
+        """Run ``func(*args)`` in the pool, coalescing on `key`.
+
+        Reads with a None `key` are never coalesced.
+
+        """
+
+        loop = asyncio.get_event_loop()
+        if key is None:
+            return loop.run_in_executor(self._executor, func, *args)
+
+        key = (id(loop),) + key
+        with self._lock:
+            base = self._pending.get(key)
+            if base is not None:
+                self.coalesced += 1
+                return self._follow(base, _copy_of)
+            base = loop.run_in_executor(self._executor, func, *args)
+            self._pending[key] = base
+
+        def done(base):
+            with self._lock:
+                if self._pending.get(key) is base:
+                    del self._pending[key]
+
+        base.add_done_callback(done)
+        return self._follow(base)
+
+    def _submit_range(self, key, start, stop, func):
+        """Run ``func(start, stop)`` reading a range of rows.
+
+        The read is coalesced with any running read of a range (with the
+        same `key`) containing all the rows from `start` to `stop`.
+
+        """
+
+        loop = asyncio.get_event_loop()
+        key = (id(loop),) + key
+        with self._lock:
+            ranges = self._pending_ranges.setdefault(key, [])
+            for rstart, rstop, base in ranges:
+                if rstart <= start and stop <= rstop:
+                    self.coalesced += 1
+                    return self._follow(
+                        base, lambda result, i=start - rstart,
+                        j=stop - rstart: _copy_of(result[i:j]))
+            entry = (start, stop,
+                     loop.run_in_executor(self._executor, func, start, stop))
+            ranges.append(entry)
+
+        def done(base):
+            with self._lock:
+                ranges = self._pending_ranges.get(key, [])
+                if entry in ranges:
+                    ranges.remove(entry)
+                if not ranges:
+                    self._pending_ranges.pop(key, None)
+
+        entry[2].add_done_callback(done)
+        return self._follow(entry[2])
+
+    def read(self, node, start=None, stop=None, step=None, field=None):
+        """Get a future for ``node.read(start, stop, step[, field])``.
+
+        The `field` argument is only allowed for tables.
+
+        """
+
+        args = () if field is None else (field,)
+        if isinstance(node, Table):
+            start, stop, step = node._process_range(start, stop, step)
+        else:
+            start, stop, step = node._process_range_read(start, stop, step)
+        if step != 1 or start >= stop or getattr(node, 'maindim', 0) != 0:
+            return self._submit(None, node.read, start, stop, step, *args)
+
+        def read(start, stop):
+            return node.read(start, stop, 1, *args)
+
+        return self._submit_range(
+            (node._v_pathname, field), start, stop, read)
+
+    def read_coordinates(self, node, coords, field=None):
+        """Get a future for ``node.read_coordinates(coords, field)``."""
+
+        coords = numpy.asarray(coords)
+        key = ('coords', node._v_pathname, field,
+               coords.dtype.str, coords.tobytes())
+        return self._submit(key, node.read_coordinates, coords, field)
+
+    def read_where(self, node, condition, condvars, field=None,
+                   start=None, stop=None, step=None):
+        """Get a future for ``node.read_where(condition, condvars, ...)``.
+
+        All the variables in `condition` must be in `condvars`, since the
+        frame of the caller is not available from the pool threads.
+
+        """
+
+        key = [condition, field, start, stop, step]
+        for name in sorted(condvars):
+            value = condvars[name]
+            if hasattr(value, 'pathname'):
+                key.append((name, 'column', value.pathname))
+            elif isinstance(value, (int, float, bytes, str, numpy.generic)):
+                key.append((name, type(value), value))
+            else:
+                key = None
+                break
+        if key is not None:
+            key = ('where', node._v_pathname) + tuple(key)
+        return self._submit(key, node.read_where, condition, condvars,
+                            field, start, stop, step)
+
+    def getitem(self, node, key):
+        """Get a future for ``node[key]``."""
+
+        hkey = _hashable_key(key)
+        if hkey is not None:
+            hkey = ('getitem', node._v_pathname, hkey)
+        return self._submit(hkey, node.__getitem__, key)
+
+    def iter_batches(self, node, batch_rows=None, start=None, stop=None):
+        """Get an asynchronous iterator over batches of rows of `node`.
+
+        Every batch holds `batch_rows` rows (the ``nrowsinbuf`` buffer
+        size of the node by default) from `start` to `stop`, except maybe
+        the last one.  The next batch is read while the current one is
+        being used.
+
+        """
+
+        return BatchIterator(self, node, batch_rows, start, stop)
+
+    def iterate(self, iterator):
+        """Get an asynchronous iterator over the items of `iterator`.
+
+        Every item is fetched in the pool when the previous one has been
+        consumed.
+
+        """
+
+        return AsyncIterator(self, iterator)
+
+    def shutdown(self):
+        """Wait for the running reads and stop the threads."""
+
+        self._executor.shutdown(wait=True)
+
+
+class AsyncIterator(object):
+    """Asynchronous iterator fetching the items of an iterator in a pool.
+
+    Instances are returned by :meth:`FileReader.iterate`.
+
+    """
+
+    def __init__(self, reader, iterator):
+        self._reader = reader
+        self._iterator = iterator
+        self._exhausted = False
+
+    def _next(self):
+        # StopIteration can not be set as the exception of a future.
+        try:
+            return (True, next(self._iterator))
+        except StopIteration:
+            return (False, None)
+
+    def _unpack(self, result):
+        found, item = result
+        if not found:
+            self._exhausted = True
+            raise StopAsyncIteration
+        return item
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        if self._exhausted:
+            raise StopAsyncIteration
+        reader = self._reader
+        return reader._follow(reader._submit(None, self._next), self._unpack)
+
+
+class BatchIterator(object):
+    """Asynchronous iterator over batches of rows of a node.
+
+    Instances are returned by :meth:`FileReader.iter_batches`.
+
+    """
+
+    def __init__(self, reader, node, batch_rows, start, stop):
+        start, stop, step = node._process_range(start, stop, 1)
+        if batch_rows is None:
+            batch_rows = node.nrowsinbuf
+        if batch_rows < 1:
+            raise ValueError("``batch_rows`` must be a positive integer")
+        self._reader = reader
+        self._node = node
+        self._batch_rows = batch_rows
+        self._start = start
+        self._stop = stop
+        self._ahead = None
+
+    def _read_next(self):
+        """Start reading the next batch, or return None at the end."""
+
+        if self._start >= self._stop:
+            return None
+        start = self._start
+        stop = min(start + self._batch_rows, self._stop)
+        self._start = stop
+        return self._reader.read(self._node, start, stop, 1)
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = self._ahead
+        if future is None:
+            future = self._read_next()
+            if future is None:
+                raise StopAsyncIteration
+        self._ahead = self._read_next()
+        return future
@@ -22,7 +22,7 @@ from .filters import Filters
 from .flavor import flavor_of, array_as_internal, internal_to_flavor
 from .leaf import Leaf
 from .utils import (is_idx, convert_to_np_atom2, SizeType, lazyattr,
-                    byteorders, quantize)
+                    byteorders, quantize, synchronized)
 
 from six.moves import range
 from six.moves import zip
@@ -98,6 +98,25 @@ class Array(hdf5extension.Array, Leaf, six.Iterator):
 
         return self.atom.dtype
 
+    @lazyattr
+    def _v_memmap(self):
+        """A read-only ``numpy.memmap`` of the data in this array.
+
+        It is `None` when the data can not be mapped in memory (see
+        :meth:`Array.as_memmap`).
+
+        """
+
+        if (self._v_file.params['DRIVER'] not in (None, 'H5FD_SEC2') or
+                self.atom.kind == 'time' or 0 in self.shape or
+                self.byteorder not in (sys.byteorder, 'irrelevant')):
+            return None
+        offset = self._get_data_offset()
+        if offset is None:
+            return None
+        return numpy.memmap(self._v_file.filename, dtype=self.atom.dtype,
+                            mode='r', offset=offset, shape=self.shape)
+
     # Properties
     # ~~~~~~~~~~
 
@@ -746,19 +765,35 @@ class Array(hdf5extension.Array, Leaf, six.Iterator):
         else:
             return nparr
 
+    def _get_read_memmap(self):
+        """Get the memmap to read data from, if reads are mapped."""
+
+        if self._v_file.mode == 'r' and self._v_file.params['MMAP']:
+            return self._v_memmap
+        return None
+
+    @synchronized
     def _read_slice(self, startl, stopl, stepl, shape):
         """Read a slice based on `startl`, `stopl` and `stepl`."""
 
-        nparr = numpy.empty(dtype=self.atom.dtype, shape=shape)
-        # Protection against reading empty arrays
-        if 0 not in shape:
-            # Arrays that have non-zero dimensionality
-            self._g_read_slice(startl, stopl, stepl, nparr)
+        memmap = self._get_read_memmap()
+        if memmap is not None:
+            # Get a view of the data mapped in memory
+            key = tuple(slice(*s) for s in zip(startl, stopl, stepl))
+            nparr = memmap[key or Ellipsis].view(numpy.ndarray)
+            nparr = nparr.reshape(shape)
+        else:
+            nparr = numpy.empty(dtype=self.atom.dtype, shape=shape)
+            # Protection against reading empty arrays
+            if 0 not in shape:
+                # Arrays that have non-zero dimensionality
+                self._g_read_slice(startl, stopl, stepl, nparr)
         # For zero-shaped arrays, return the scalar
         if nparr.shape == ():
             nparr = nparr[()]
         return nparr
 
+    @synchronized
     def _read_coords(self, coords):
         """Read a set of points defined by `coords`."""
 
@@ -770,6 +805,7 @@ class Array(hdf5extension.Array, Leaf, six.Iterator):
             nparr = nparr[()]
         return nparr
 
+    @synchronized
     def _read_selection(self, selection, reorder, shape):
         """Read a `selection`.
 
@@ -826,6 +862,7 @@ class Array(hdf5extension.Array, Leaf, six.Iterator):
             nparr = nparr[k].copy()
         self._g_write_selection(selection, nparr)
 
+    @synchronized
     def _read(self, start, stop, step, out=None):
         """Read the array from disk without slice or flavor processing."""
 
@@ -833,6 +870,13 @@ class Array(hdf5extension.Array, Leaf, six.Iterator):
         shape = list(self.shape)
         if shape:
             shape[self.maindim] = nrowstoread
+        memmap = self._get_read_memmap()
+        if out is None and memmap is not None:
+            # Get a view of the data mapped in memory
+            key = [slice(None)] * len(shape)
+            if key:
+                key[self.maindim] = slice(start, stop, step)
+            return memmap[tuple(key) or Ellipsis].view(numpy.ndarray)
         if out is None:
             arr = numpy.empty(dtype=self.atom.dtype, shape=shape)
         else:
@@ -894,6 +938,82 @@ class Array(hdf5extension.Array, Leaf, six.Iterator):
         arr = self._read(start, stop, step, out)
         return internal_to_flavor(arr, self.flavor)
 
+    def aread(self, start=None, stop=None, step=None):
+        """Get an awaitable future for ``self.read(start, stop, step)``.
+
+        The read does not block the asyncio event loop, see
+        :meth:`Table.aread`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        return aio.get_reader(self._v_file).read(self, start, stop, step)
+
+    def agetitem(self, key):
+        """Get an awaitable future for ``self[key]``.
+
+        See :meth:`Array.aread`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        return aio.get_reader(self._v_file).getitem(self, key)
+
+    def aiter_batches(self, batch_rows=None, start=None, stop=None):
+        """Iterate asynchronously over the rows from *start* to *stop*.
+
+        Use it with ``async for``: every iteration yields an array with
+        *batch_rows* rows (by default, the :attr:`Leaf.nrowsinbuf` buffer
+        size of the array), except maybe the last one.  The next batch is
+        read in the thread pool of the file while the current one is used.
+        See :meth:`Array.aread`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        return aio.get_reader(self._v_file).iter_batches(
+            self, batch_rows, start, stop)
+
+    def as_memmap(self):
+        """Get the data in the array as a read-only ``numpy.memmap``.
+
+        The data of arrays stored contiguously in the file without any
+        filters (like the one of plain :class:`Array` objects) and in the
+        native byteorder is mapped in memory instead of being read, so
+        that it is only loaded from disk when it is accessed and the page
+        cache of the operating system is shared among all the processes
+        mapping the same file.  For any other array (e.g. a chunked or
+        compressed one), its data is read and returned as a regular NumPy
+        array.  The flavor of the array is not taken into account.
+
+        Reads from files opened in read-only mode with the ``MMAP``
+        parameter set use the same memory map.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        if self._v_file._iswritable():
+            # Make the data written so far visible in the file
+            self.flush()
+        memmap = self._v_memmap
+        if memmap is None:
+            return self._read(*self._process_range_read(None, None, None))
+        return memmap
+
     def _g_copy_with_stats(self, group, name, start, stop, step,
                            title, filters, chunkshape, _log, **kwargs):
         """Private part of Leaf.copy() for each kind of leaf."""
@@ -20,7 +20,7 @@ import six.moves.cPickle
 import numpy
 
 from . import hdf5extension
-from .utils import SizeType
+from .utils import SizeType, synchronized
 from .registry import class_name_dict
 from .exceptions import ClosedNodeError, PerformanceWarning
 from .path import check_attribute_name
@@ -96,7 +96,9 @@ class AttributeSet(hdf5extension.AttributeSet, object):
     (but not long nor unicode) values, as well as their NumPy scalar
     versions and homogeneous or *structured* NumPy arrays of them.  When
     read, these values are always loaded as NumPy scalar or array
-    objects, as needed.
+    objects, as needed.  Values are only read from the file (and
+    unpickled) when they are first accessed, unless the
+    ``EAGER_NODE_ATTRS`` parameter is set.
 
     For that reason, attributes in native HDF5 files will be always
     mapped into NumPy objects.  Specifically, a multidimensional
@@ -201,10 +203,18 @@ class AttributeSet(hdf5extension.AttributeSet, object):
         """The :class:`Node` instance this attribute set is associated with."""
         return self._g_getnode()
 
+    @property
+    def _v_lock(self):
+        """The lock serializing the HDF5 calls on the file of the node."""
+        nodefile = self.__dict__.get('_v__nodefile')
+        return None if nodefile is None else nodefile._v_lock
+
     def __init__(self, node):
         """Create the basic structures to keep the attribute information.
 
-        Reads all the HDF5 attributes (if any) on disk for the node "node".
+        Reads the names of all the HDF5 attributes (if any) on disk for the
+        node "node".  Their values are read when first accessed, unless the
+        ``EAGER_NODE_ATTRS`` parameter is set.
 
         Parameters
         ----------
@@ -241,10 +251,11 @@ class AttributeSet(hdf5extension.AttributeSet, object):
         # Split the attribute list in system and user lists
         dict_["_v_attrnamessys"] = []
         dict_["_v_attrnamesuser"] = []
+        eager = node._v_file.params['EAGER_NODE_ATTRS']
         for attr in self._v_attrnames:
-            # put the attributes on the local dictionary to allow
-            # tab-completion
-            self.__getattr__(attr)
+            if eager:
+                # put the attributes on the local dictionary
+                self.__getattr__(attr)
             if issysattrname(attr):
                 self._v_attrnamessys.append(attr)
             else:
@@ -265,6 +276,14 @@ class AttributeSet(hdf5extension.AttributeSet, object):
         self._g_new(node)
 
 
+    def __dir__(self):
+        """The attribute names (even if not read yet), for tab-completion."""
+
+        names = set(dir(type(self)))
+        names.update(self.__dict__)
+        names.update(self._v_attrnames)
+        return sorted(names)
+
     def _f_list(self, attrset='user'):
         """Get a list of attribute names.
 
@@ -282,6 +301,7 @@ class AttributeSet(hdf5extension.AttributeSet, object):
         elif attrset == "all":
             return self._v_attrnames[:]
 
+    @synchronized
     def __getattr__(self, name):
         """Get the attribute named "name"."""
 
@@ -498,9 +518,9 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
         else:
             self._v_attrnamesuser.remove(name)
 
-        # Delete the attribute from the local directory
-        # closes (#1049285)
-        del self.__dict__[name]
+        # Delete the attribute from the local directory (if it has been
+        # read) closes (#1049285)
+        self.__dict__.pop(name, None)
 
     def __delattr__(self, name):
         """Delete a PyTables attribute.
@@ -606,9 +626,11 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
             set_attr = newset._g__setattr
 
         for attrname in self._v_attrnamesuser:
-            # Do not copy the unimplemented attributes.
+            value = getattr(self, attrname)
+            # Do not copy the unimplemented attributes (which are only
+            # known after reading them).
             if attrname not in self._v_unimplemented:
-                set_attr(attrname, getattr(self, attrname))
+                set_attr(attrname, value)
         # Copy the system attributes that we are allowed to.
         if copysysattrs:
             for attrname in self._v_attrnamessys:
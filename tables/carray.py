@@ -266,22 +266,24 @@ class CArray(Array):
         object = CArray(group, name, atom=self.atom, shape=shape,
                         title=title, filters=filters, chunkshape=chunkshape,
                         _log=_log)
-        # Start the copy itself
-        for start2 in range(start, stop, step * nrowsinbuf):
-            # Save the records on disk
-            stop2 = start2 + step * nrowsinbuf
-            if stop2 > stop:
-                stop2 = stop
-            # Set the proper slice in the main dimension
-            slices[maindim] = slice(start2, stop2, step)
-            start3 = (start2 - start) // step
-            stop3 = start3 + nrowsinbuf
-            if stop3 > shape[maindim]:
-                stop3 = shape[maindim]
-            # The next line should be generalised if, in the future,
-            # maindim is designed to be different from 0 in CArrays.
-            # See ticket #199.
-            object[start3:stop3] = self.__getitem__(tuple(slices))
+        # Copy the chunks as they are if possible, or else the data
+        if not self._g_copy_chunks(object, start, stop, step):
+            # Start the copy itself
+            for start2 in range(start, stop, step * nrowsinbuf):
+                # Save the records on disk
+                stop2 = start2 + step * nrowsinbuf
+                if stop2 > stop:
+                    stop2 = stop
+                # Set the proper slice in the main dimension
+                slices[maindim] = slice(start2, stop2, step)
+                start3 = (start2 - start) // step
+                stop3 = start3 + nrowsinbuf
+                if stop3 > shape[maindim]:
+                    stop3 = shape[maindim]
+                # The next line should be generalised if, in the future,
+                # maindim is designed to be different from 0 in CArrays.
+                # See ticket #199.
+                object[start3:stop3] = self.__getitem__(tuple(slices))
         # Activate the conversion again (default)
         self._v_convert = True
         nbytes = numpy.prod(self.shape, dtype=SizeType) * self.atom.size
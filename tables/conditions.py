@@ -68,8 +68,8 @@ def _check_indexable_cmp(getidxcmp):
 
     """
 
-    def newfunc(exprnode, indexedcols):
-        result = getidxcmp(exprnode, indexedcols)
+    def newfunc(exprnode, indexedcols, eqonlycols=frozenset()):
+        result = getidxcmp(exprnode, indexedcols, eqonlycols)
         if result[0] is not None:
             try:
                 typeCompileAst(expressionToAST(exprnode))
@@ -83,14 +83,15 @@ def _check_indexable_cmp(getidxcmp):
 
 
 @_check_indexable_cmp
-def _get_indexable_cmp(exprnode, indexedcols):
+def _get_indexable_cmp(exprnode, indexedcols, eqonlycols=frozenset()):
     """Get the indexable variable-constant comparison in `exprnode`.
 
     A tuple of (variable, operation, constant) is returned if
     `exprnode` is a variable-constant (or constant-variable)
     comparison, and the variable is in `indexedcols`.  A normal
     variable can also be used instead of a constant: a tuple with its
-    name will appear instead of its value.
+    name will appear instead of its value.  Variables also in
+    `eqonlycols` are only indexable in equality comparisons.
 
     Otherwise, the values in the tuple are ``None``.
     """
@@ -105,6 +106,7 @@ def _get_indexable_cmp(exprnode, indexedcols):
     def get_cmp(var, const, op):
         var_value, const_value = var.value, const.value
         if (var.astType == 'variable' and var_value in indexedcols
+           and (op == 'eq' or var_value not in eqonlycols)
            and const.astType in ['constant', 'variable']):
             if const.astType == 'variable':
                 const_value = (const_value, )
@@ -168,7 +170,8 @@ def _equiv_expr_node(x, y):
     return True
 
 
-def _get_idx_expr_recurse(exprnode, indexedcols, idxexprs, strexpr):
+def _get_idx_expr_recurse(exprnode, indexedcols, idxexprs, strexpr,
+                          eqonlycols=frozenset()):
     """Here lives the actual implementation of the get_idx_expr() wrapper.
 
     'idxexprs' is a list of expressions in the form ``(var, (ops),
@@ -201,11 +204,11 @@ def _get_idx_expr_recurse(exprnode, indexedcols, idxexprs, strexpr):
             invert ^= True
             # The information about the negated node is in first position
             exprnode = idxcmp[0]
-            idxcmp = _get_indexable_cmp(exprnode, indexedcols)
+            idxcmp = _get_indexable_cmp(exprnode, indexedcols, eqonlycols)
         return idxcmp, exprnode, invert
 
     # Indexable variable-constant comparison.
-    idxcmp = _get_indexable_cmp(exprnode, indexedcols)
+    idxcmp = _get_indexable_cmp(exprnode, indexedcols, eqonlycols)
     idxcmp, exprnode, invert = fix_invert(idxcmp, exprnode, indexedcols)
     if idxcmp[0]:
         if invert:
@@ -213,6 +216,8 @@ def _get_idx_expr_recurse(exprnode, indexedcols, idxexprs, strexpr):
             if op == 'eq' and value in [True, False]:
                 # ``var`` must be a boolean index.  Flip its value.
                 value ^= True
+            elif var in eqonlycols:
+                return not_indexable
             else:
                 op = negcmp[op]
             expr = (var, (op,), (value,))
@@ -234,9 +239,9 @@ def _get_idx_expr_recurse(exprnode, indexedcols, idxexprs, strexpr):
 
     left, right = exprnode.children
     # Get the expression at left
-    lcolvar, lop, llim = _get_indexable_cmp(left, indexedcols)
+    lcolvar, lop, llim = _get_indexable_cmp(left, indexedcols, eqonlycols)
     # Get the expression at right
-    rcolvar, rop, rlim = _get_indexable_cmp(right, indexedcols)
+    rcolvar, rop, rlim = _get_indexable_cmp(right, indexedcols, eqonlycols)
 
     # Use conjunction of indexable VC comparisons like
     # ``(a <[=] x) & (x <[=] b)`` or ``(a >[=] x) & (x >[=] b)``
@@ -252,8 +257,10 @@ def _get_idx_expr_recurse(exprnode, indexedcols, idxexprs, strexpr):
             return [expr]
 
     # Recursively get the expressions at the left and the right
-    lexpr = _get_idx_expr_recurse(left, indexedcols, idxexprs, strexpr)
-    rexpr = _get_idx_expr_recurse(right, indexedcols, idxexprs, strexpr)
+    lexpr = _get_idx_expr_recurse(left, indexedcols, idxexprs, strexpr,
+                                  eqonlycols)
+    rexpr = _get_idx_expr_recurse(right, indexedcols, idxexprs, strexpr,
+                                  eqonlycols)
 
     def add_expr(expr, idxexprs, strexpr):
         """Add a single expression to the list."""
@@ -284,11 +291,12 @@ def _get_idx_expr_recurse(exprnode, indexedcols, idxexprs, strexpr):
     return not_indexable
 
 
-def _get_idx_expr(expr, indexedcols):
+def _get_idx_expr(expr, indexedcols, eqonlycols=frozenset()):
     """Extract an indexable expression out of `exprnode`.
 
     Looks for variable-constant comparisons in the expression node
-    `exprnode` involving variables in `indexedcols`.
+    `exprnode` involving variables in `indexedcols`.  Variables also
+    in `eqonlycols` are only considered in ``==`` comparisons.
 
     It returns a tuple of (idxexprs, strexpr) where 'idxexprs' is a
     list of expressions in the form ``(var, (ops), (limits))`` and
@@ -313,7 +321,7 @@ def _get_idx_expr(expr, indexedcols):
 
     """
 
-    return _get_idx_expr_recurse(expr, indexedcols, [], [''])
+    return _get_idx_expr_recurse(expr, indexedcols, [], [''], eqonlycols)
 
 
 class CompiledCondition(object):
@@ -388,13 +396,17 @@ def _get_variable_names(expression):
     return list(set(names))  # remove repeated names
 
 
-def compile_condition(condition, typemap, indexedcols):
+def compile_condition(condition, typemap, indexedcols,
+                      eqonlycols=frozenset()):
     """Compile a condition and extract usable index conditions.
 
     Looks for variable-constant comparisons in the `condition` string
     involving the indexed columns whose variable names appear in
     `indexedcols`.  The part of `condition` having usable indexes is
     returned as a compiled condition in a `CompiledCondition` container.
+    Indexed columns whose variable names also appear in `eqonlycols`
+    (e.g. those only having Bloom filters) are only used for ``==``
+    comparisons.
 
     Expressions such as '0 < c1 <= 1' do not work as expected.  The
     Numexpr types of *all* variables must be given in the `typemap`
@@ -409,7 +421,7 @@ def compile_condition(condition, typemap, indexedcols):
     if expr.astKind != 'bool':
         raise TypeError("condition ``%s`` does not have a boolean type"
                         % condition)
-    idxexprs = _get_idx_expr(expr, indexedcols)
+    idxexprs = _get_idx_expr(expr, indexedcols, eqonlycols)
     # Post-process the answer
     if isinstance(idxexprs, list):
         # Simple expression
@@ -24,6 +24,7 @@ cdef extern from "time.h":
   ctypedef int time_t
 
 from libc.stdio cimport FILE
+from libc.stdint cimport uint32_t
 
 
 #-----------------------------------------------------------------------------
@@ -58,6 +59,7 @@ cdef extern from "hdf5.h" nogil:
   int H5F_ACC_TRUNC, H5F_ACC_RDONLY, H5F_ACC_RDWR, H5F_ACC_EXCL
   int H5F_ACC_DEBUG, H5F_ACC_CREAT
   int H5P_DEFAULT, H5P_DATASET_XFER, H5S_ALL
+  haddr_t HADDR_UNDEF
   int H5P_FILE_CREATE, H5P_FILE_ACCESS
   int H5FD_LOG_LOC_WRITE, H5FD_LOG_ALL
   int H5I_INVALID_HID
@@ -326,6 +328,7 @@ cdef extern from "hdf5.h" nogil:
                          void *buf)
   hid_t H5Dget_create_plist(hid_t dataset_id)
   hsize_t H5Dget_storage_size(hid_t dataset_id)
+  haddr_t H5Dget_offset(hid_t dset_id)
   herr_t H5Dvlen_get_buf_size(hid_t dataset_id, hid_t type_id, hid_t space_id,
                               hsize_t *size)
 
@@ -396,6 +399,7 @@ cdef extern from "hdf5.h" nogil:
   herr_t H5Pset_sieve_buf_size(hid_t fapl_id, hsize_t size)
   H5D_layout_t H5Pget_layout(hid_t plist)
   int H5Pget_chunk(hid_t plist, int max_ndims, hsize_t *dims)
+  int H5Pget_external_count(hid_t plist)
 
   hid_t H5Pget_driver(hid_t plist_id)
   herr_t H5Pset_fapl_sec2(hid_t fapl_id)
@@ -495,6 +499,7 @@ cdef extern from "utils.h" nogil:
   herr_t set_cache_size(hid_t file_id, size_t cache_size)
   int get_objinfo(hid_t loc_id, char *name)
   int get_linkinfo(hid_t loc_id, char *name)
+  hssize_t get_nlinks(hid_t loc_id)
   hsize_t get_len_of_range(hsize_t lo, hsize_t hi, hsize_t step)
   hid_t  create_ieee_float16(char *byteorder)
   hid_t  create_ieee_complex64(char *byteorder)
@@ -513,12 +518,20 @@ cdef extern from "utils.h" nogil:
   herr_t pt_H5Pset_file_image(hid_t fapl_id, void *buf_ptr, size_t buf_len)
   ssize_t pt_H5Fget_file_image(hid_t file_id, void *buf_ptr, size_t buf_len)
   herr_t pt_H5free_memory(void *buf)
+  herr_t pt_H5Dget_chunk_storage_size(hid_t dset_id, hsize_t *offset,
+                                      hsize_t *chunk_nbytes)
+  herr_t pt_H5Dread_chunk(hid_t dset_id, hid_t dxpl_id, hsize_t *offset,
+                          uint32_t *filters, void *buf)
+  herr_t pt_H5Dwrite_chunk(hid_t dset_id, hid_t dxpl_id, uint32_t filters,
+                           hsize_t *offset, size_t data_size, void *buf)
 
   int H5_HAVE_DIRECT_DRIVER, H5_HAVE_WINDOWS_DRIVER, H5_HAVE_IMAGE_FILE
+  int H5_HAVE_DIRECT_CHUNK
 
 
 cdef extern from "utils.h":
   object Giterate(hid_t parent_id, hid_t loc_id, char *name)
+  object Gnames_iterate(hid_t loc_id, hsize_t *idx, hsize_t nmax)
   object Aiterate(hid_t loc_id)
   object H5UIget_info(hid_t loc_id, char *name, char *byteorder)
 
@@ -235,15 +235,17 @@ class EArray(CArray):
         # This is a hack to prevent doing unnecessary conversions
         # when copying buffers
         self._v_convert = False
-        # Start the copy itself
-        for start2 in range(start, stop, step * nrowsinbuf):
-            # Save the records on disk
-            stop2 = start2 + step * nrowsinbuf
-            if stop2 > stop:
-                stop2 = stop
-            # Set the proper slice in the extensible dimension
-            slices[maindim] = slice(start2, stop2, step)
-            object._append(self.__getitem__(tuple(slices)))
+        # Copy the chunks as they are if possible, or else the data
+        if not self._g_copy_chunks(object, start, stop, step):
+            # Start the copy itself
+            for start2 in range(start, stop, step * nrowsinbuf):
+                # Save the records on disk
+                stop2 = start2 + step * nrowsinbuf
+                if stop2 > stop:
+                    stop2 = stop
+                # Set the proper slice in the extensible dimension
+                slices[maindim] = slice(start2, stop2, step)
+                object._append(self.__getitem__(tuple(slices)))
         # Active the conversion again (default)
         self._v_convert = True
         nbytes = numpy.prod(self.shape, dtype=SizeType) * self.atom.itemsize
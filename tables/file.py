@@ -25,6 +25,9 @@ from __future__ import absolute_import
 import os
 import sys
 import time
+import struct
+import hashlib
+import tempfile
 import weakref
 import warnings
 import collections
@@ -51,10 +54,10 @@ from .leaf import Leaf
 from .array import Array
 from .carray import CArray
 from .earray import EArray
-from .vlarray import VLArray
+from .vlarray import VLArray, PagedVLArray
 from .table import Table
 from . import linkextension
-from .utils import detect_number_of_cores
+from .utils import detect_number_of_cores, hdf5_lock, synchronized
 from . import lrucacheextension
 from .flavor import flavor_of, array_as_internal
 from .atom import Atom
@@ -177,6 +180,35 @@ _shadow_name = 'a%d'  # %d -> action number
 _shadow_path = join_path(_shadow_parent, _shadow_name)
 
 
+# Caches shared among processes opened by this process (keys are paths)
+_shared_caches = {}
+
+
+def _get_shared_cache(params):
+    """Get the cache shared among processes set up in `params`, or None."""
+
+    if params['SHARED_CACHE_SIZE'] <= 0:
+        return None
+    path = params['SHARED_CACHE_NAME']
+    if not os.path.isabs(path):
+        shmdir = '/dev/shm'
+        if not os.path.isdir(shmdir):
+            shmdir = tempfile.gettempdir()
+        path = os.path.join(shmdir, path)
+    cache = _shared_caches.get(path)
+    if cache is None:
+        try:
+            cache = lrucacheextension.SharedCache(
+                path, params['SHARED_CACHE_SIZE'],
+                params['SHARED_CACHE_SET_SIZE'])
+        except (NotImplementedError, ValueError, EnvironmentError) as exc:
+            warnings.warn("the shared cache ``%s`` can not be used: %s"
+                          % (path, exc), PerformanceWarning)
+            return None
+        _shared_caches[path] = cache
+    return cache
+
+
 def _checkfilters(filters):
     if not (filters is None or
             isinstance(filters, Filters)):
@@ -361,14 +393,69 @@ class _DictCache(dict):
         super(_DictCache, self).__setitem__(key, value)
 
 
+class _SizedNodeCache(object):
+    """LRU cache of nodes limited in number and in estimated size.
+
+    This wraps a `NodeCache` with `nslots` slots.  If `maxsize` is not
+    zero, the memory kept alive by each cached node is estimated (see
+    `Node._g_get_cache_cost()`) and least recently used nodes are evicted
+    so that the total stays under `maxsize` bytes.  The most recently
+    cached node is always kept, even if it is larger than `maxsize`.
+
+    """
+
+    def __init__(self, nslots, maxsize=0):
+        self._cache = lrucacheextension.NodeCache(nslots)
+        self.nslots = nslots
+        self.maxsize = maxsize
+        self.size = 0
+        self.costs = {}
+        self.nevictions = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __iter__(self):
+        return iter(self._cache)
+
+    def __setitem__(self, key, node):
+        cache = self._cache
+        if key in cache:
+            self.pop(key)
+        cost = node._g_get_cache_cost() if self.maxsize else 0
+        # Evict least recently used nodes (the first ones) until the new
+        # node fits.
+        while len(cache) > 0 and (
+                len(cache) >= self.nslots or
+                self.size + cost > self.maxsize > 0):
+            self.pop(next(iter(cache)))
+            self.nevictions += 1
+        cache[key] = node
+        self.costs[key] = cost
+        self.size += cost
+
+    __marker = object()
+
+    def pop(self, key, d=__marker):
+        if d is self.__marker:
+            node = self._cache.pop(key)
+        else:
+            node = self._cache.pop(key, d)
+        self.size -= self.costs.pop(key, 0)
+        return node
+
+
 class NodeManager(object):
-    def __init__(self, nslots=64, node_factory=None):
+    def __init__(self, nslots=64, node_factory=None, maxsize=0):
         super(NodeManager, self).__init__()
 
         self.registry = weakref.WeakValueDictionary()
 
         if nslots > 0:
-            cache = lrucacheextension.NodeCache(nslots)
+            cache = _SizedNodeCache(nslots, maxsize)
         elif nslots == 0:
             cache = _NoCache()
         else:
@@ -377,9 +464,38 @@ class NodeManager(object):
 
         self.cache = cache
 
+        # Nodes which are always kept in memory, out of the cache.
+        self.pinned = {}
+
+        # Statistics of node lookups.
+        self.hits = 0
+        self.misses = 0
+
         # node_factory(node_path)
         self.node_factory = node_factory
 
+    def pin_node(self, node):
+        key = node._v_pathname
+        self.cache.pop(key, None)
+        self.pinned[key] = node
+
+    def unpin_node(self, node):
+        key = node._v_pathname
+        if self.pinned.pop(key, None) is not None and node._v_isopen:
+            self.cache_node(node, key)
+
+    def get_stats(self):
+        cache = self.cache
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': getattr(cache, 'nevictions', 0),
+            'nodes': len(cache),
+            'size': getattr(cache, 'size', 0),
+            'maxsize': getattr(cache, 'maxsize', 0),
+            'pinned': len(self.pinned),
+        }
+
     def register_node(self, node, key):
         if key is None:
             key = node._v_pathname
@@ -387,6 +503,9 @@ class NodeManager(object):
         if key in self.registry:
             if not self.registry[key]._v_isopen:
                 del self.registry[key]
+            elif self.registry[key]._v__deleting:
+                # Replace a node being killed by another thread.
+                self.registry[key] = node
             elif self.registry[key] is not node:
                 raise RuntimeError('trying to register a node with an '
                                    'existing key: ``%s``' % key)
@@ -398,6 +517,8 @@ class NodeManager(object):
             key = node._v_pathname
 
         self.register_node(node, key)
+        if key in self.pinned:
+            return
         if key in self.cache:
             oldnode = self.cache.pop(key)
             if oldnode is not node and oldnode._v_isopen:
@@ -407,10 +528,16 @@ class NodeManager(object):
         self.cache[key] = node
 
     def get_node(self, key):
+        node = self.pinned.get(key)
+        if node is not None:
+            self.hits += 1
+            return node
+
         node = self.cache.pop(key, None)
         if node is not None:
             if node._v_isopen:
                 self.cache_node(node, key)
+                self.hits += 1
                 return node
             else:
                 # this should not happen
@@ -423,9 +550,14 @@ class NodeManager(object):
                 # dead weakrefs
                 warnings.warn("None is stored in the registry for key: "
                               "``%s``" % key)
-            elif node._v_isopen:
+            elif node._v_isopen and not node._v__deleting:
                 self.cache_node(node, key)
+                self.hits += 1
                 return node
+            elif node._v_isopen:
+                # The node is being killed by another thread, which is
+                # waiting for the lock of the file: load a new one.
+                node = None
             else:
                 # this should not happen
                 warnings.warn("a closed node found in the registry: "
@@ -434,13 +566,14 @@ class NodeManager(object):
                 node = None
 
         if self.node_factory:
+            self.misses += 1
             node = self.node_factory(key)
             self.cache_node(node, key)
 
         return node
 
     def rename_node(self, oldkey, newkey):
-        for cache in (self.cache, self.registry):
+        for cache in (self.pinned, self.cache, self.registry):
             if oldkey in cache:
                 node = cache.pop(oldkey)
                 cache[newkey] = node
@@ -450,6 +583,7 @@ class NodeManager(object):
 
         # Remove the node from the cache.
         self.cache.pop(nodepath, None)
+        self.pinned.pop(nodepath, None)
 
     def drop_node(self, node, check_unregistered=True):
         """Drop the `node`.
@@ -704,6 +838,13 @@ class File(hdf5extension.File, object):
     # The top level kinds. Group must go first!
     _node_kinds = ('Group', 'Leaf', 'Link', 'Unknown')
 
+    # The lock serializing the calls to HDF5 (see ``THREAD_SAFE``), or
+    # None.  It is also looked up by the nodes and their attribute sets.
+    _v_lock = None
+    # The thread pool reading data for tables.aio, or None until it is
+    # first used.
+    _v_aio = None
+
     @property
     def title(self):
         "The title of the root group in the file."
@@ -777,10 +918,37 @@ class File(hdf5extension.File, object):
         if params['MAX_BLOSC_THREADS'] is None:
             params['MAX_BLOSC_THREADS'] = detect_number_of_cores()
 
+        if params['MAX_INDEX_THREADS'] is None:
+            params['MAX_INDEX_THREADS'] = detect_number_of_cores()
+
         self.params = params
 
+        if params['THREAD_SAFE'] and mode != 'r':
+            raise ValueError("the ``THREAD_SAFE`` parameter is only allowed "
+                             "for files opened in read-only mode ('r')")
+        self._v_lock = hdf5_lock if params['THREAD_SAFE'] else None
+
         # Now, it is time to initialize the File extension
-        self._g_new(filename, mode, **params)
+        if self._v_lock is None:
+            self._g_new(filename, mode, **params)
+        else:
+            with self._v_lock:
+                self._g_new(filename, mode, **params)
+
+        # The cache of decompressed data shared with other processes is
+        # only safe for files which are not being modified.
+        self._v_shared_cache = None
+        if mode == 'r' and params['DRIVER'] is None:
+            self._v_shared_cache = _get_shared_cache(params)
+        if self._v_shared_cache is not None:
+            # Identify the file (and its version) among processes
+            try:
+                stat = os.stat(filename)
+            except EnvironmentError:
+                self._v_shared_cache = None
+            else:
+                self._v_shared_cache_id = '%d:%d:%d:%r' % (
+                    stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime)
 
         # Check filters and set PyTables format version for new files.
         new = self._v_new
@@ -793,7 +961,8 @@ class File(hdf5extension.File, object):
         # initialization but the node_factory attribute is set onl later
         # because it is a bount method of the root grop itself.
         node_cache_slots = params['NODE_CACHE_SLOTS']
-        self._node_manager = NodeManager(nslots=node_cache_slots)
+        self._node_manager = NodeManager(nslots=node_cache_slots,
+                                         maxsize=params['NODE_CACHE_SIZE'])
 
         # For the moment Undo/Redo is not enabled.
         self._undoEnabled = False
@@ -833,6 +1002,7 @@ class File(hdf5extension.File, object):
         # Set the maximum number of threads for Numexpr
         numexpr.set_vml_num_threads(params['MAX_NUMEXPR_THREADS'])
 
+    @synchronized
     def __get_root_group(self, root_uep, title, filters):
         """Returns a Group instance which will act as the root group in the
         hierarchical tree.
@@ -1356,7 +1526,7 @@ class File(hdf5extension.File, object):
     def create_vlarray(self, where, name, atom=None, title="",
                        filters=None, expectedrows=None,
                        chunkshape=None, byteorder=None,
-                       createparents=False, obj=None):
+                       createparents=False, obj=None, storage='heap'):
         """Create a new variable-length array.
 
         Parameters
@@ -1419,6 +1589,16 @@ class File(hdf5extension.File, object):
 
             .. versionadded:: 3.0
 
+        storage : str, optional
+            How rows are stored.  With 'heap' (the default), a
+            :class:`VLArray` is created, and each row is kept as an HDF5
+            variable-length object.  With 'paged', a
+            :class:`PagedVLArray` is created, which keeps the atoms of all
+            the rows in a single chunked array, so that they are
+            compressed by the filters and read sequentially.
+
+            .. versionadded:: 3.3
+
         See Also
         --------
         VLArray : for more informationon variable-length arrays
@@ -1441,12 +1621,20 @@ class File(hdf5extension.File, object):
         elif atom is None:
             raise ValueError('atom parameter cannot be None')
 
+        if storage == 'heap':
+            VLArrayClass = VLArray
+        elif storage == 'paged':
+            VLArrayClass = PagedVLArray
+        else:
+            raise ValueError("storage must be 'heap' or 'paged', not %r"
+                             % (storage,))
+
         parentnode = self._get_or_create_path(where, createparents)
         _checkfilters(filters)
-        ptobj = VLArray(parentnode, name,
-                        atom=atom, title=title, filters=filters,
-                        expectedrows=expectedrows,
-                        chunkshape=chunkshape, byteorder=byteorder)
+        ptobj = VLArrayClass(parentnode, name,
+                             atom=atom, title=title, filters=filters,
+                             expectedrows=expectedrows,
+                             chunkshape=chunkshape, byteorder=byteorder)
 
         if obj is not None:
             ptobj.append(obj)
@@ -1534,6 +1722,25 @@ class File(hdf5extension.File, object):
         return elink
 
 
+    def _get_shared_cache(self, node, kind):
+        """Get the cache shared among processes for `kind` data of `node`.
+
+        A ``(cache, key)`` tuple is returned, where `key` identifies that
+        data of the node in this very file (see
+        :class:`lrucacheextension.SharedCache`).  `cache` is None if no
+        shared cache is used for this file.
+
+        """
+
+        cache = self._v_shared_cache
+        if cache is None:
+            return None, 0
+        ident = '%s:%s:%s' % (self._v_shared_cache_id, node._v_pathname, kind)
+        digest = hashlib.md5(ident.encode('utf-8')).digest()
+        # Zero is reserved for free slots
+        return cache, struct.unpack('<Q', digest[:8])[0] | 1
+
+    @synchronized
     def _get_node(self, nodepath):
         # The root node is always at hand.
         if nodepath == '/':
@@ -1624,6 +1831,67 @@ class File(hdf5extension.File, object):
         return self.get_node(path)._f_isvisible()
 
 
+    @synchronized
+    def pin_node(self, where, name=None):
+        """Keep the node specified by where and name always loaded.
+
+        Pinned nodes are kept in memory out of the node cache, so they
+        are neither evicted by other nodes nor accounted in its limits
+        (see :data:`parameters.NODE_CACHE_SLOTS` and
+        :data:`parameters.NODE_CACHE_SIZE`).  This is useful for nodes
+        which are accessed very often.  Use :meth:`File.unpin_node` to
+        return the node to the cache.
+
+        The where and name arguments work as in :meth:`File.get_node`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        node = self.get_node(where, name=name)
+        if node is not self.root:
+            self._node_manager.pin_node(node)
+
+
+    @synchronized
+    def unpin_node(self, where, name=None):
+        """Return a node pinned with :meth:`File.pin_node` to the node cache.
+
+        The where and name arguments work as in :meth:`File.get_node`.
+        Nothing is done if the node is not pinned.
+
+        .. versionadded:: 3.3
+
+        """
+
+        node = self.get_node(where, name=name)
+        self._node_manager.unpin_node(node)
+
+
+    @synchronized
+    def get_node_cache_stats(self):
+        """Return statistics about the cache of loaded nodes.
+
+        A dictionary is returned with the following keys:
+
+        * ``hits``: number of node lookups served by already loaded nodes.
+        * ``misses``: number of node lookups which loaded nodes from disk.
+        * ``evictions``: number of nodes evicted from the cache.
+        * ``nodes``: number of nodes currently in the cache.
+        * ``size``: estimated memory (in bytes) kept alive by the nodes in
+          the cache (only computed when :data:`parameters.NODE_CACHE_SIZE`
+          is not zero).
+        * ``maxsize``: the value of :data:`parameters.NODE_CACHE_SIZE`.
+        * ``pinned``: number of nodes pinned with :meth:`File.pin_node`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._check_open()
+        return self._node_manager.get_stats()
+
+
     def rename_node(self, where, newname, name=None, overwrite=False):
         """Change the name of the node specified by where and name to newname.
 
@@ -2654,6 +2922,14 @@ class File(hdf5extension.File, object):
     def close(self):
         """Flush all the alive leaves in object tree and close the file."""
 
+        # Wait for the reads dispatched by tables.aio, which may need the
+        # lock of the file to finish.
+        if self._v_aio is not None and self.isopen and self._open_count <= 1:
+            self._v_aio.shutdown()
+        self._g_close()
+
+    @synchronized
+    def _g_close(self):
         # If the file is already closed, return immediately
         if not self.isopen:
             return
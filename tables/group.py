@@ -24,10 +24,11 @@ from .registry import class_id_dict
 from .exceptions import NodeError, NoSuchNodeError, NaturalNameWarning, PerformanceWarning
 from .filters import Filters
 from .registry import get_class_by_name
-from .path import check_name_validity, join_path, isvisiblename
+from .path import check_name_validity, join_path, split_path, isvisiblename
 from .node import Node, NotLoggedMixin
 from .leaf import Leaf
 from .unimplemented import UnImplemented, Unknown
+from .utils import synchronized
 
 from .link import Link, SoftLink, ExternalLink
 import six
@@ -40,6 +41,34 @@ class _ChildrenDict(ProxyDict):
     def _get_value_from_container(self, container, key):
         return container._f_get_child(key)
 
+    def _iter_loaded(self, keys):
+        """Iterate over the (key, node) pairs of `keys`.
+
+        Named datatypes are dropped from the children of a group when
+        they are first loaded (their names are listed with the rest),
+        so they are skipped here.
+
+        """
+
+        for key in keys:
+            try:
+                value = self[key]
+            except (KeyError, NoSuchNodeError):
+                if key in self:
+                    raise
+                continue
+            yield key, value
+
+    def items(self):
+        return list(self._iter_loaded(list(self)))
+
+    def values(self):
+        return [value for key, value in self._iter_loaded(list(self))]
+
+    def itervalues(self):
+        for key, value in self._iter_loaded(list(self)):
+            yield value
+
 
 
 class Group(hdf5extension.Group, Node):
@@ -165,6 +194,13 @@ class Group(hdf5extension.Group, Node):
         '__members__', '_v_children', '_v_groups', '_v_leaves',
         '_v_links', '_v_unknown', '_v_hidden')
 
+    # Children containers which require looking up the kind of every
+    # child.  These are documented in ``Group._g_add_children_kinds``.
+    _c_lazy_kinds_attrs = ('_v_groups', '_v_leaves', '_v_unknown')
+
+    # The number of child names got from HDF5 at a time.
+    _c_names_batch_size = 1024
+
     # `_v_nchildren` is a direct read-only shorthand
     # for the number of *visible* children in a group.
     def _g_getnchildren(self):
@@ -272,12 +308,10 @@ class Group(hdf5extension.Group, Node):
             # (that Python cancelled just before calling this method) so
             # that they are still usable if the object is revived later.
             selfref = weakref.ref(self)
-            self._v_children.containerref = selfref
-            self._v_groups.containerref = selfref
-            self._v_leaves.containerref = selfref
-            self._v_links.containerref = selfref
-            self._v_unknown.containerref = selfref
-            self._v_hidden.containerref = selfref
+            mydict = self.__dict__
+            for name in self._c_lazy_children_attrs[1:]:
+                if name in mydict:
+                    mydict[name].containerref = selfref
 
         super(Group, self).__del__()
 
@@ -337,51 +371,108 @@ class Group(hdf5extension.Group, Node):
             return class_id_dict[childCID2]  # look up leaf class
 
 
+    def _g_iter_children_names(self):
+        """Iterate over the names of the children on disk.
+
+        Pairs ``(name, linktype)`` are yielded, where `linktype` is one
+        of "HardLink", "SoftLink", "ExternalLink" or "Unknown".  Names
+        are got from HDF5 in batches, and the kind of the objects
+        (i.e. group or leaf) is not looked up.
+
+        """
+
+        idx = 0
+        while idx is not None:
+            names, linktypes, idx = self._g_list_names(
+                idx, self._c_names_batch_size)
+            for item in zip(names, linktypes):
+                yield item
+
+    @synchronized
     def _g_add_children_names(self):
         """Add children names to this group taking into account their
-        visibility and kind."""
+        visibility and whether they are links.
+
+        Only the names of children are listed here; the kind of the
+        children is looked up by ``Group._g_add_children_kinds`` when
+        ``_v_groups``, ``_v_leaves`` or ``_v_unknown`` are first
+        accessed.
+
+        """
 
         mydict = self.__dict__
 
         # The names of the lazy attributes
-        mydict['__members__'] = members = []
+        members = []
         """The names of visible children nodes for readline-style completion.
         """
-        mydict['_v_children'] = children = _ChildrenDict(self)
+        children = _ChildrenDict(self)
         """The number of children hanging from this group."""
-        mydict['_v_groups'] = groups = _ChildrenDict(self)
+        links = _ChildrenDict(self)
+        """Dictionary with all links hanging from this group."""
+        hidden = _ChildrenDict(self)
+        """Dictionary with all hidden nodes hanging from this group."""
+
+        for (childname, linktype) in self._g_iter_children_names():
+            # See whether the name implies that the node is hidden.
+            # (Assigned values are entirely irrelevant.)
+            if isvisiblename(childname):
+                # Visible node.
+                members.append(childname)
+                children[childname] = None
+                if linktype in ('SoftLink', 'ExternalLink'):
+                    links[childname] = None
+            else:
+                # Hidden node.
+                hidden[childname] = None
+        members.reverse()
+
+        mydict['__members__'] = members
+        mydict['_v_children'] = children
+        mydict['_v_links'] = links
+        mydict['_v_hidden'] = hidden
+
+    def _g_drop_child_name(self, childname):
+        """Remove `childname` from the listed names of the children."""
+
+        mydict = self.__dict__
+        if '_v_children' not in mydict:
+            return
+        self._v_children.pop(childname, None)
+        self._v_hidden.pop(childname, None)
+        if childname in self.__members__:
+            self.__members__.remove(childname)
+
+    @synchronized
+    def _g_add_children_kinds(self):
+        """Add the visible children of this group to the dictionaries of
+        their kind."""
+
+        mydict = self.__dict__
+        children = self._v_children
+        links = self._v_links
+
+        groups = _ChildrenDict(self)
         """Dictionary with all groups hanging from this group."""
-        mydict['_v_leaves'] = leaves = _ChildrenDict(self)
+        leaves = _ChildrenDict(self)
         """Dictionary with all leaves hanging from this group."""
-        mydict['_v_links'] = links = _ChildrenDict(self)
-        """Dictionary with all links hanging from this group."""
-        mydict['_v_unknown'] = unknown = _ChildrenDict(self)
+        unknown = _ChildrenDict(self)
         """Dictionary with all unknown nodes hanging from this group."""
-        mydict['_v_hidden'] = hidden = _ChildrenDict(self)
-        """Dictionary with all hidden nodes hanging from this group."""
 
-        # Get the names of *all* child groups and leaves.
-        (group_names, leaf_names, link_names, unknown_names) = \
-            self._g_list_group(self._v_parent)
-
-        # Separate groups into visible groups and hidden nodes,
-        # and leaves into visible leaves and hidden nodes.
-        for (childnames, childdict) in ((group_names, groups),
-                                        (leaf_names, leaves),
-                                        (link_names, links),
-                                        (unknown_names, unknown)):
-
-            for childname in childnames:
-                # See whether the name implies that the node is hidden.
-                # (Assigned values are entirely irrelevant.)
-                if isvisiblename(childname):
-                    # Visible node.
-                    members.insert(0, childname)
-                    children[childname] = None
-                    childdict[childname] = None
-                else:
-                    # Hidden node.
-                    hidden[childname] = None
+        kinddicts = {'Group': groups, 'Leaf': leaves}
+        for childname in list(children):
+            if childname in links:
+                continue
+            kind = self._g_get_objinfo(childname)
+            if kind == 'NamedType':
+                # Named datatypes are not supported as nodes.
+                self._g_drop_child_name(childname)
+            else:
+                kinddicts.get(kind, unknown)[childname] = None
+
+        mydict['_v_groups'] = groups
+        mydict['_v_leaves'] = leaves
+        mydict['_v_unknown'] = unknown
 
 
     def _g_check_has_child(self, name):
@@ -415,6 +506,7 @@ class Group(hdf5extension.Group, Node):
 
         return self._f_iter_nodes()
 
+    @synchronized
     def __contains__(self, name):
         """Is there a child with that `name`?
 
@@ -524,21 +616,31 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
                 % (self._v_pathname, childname), NaturalNameWarning)
 
         # Check group width limits.
-        if (len(self._v_children) + len(self._v_hidden) >=
-                self._v_max_group_width):
+        mydict = self.__dict__
+        if '_v_children' in mydict:
+            nchildren = len(self._v_children) + len(self._v_hidden)
+        else:
+            # Avoid listing the children just for counting them.
+            nchildren = self._g_get_nlinks()
+        if nchildren >= self._v_max_group_width:
             self._g_width_warning()
 
-        # Update members information.
+        # Update members information, if already listed (else the new
+        # child will be listed from disk along with the others).
         # Insert references to the new child.
         # (Assigned values are entirely irrelevant.)
+        if '_v_children' not in mydict:
+            return
         if isvisiblename(childname):
             # Visible node.
             self.__members__.insert(0, childname)  # enable completion
             self._v_children[childname] = None  # insert node
-            if isinstance(childnode, Unknown):
-                self._v_unknown[childname] = None
-            elif isinstance(childnode, Link):
+            if isinstance(childnode, Link):
                 self._v_links[childname] = None
+            elif '_v_groups' not in mydict:
+                pass  # kinds not yet looked up
+            elif isinstance(childnode, Unknown):
+                self._v_unknown[childname] = None
             elif isinstance(childnode, Leaf):
                 self._v_leaves[childname] = None
             elif isinstance(childnode, Group):
@@ -569,10 +671,11 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
                 del members[member_index]  # disables completion
 
                 del self._v_children[childname]  # remove node
-                self._v_unknown.pop(childname, None)
                 self._v_links.pop(childname, None)
-                self._v_leaves.pop(childname, None)
-                self._v_groups.pop(childname, None)
+                if '_v_groups' in self.__dict__:
+                    self._v_unknown.pop(childname, None)
+                    self._v_leaves.pop(childname, None)
+                    self._v_groups.pop(childname, None)
             else:
                 # Hidden node.
                 del self._v_hidden[childname]  # remove node
@@ -681,6 +784,7 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
                         parentstack.append((srcchild, dstchild))
 
 
+    @synchronized
     def _f_get_child(self, childname):
         """Get the child called childname of this group.
 
@@ -727,9 +831,10 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
 
         if not classname:
             # Returns all the children alphanumerically sorted
-            names = sorted(six.iterkeys(self._v_children))
-            for name in names:
-                yield self._v_children[name]
+            children = self._v_children
+            names = sorted(six.iterkeys(children))
+            for name, child in children._iter_loaded(names):
+                yield child
         elif classname == 'Group':
             # Returns all the groups alphanumerically sorted
             names = sorted(six.iterkeys(self._v_groups))
@@ -754,8 +859,7 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
             children = self._v_children
             childnames = sorted(six.iterkeys(children))
 
-            for childname in childnames:
-                childnode = children[childname]
+            for childname, childnode in children._iter_loaded(childnames):
                 if isinstance(childnode, class_):
                     yield childnode
 
@@ -812,6 +916,9 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
         else an AttributeError is raised.
         """
 
+        if name in self._c_lazy_kinds_attrs:
+            self._g_add_children_kinds()
+            return self.__dict__[name]
         if name in self._c_lazy_children_attrs:
             self._g_add_children_names()
             return self.__dict__[name]
@@ -848,7 +955,8 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
         #
         # ..note::
         #
-        #   The check ``'__members__' in myDict`` allows attribute
+        #   The check ``'__members__' in myDict`` (or ``_v_isopen``,
+        #   when children names have not been listed) allows attribute
         #   assignment to happen before calling `Group.__init__()`, by
         #   avoiding to look into the still not assigned ``__members__``
         #   attribute.  This allows subclasses to set up some attributes
@@ -857,7 +965,15 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
         #   endless loop on exit!
 
         mydict = self.__dict__
-        if '__members__' in mydict and name in self.__members__:
+        if '__members__' in mydict:
+            clash = name in self.__members__
+        else:
+            # Children have not been listed yet, look the name up on disk.
+            clash = (mydict.get('_v_isopen', False) and
+                     isvisiblename(name) and
+                     self._g_get_objinfo(name) not in ('NoSuchNode',
+                                                       'NamedType'))
+        if clash:
             warnings.warn(
                 "group ``%s`` already has a child node named ``%s``; "
                 "you will not be able to use natural naming "
@@ -1154,11 +1270,21 @@ class RootGroup(Group):
 
         """
 
+        nodepath = childname
         if self._v_file.root_uep != "/":
             childname = join_path(self._v_file.root_uep, childname)
         # Is the node a group or a leaf?
         node_type = self._g_check_has_child(childname)
 
+        # Named datatypes are listed along with the other children, since
+        # the kinds of the children are not looked up when listing them.
+        if node_type == 'NamedType':
+            parentpath, name = split_path(nodepath)
+            self._v_file._get_node(parentpath)._g_drop_child_name(name)
+            raise NoSuchNodeError(
+                "node ``%s`` is a named datatype, which is not supported "
+                "as a node" % (nodepath,))
+
         # Nodes that HDF5 report as H5G_UNKNOWN
         if node_type == 'Unknown':
             return Unknown(self, childname)
@@ -62,14 +62,17 @@ from tables.utilsextension import (encode_filename, set_blosc_max_threads,
 
 # Types, constants, functions, classes & other objects from everywhere
 from libc.stdlib cimport malloc, free
-from libc.string cimport strdup, strlen
+from libc.string cimport strdup, strlen, memcpy
+from libc.stdint cimport uint32_t
 from numpy cimport import_array, ndarray, npy_intp
 from cpython.bytes cimport (PyBytes_AsString, PyBytes_FromStringAndSize,
     PyBytes_Check)
 from cpython.unicode cimport PyUnicode_DecodeUTF8
 
 
-from definitions cimport (const_char, uintptr_t, hid_t, herr_t, hsize_t, hvl_t,
+from definitions cimport (const_char, uintptr_t, hid_t, herr_t, hsize_t,
+  hssize_t, hvl_t,
+  haddr_t, HADDR_UNDEF, H5D_layout_t, H5D_CONTIGUOUS,
   H5S_seloper_t, H5D_FILL_VALUE_UNDEFINED,
   H5O_TYPE_UNKNOWN, H5O_TYPE_GROUP, H5O_TYPE_DATASET, H5O_TYPE_NAMED_DATATYPE,
   H5L_TYPE_ERROR, H5L_TYPE_HARD, H5L_TYPE_SOFT, H5L_TYPE_EXTERNAL,
@@ -83,6 +86,7 @@ from definitions cimport (const_char, uintptr_t, hid_t, herr_t, hsize_t, hvl_t,
   H5Gcreate, H5Gopen, H5Gclose, H5Ldelete, H5Lmove,
   H5Dopen, H5Dclose, H5Dread, H5Dwrite, H5Dget_type,
   H5Dget_space, H5Dvlen_reclaim, H5Dget_storage_size, H5Dvlen_get_buf_size,
+  H5Dget_offset, H5Dget_create_plist, H5Pget_layout, H5Pget_external_count,
   H5Tclose, H5Tis_variable_str, H5Tget_sign,
   H5Adelete, H5T_BITFIELD, H5T_INTEGER, H5T_FLOAT, H5T_STRING, H5Tget_order,
   H5Pcreate, H5Pset_cache, H5Pclose, H5Pget_userblock, H5Pset_userblock,
@@ -96,11 +100,14 @@ from definitions cimport (const_char, uintptr_t, hid_t, herr_t, hsize_t, hvl_t,
   H5ATTRget_attribute_vlen_string_array,
   H5ATTRfind_attribute, H5ATTRget_type_ndims, H5ATTRget_dims,
   H5ARRAYget_ndims, H5ARRAYget_info,
-  set_cache_size, get_objinfo, get_linkinfo, Giterate, Aiterate, H5UIget_info,
+  set_cache_size, get_objinfo, get_linkinfo, get_nlinks, Giterate,
+  Gnames_iterate, Aiterate, H5UIget_info,
   get_len_of_range, conv_float64_timeval32, truncate_dset,
   H5_HAVE_DIRECT_DRIVER, pt_H5Pset_fapl_direct,
   H5_HAVE_WINDOWS_DRIVER, pt_H5Pset_fapl_windows,
-  H5_HAVE_IMAGE_FILE, pt_H5Pset_file_image, pt_H5Fget_file_image)
+  H5_HAVE_IMAGE_FILE, pt_H5Pset_file_image, pt_H5Fget_file_image,
+  H5_HAVE_DIRECT_CHUNK, pt_H5Dget_chunk_storage_size, pt_H5Dread_chunk,
+  pt_H5Dwrite_chunk)
 
 cdef int H5T_CSET_DEFAULT = 16
 
@@ -158,6 +165,10 @@ cdef extern from "H5VLARRAY.h" nogil:
                                   int nobjects, hsize_t nrecords,
                                   void *data )
 
+  herr_t H5VLARRAYappend_rows( hid_t dataset_id, hid_t type_id,
+                               hsize_t nrows, hsize_t nrecords,
+                               hvl_t *wdata )
+
   herr_t H5VLARRAYmodify_records( hid_t dataset_id, hid_t type_id,
                                   hsize_t nrow, int nobjects,
                                   void *data )
@@ -300,6 +311,7 @@ _supported_drivers = (
 
 HAVE_DIRECT_DRIVER = bool(H5_HAVE_DIRECT_DRIVER)
 HAVE_WINDOWS_DRIVER = bool(H5_HAVE_WINDOWS_DRIVER)
+HAVE_DIRECT_CHUNK = bool(H5_HAVE_DIRECT_CHUNK)
 
 # Type extensions declarations (these are subclassed by PyTables
 # Python classes)
@@ -929,6 +941,25 @@ cdef class Node:
 
     return ObjInfo(oinfo.addr, oinfo.rc)
 
+  def _get_obj_ctime(self):
+    """Get the time of the last change in the metadata of the object.
+
+    HDF5 updates it when the object header changes (e.g. when a dataset is
+    extended or shrunk, or its attributes are set), but not when data is
+    overwritten in place.
+
+    """
+
+    cdef herr_t ret = 0
+    cdef H5O_info_t oinfo
+
+    ret = H5Oget_info(self._v_objectid, &oinfo)
+    if ret < 0:
+      raise HDF5ExtError("Unable to get object info for '%s'" %
+                         self. _v_pathname)
+
+    return int(oinfo.ctime)
+
 
 cdef class Group(Node):
   cdef hid_t   group_id
@@ -1008,6 +1039,51 @@ cdef class Group(Node):
 
     return Giterate(parent._v_objectid, self._v_objectid, encoded_name)
 
+  def _g_list_names(self, hsize_t idx, hsize_t nmax):
+    """Return a batch of at most `nmax` child names, starting at `idx`.
+
+    A tuple ``(names, linktypes, nextidx)`` is returned, where
+    `linktypes` holds "HardLink", "SoftLink", "ExternalLink" or
+    "Unknown" for each name and `nextidx` is the position where the
+    listing may be resumed, or None if all names have been listed.
+    The types of the objects are not looked up.
+
+    """
+
+    cdef int ltype
+    cdef object ret
+    cdef object linktypes
+
+    ret = Gnames_iterate(self.group_id, &idx, nmax)
+    if ret is None:
+      raise HDF5ExtError("Problems listing the children of group ``%s``."
+                         % self._v_pathname)
+    names, types, finished = ret
+    linktypes = []
+    for ltype in types:
+      if ltype == H5L_TYPE_HARD:
+        linktypes.append("HardLink")
+      elif ltype == H5L_TYPE_SOFT:
+        linktypes.append("SoftLink")
+      elif ltype == H5L_TYPE_EXTERNAL:
+        linktypes.append("ExternalLink")
+      else:
+        linktypes.append("Unknown")
+    if finished:
+      return names, linktypes, None
+    return names, linktypes, idx
+
+  def _g_get_nlinks(self):
+    """Return the number of links (visible or hidden) in this group."""
+
+    cdef hssize_t ret
+
+    ret = get_nlinks(self.group_id)
+    if ret < 0:
+      raise HDF5ExtError("Problems getting info for group ``%s``."
+                         % self._v_pathname)
+    return ret
+
 
   def _g_get_gchild_attr(self, group_name, attr_name):
     """Return an attribute of a child `Group`.
@@ -1174,6 +1250,54 @@ cdef class Leaf(Node):
     else:
       raise ValueError("Unexpected classname: %s" % classname)
 
+  def _g_read_chunk(self, ndarray offset):
+    """Read the raw data of the chunk starting at `offset`.
+
+    A ``(data, filter_mask)`` tuple is returned, or `None` if the chunk
+    has not been allocated in the file yet.  The leaf must have been
+    flushed, so that the size of the chunk in the file is up to date.
+
+    """
+
+    cdef hsize_t *coffset = <hsize_t *>offset.data
+    cdef hsize_t nbytes = 0
+    cdef uint32_t filter_mask = 0
+    cdef bytes data
+    cdef char *buf
+    cdef herr_t ret
+
+    if not H5_HAVE_DIRECT_CHUNK:
+      raise RuntimeError("Direct chunk I/O is only available in HDF5 >= "
+                         "1.10.3")
+    with nogil:
+      ret = pt_H5Dget_chunk_storage_size(self.dataset_id, coffset, &nbytes)
+    if ret < 0 or nbytes == 0:
+      return None
+    data = PyBytes_FromStringAndSize(NULL, nbytes)
+    buf = PyBytes_AsString(data)
+    with nogil:
+      ret = pt_H5Dread_chunk(self.dataset_id, H5P_DEFAULT, coffset,
+                             &filter_mask, buf)
+    if ret < 0:
+      raise HDF5ExtError("Problems reading the chunk at %s of leaf %s" %
+                         (tuple(offset), self._v_pathname))
+    return (data, filter_mask)
+
+  def _g_write_chunk(self, ndarray offset, bytes data, uint32_t filter_mask):
+    """Write the raw `data` of the chunk starting at `offset`."""
+
+    cdef herr_t ret
+
+    if not H5_HAVE_DIRECT_CHUNK:
+      raise RuntimeError("Direct chunk I/O is only available in HDF5 >= "
+                         "1.10.3")
+    ret = pt_H5Dwrite_chunk(self.dataset_id, H5P_DEFAULT, filter_mask,
+                            <hsize_t *>offset.data, len(data),
+                            PyBytes_AsString(data))
+    if ret < 0:
+      raise HDF5ExtError("Problems writing the chunk at %s of leaf %s" %
+                         (tuple(offset), self._v_pathname))
+
   def _g_flush(self):
     # Flush the dataset (in fact, the entire buffers in file!)
     if self.dataset_id >= 0:
@@ -1414,6 +1538,32 @@ cdef class Array(Leaf):
     return (self.dataset_id, atom, shape, chunkshapes)
 
 
+  def _get_data_offset(self):
+    """Get the offset of the data of this array in the file.
+
+    `None` is returned when the data can not be read directly from the
+    file, i.e. when it is not stored contiguously in the file itself or
+    it has not been allocated yet.
+
+    """
+
+    cdef hid_t plist
+    cdef H5D_layout_t layout
+    cdef int nexternal
+    cdef haddr_t offset
+
+    plist = H5Dget_create_plist(self.dataset_id)
+    layout = H5Pget_layout(plist)
+    nexternal = H5Pget_external_count(plist)
+    H5Pclose(plist)
+    if layout != H5D_CONTIGUOUS or nexternal != 0:
+      return None
+    offset = H5Dget_offset(self.dataset_id)
+    if offset == HADDR_UNDEF:
+      return None
+    return offset
+
+
   def _append(self, ndarray nparr):
     cdef int ret, extdim
     cdef hsize_t *dims_arr
@@ -1923,6 +2073,48 @@ cdef class VLArray(Leaf):
 
     self.nrecords = self.nrecords + 1
 
+  def _append_rows(self, ndarray values, ndarray offsets):
+    """Append a row per pair of consecutive `offsets` into `values`.
+
+    values must be a C-contiguous array of atoms and offsets an int64
+    array; the rows are appended with a single write.
+
+    """
+
+    cdef hsize_t i, nrows
+    cdef int ret
+    cdef hvl_t *wdata
+    cdef char *vbuf
+    cdef long long *coffsets
+    cdef size_t atomsize
+
+    nrows = len(offsets) - 1
+    if nrows <= 0:
+      return
+    if len(values) and self.atom.type == 'time64':
+      # Convert some NumPy types to HDF5 before storing.
+      self._convert_time64(values, 0)
+
+    atomsize = values.itemsize
+    if len(values):
+      atomsize = values.nbytes // len(values)
+    vbuf = values.data
+    coffsets = <long long *>offsets.data
+    wdata = <hvl_t *>malloc(<size_t>nrows*sizeof(hvl_t))
+    for i from 0 <= i < nrows:
+      wdata[i].len = coffsets[i+1] - coffsets[i]
+      wdata[i].p = vbuf + coffsets[i] * atomsize
+
+    with nogil:
+        ret = H5VLARRAYappend_rows(self.dataset_id, self.type_id, nrows,
+                                   self.nrecords, wdata)
+    free(wdata)
+
+    if ret < 0:
+      raise HDF5ExtError("Problems appending the records.")
+
+    self.nrecords = self.nrecords + nrows
+
   def _modify(self, hsize_t nrow, ndarray nparr, int nobjects):
     cdef int ret
     cdef void *rbuf
@@ -2048,6 +2240,96 @@ cdef class VLArray(Leaf):
 
     return datalist
 
+  def _read_array_flat(self, hsize_t start, hsize_t stop, hsize_t step):
+    """Read a range of rows as a ``(values, offsets)`` tuple.
+
+    values is a single array with the atoms of all the rows one after
+    another, and offsets an int64 array with nrows+1 entries such that
+    row i is ``values[offsets[i]:offsets[i+1]]``.
+
+    """
+
+    cdef hsize_t i
+    cdef size_t atomsize, total, nbytes
+    cdef herr_t ret
+    cdef hvl_t *rdata
+    cdef hsize_t nrows
+    cdef hid_t space_id
+    cdef hid_t mem_space_id
+    cdef ndarray values, offsets
+    cdef char *vbuf
+    cdef long long *coffsets
+    cdef object shape
+
+    # Compute the number of rows to read
+    nrows = get_len_of_range(start, stop, step)
+    if start + nrows > self.nrows:
+      raise HDF5ExtError(
+        "Asking for a range of rows exceeding the available ones!.",
+        h5bt=False)
+
+    with nogil:
+        # Allocate the necessary memory for keeping the row handlers
+        rdata = <hvl_t *>malloc(<size_t>nrows*sizeof(hvl_t))
+        # Get the dataspace handle
+        space_id = H5Dget_space(self.dataset_id)
+        # Create a memory dataspace handle
+        mem_space_id = H5Screate_simple(1, &nrows, NULL)
+        # Select the data to be read
+        H5Sselect_hyperslab(space_id, H5S_SELECT_SET, &start, &step, &nrows,
+                            NULL)
+        # Do the actual read
+        ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
+                      H5P_DEFAULT, rdata)
+
+    if ret < 0:
+      H5Sclose(mem_space_id)
+      H5Sclose(space_id)
+      free(rdata)
+      raise HDF5ExtError(
+        "VLArray._read_array_flat: Problems reading the array data.")
+
+    # Compute the offsets of every row in the values array
+    offsets = numpy.empty(nrows + 1, dtype=numpy.int64)
+    coffsets = <long long *>offsets.data
+    total = 0
+    for i from 0 <= i < nrows:
+      coffsets[i] = total
+      total = total + rdata[i].len
+    coffsets[nrows] = total
+
+    # Copy the atoms of all the rows into a single buffer
+    shape = list(self._atomicshape)
+    shape.insert(0, total)
+    values = numpy.empty(shape, dtype=self._atomicdtype.base)
+    vbuf = values.data
+    atomsize = self._atomicsize
+    with nogil:
+      for i from 0 <= i < nrows:
+        nbytes = rdata[i].len * atomsize
+        if nbytes > 0:
+          memcpy(vbuf, rdata[i].p, nbytes)
+          vbuf = vbuf + nbytes
+
+    if total > 0 and self.atom.kind == 'time':
+      # Swap the byteorder by hand (this is not currently supported by HDF5)
+      if H5Tget_order(self.type_id) != platform_byteorder:
+        values.byteswap(True)
+      # Convert some HDF5 types to NumPy after reading.
+      if self.atom.type == 'time64':
+        self._convert_time64(values, 1)
+
+    # Release resources
+    ret = H5Dvlen_reclaim(self.type_id, mem_space_id, H5P_DEFAULT, rdata)
+    H5Sclose(mem_space_id)
+    H5Sclose(space_id)
+    free(rdata)
+    if ret < 0:
+      raise HDF5ExtError(
+        "VLArray._read_array_flat: error freeing the data buffer.")
+
+    return values, offsets
+
 
   def get_row_size(self, row):
     """Return the total size in bytes of all the elements contained in a given row."""
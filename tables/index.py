@@ -32,7 +32,7 @@ from .idxutils import (calc_chunksize, calcoptlevels,
 
 from . import indexesextension
 from .node import NotLoggedMixin
-from .atom import UIntAtom, Atom
+from .atom import UIntAtom, Int64Atom, Atom
 from .earray import EArray
 from .carray import CArray
 from .leaf import Filters
@@ -160,6 +160,10 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
 
     _c_classid = 'INDEX'
 
+    # The sorted values and indices with the delta merged (see
+    # `_merged_delta()`), along with the number of elements of the index
+    # when they were computed.
+    _v_merged = None
 
     @property
     def kind(self):
@@ -553,21 +557,13 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
             self.create_temp()
 
 
-    def initial_append(self, xarr, nrow, reduction):
-        """Compute an initial indices arrays for data to be indexed."""
+    def slice_indices(self, nelements, nrow):
+        """Get the initial indices for `nelements` values in slice `nrow`."""
 
-        if profile:
-            tref = time()
-        if profile:
-            show_stats("Entering initial_append", tref)
-        arr = xarr.pop()
         indsize = self.indsize
         slicesize = self.slicesize
-        nelementsILR = self.nelementsILR
-        if profile:
-            show_stats("Before creating idx", tref)
         if indsize == 8:
-            idx = numpy.arange(0, len(arr), dtype="uint64") + nrow * slicesize
+            idx = numpy.arange(0, nelements, dtype="uint64") + nrow * slicesize
         elif indsize == 4:
             # For medium (32-bit) all the rows in tables should be
             # directly reachable.  But as len(arr) < 2**31, we can
@@ -587,9 +583,9 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
             # example, in table sorts).
             #
             # F. Alted 2008-09-15
-            idx = numpy.arange(0, len(arr), dtype="uint32")
+            idx = numpy.arange(0, nelements, dtype="uint32")
         else:
-            idx = numpy.empty(len(arr), "uint%d" % (indsize * 8))
+            idx = numpy.empty(nelements, "uint%d" % (indsize * 8))
             lbucket = self.lbucket
             # Fill the idx with the bucket indices
             offset = lbucket - ((nrow * (slicesize % lbucket)) % lbucket)
@@ -601,17 +597,39 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
                 # First normalize the number of rows
                 offset2 = (nrow % self.nslicesblock) * slicesize // lbucket
                 idx += offset2
-        # Add the last row at the beginning of arr & idx (if needed)
-        if (indsize == 8 and nelementsILR > 0):
-            # It is possible that the values in LR are already sorted.
-            # Fetch them and override existing values in arr and idx.
-            assert len(arr) > nelementsILR
-            self.read_slice_lr(self.sortedLR, arr[:nelementsILR])
-            self.read_slice_lr(self.indicesLR, idx[:nelementsILR])
-        # In-place sorting
+        return idx
+
+    def initial_append(self, xarr, nrow, reduction, idx=None):
+        """Compute an initial indices arrays for data to be indexed.
+
+        If `idx` is not None, the values in `xarr` have already been
+        sorted along with `idx` (as returned by `slice_indices()`).
+
+        """
+
         if profile:
-            show_stats("Before keysort", tref)
-        indexesextension.keysort(arr, idx)
+            tref = time()
+        if profile:
+            show_stats("Entering initial_append", tref)
+        arr = xarr.pop()
+        nelementsILR = self.nelementsILR
+        if idx is None:
+            if profile:
+                show_stats("Before creating idx", tref)
+            idx = self.slice_indices(len(arr), nrow)
+            # Add the last row at the beginning of arr & idx (if needed)
+            if (self.indsize == 8 and nelementsILR > 0):
+                # It is possible that the values in LR are already sorted.
+                # Fetch them and override existing values in arr and idx.
+                assert len(arr) > nelementsILR
+                self.read_slice_lr(self.sortedLR, arr[:nelementsILR])
+                self.read_slice_lr(self.indicesLR, idx[:nelementsILR])
+            # In-place sorting
+            if profile:
+                show_stats("Before keysort", tref)
+            indexesextension.keysort(arr, idx)
+        else:
+            assert self.indsize != 8 or nelementsILR == 0
         larr = arr[-1]
         if reduction > 1:
             # It's important to do a copy() here in order to ensure that
@@ -652,8 +670,13 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
             show_stats("Exiting final_idx32", tref)
         return idx
 
-    def append(self, xarr, update=False):
-        """Append the array to the index objects."""
+    def append(self, xarr, update=False, idx=None):
+        """Append the array to the index objects.
+
+        If `idx` is not None, the values in `xarr` have already been
+        sorted along with `idx` (see `initial_append()`).
+
+        """
 
         if profile:
             tref = time()
@@ -677,7 +700,7 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
         sortedLR = where.sortedLR
         indicesLR = where.indicesLR
         nrows = sorted.nrows  # before sorted.append()
-        larr, arr, idx = self.initial_append(xarr, nrows, reduction)
+        larr, arr, idx = self.initial_append(xarr, nrows, reduction, idx)
         # Save the sorted array
         sorted.append(arr.reshape(1, arr.size))
         cs = self.chunksize // reduction
@@ -1680,15 +1703,32 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
         return (noverlaps, multiplicity, toverlap)
 
     def read_sorted_indices(self, what, start, stop, step):
-        """Return the sorted or indices values in the specified range."""
+        """Return the sorted or indices values in the specified range.
+
+        Full indexes having a delta return their values with the delta
+        merged in memory (see `_merged_delta()`).
+
+        """
         (start, stop, step) = self._process_range(start, stop, step)
         if start >= stop:
             return numpy.empty(0, self.dtype)
+        if self.indsize == 8 and self.has_delta:
+            values, coords = self._merged_delta()
+            merged = values if what == "sorted" else coords
+            nmerged = len(merged)
+            if step < 0:
+                start, stop = (nmerged - min(stop, nmerged),
+                               max(nmerged - start, 0))
+            return merged[start:stop][::step]
         # Correction for negative values of step (reverse indices)
         if step < 0:
             tmp = start
             start = self.nelements - stop
             stop = self.nelements - tmp
+        return self._read_sorted_slices(what, start, stop)[::step]
+
+    def _read_sorted_slices(self, what, start, stop):
+        """Read the sorted or indices values from `start` to `stop`."""
         if what == "sorted":
             values = self.sorted
             valuesLR = self.sortedLR
@@ -1719,7 +1759,7 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
             istart = 0
             bstart += blen
             ilen += blen
-        return buffer_[::step]
+        return buffer_
 
     def read_sorted(self, start=None, stop=None, step=None):
         """Return the sorted values of index in the specified range.
@@ -2065,6 +2105,159 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
             show_stats("Exiting get_chunkmap", tref)
         return chunkmap
 
+    # The delta keeps the changes in the table which have not been merged
+    # in the sorted arrays of the index yet.  Values of modified rows are
+    # kept (sorted) in ``deltasorted``, along with their coordinates in
+    # ``deltaindices``, and the coordinates of removed rows are kept in
+    # ``removed``.  All these coordinates refer to the rows of the table
+    # at the time the index was built.
+    @property
+    def has_delta(self):
+        """Whether the index has changes pending to be merged."""
+        return 'deltasorted' in self or 'removed' in self
+
+    @property
+    def nremoved(self):
+        """The number of indexed rows removed since the index was built."""
+        return self.removed.nrows if 'removed' in self else 0
+
+    @property
+    def ndelta(self):
+        """The number of entries in the delta of the index."""
+        nmodified = self.deltasorted.nrows if 'deltasorted' in self else 0
+        return nmodified + self.nremoved
+
+    def _removed_coords(self):
+        if 'removed' not in self:
+            return numpy.empty(0, dtype=numpy.int64)
+        return self.removed.read()
+
+    def _index_coords(self, coords):
+        """Translate table `coords` into coordinates in the index."""
+
+        removed = self._removed_coords()
+        shifted = removed - numpy.arange(len(removed))
+        return coords + numpy.searchsorted(shifted, coords, side='right')
+
+    def _table_coords(self, coords):
+        """Translate index `coords` into coordinates in the table.
+
+        Removed rows are translated into the next row in the table.
+
+        """
+
+        removed = self._removed_coords()
+        return coords - numpy.searchsorted(removed, coords, side='left')
+
+    def _merged_delta(self):
+        """Get the sorted values and the table coordinates of the index
+        with its delta merged in memory.
+
+        The indices of removed and modified rows are dropped, and the
+        modified rows are inserted at the place of their new values.
+        The index itself is not changed, so this works in read-only
+        files too.
+
+        """
+
+        nelements = self.nelements
+        if self._v_merged is not None and self._v_merged[0] == nelements:
+            return self._v_merged[1]
+        values = self._read_sorted_slices('sorted', 0, nelements)
+        coords = self._read_sorted_slices('indices', 0, nelements)
+        coords = coords.astype(numpy.int64)
+        removed = self._removed_coords()
+        if 'deltasorted' in self:
+            dvalues = self.deltasorted.read()
+            dcoords = self.deltaindices.read()
+            alive = ~numpy.in1d(dcoords, removed)
+            dvalues, dcoords = dvalues[alive], dcoords[alive]
+            stale = numpy.union1d(removed, dcoords)
+        else:
+            dvalues = numpy.empty(0, dtype=self.dtype)
+            dcoords = numpy.empty(0, dtype=numpy.int64)
+            stale = removed
+        keep = ~numpy.in1d(coords, stale)
+        values, coords = values[keep], coords[keep]
+        positions = numpy.searchsorted(values, dvalues, side='right')
+        values = numpy.insert(values, positions, dvalues)
+        coords = self._table_coords(numpy.insert(coords, positions, dcoords))
+        self._v_merged = (nelements, (values, coords))
+        return values, coords
+
+    def _set_delta_array(self, name, atom, values):
+        self._v_merged = None
+        if name in self:
+            array = self._f_get_child(name)
+            array.truncate(0)
+        else:
+            array = EArray(self, name, atom, (0,), "Delta of the index",
+                           _log=False)
+        array.append(values)
+
+    def add_delta(self, values, coords):
+        """Record that the table rows in `coords` now hold `values`."""
+
+        values = numpy.asarray(values, dtype=self.dtype)
+        coords = self._index_coords(numpy.asarray(coords, dtype=numpy.int64))
+        if 'deltasorted' in self:
+            values = numpy.concatenate((self.deltasorted.read(), values))
+            coords = numpy.concatenate((self.deltaindices.read(), coords))
+        # Only the last value recorded for every row is kept
+        last = numpy.unique(coords[::-1], return_index=True)[1]
+        keep = len(coords) - 1 - last
+        values, coords = values[keep], coords[keep]
+        order = numpy.argsort(values, kind='mergesort')
+        self._set_delta_array('deltasorted', Atom.from_dtype(self.dtype),
+                              values[order])
+        self._set_delta_array('deltaindices', Int64Atom(), coords[order])
+
+    def add_removed(self, coords):
+        """Record that the table rows in `coords` have been removed."""
+
+        coords = self._index_coords(numpy.asarray(coords, dtype=numpy.int64))
+        removed = numpy.union1d(self._removed_coords(), coords)
+        self._set_delta_array('removed', Int64Atom(), removed)
+
+    def apply_delta(self, chunkmap, range_, nchunks):
+        """Apply the delta to a `chunkmap` computed by `get_chunkmap()`.
+
+        The chunks in `chunkmap` are translated into chunks of the table
+        (which has `nchunks` chunks now), and the chunks with modified
+        rows having values in `range_` (as returned by
+        `get_lookup_range()`) are selected too.
+
+        """
+
+        cs = self.nrowsinchunk
+        nelements = self.nelements
+        newmap = numpy.zeros(shape=nchunks, dtype="bool")
+        # Rows not covered by the index may always fulfill the condition
+        nindexed = nelements - self.nremoved
+        if self.table.nrows > nindexed:
+            newmap[nindexed // cs:] = True
+        ichunks = chunkmap[:int(math.ceil(float(nelements) / cs))].nonzero()[0]
+        if self.nremoved > 0:
+            # Select the table chunks spanned by the rows in index chunks
+            firsts = self._table_coords(ichunks * cs) // cs
+            lasts = self._table_coords(
+                numpy.minimum((ichunks + 1) * cs, nelements) - 1) // cs
+            marks = numpy.zeros(shape=nchunks + 1, dtype=numpy.int64)
+            numpy.add.at(marks, numpy.minimum(firsts, nchunks), 1)
+            numpy.add.at(marks, numpy.minimum(lasts + 1, nchunks), -1)
+            newmap |= numpy.cumsum(marks[:-1]) > 0
+        else:
+            newmap[ichunks[ichunks < nchunks]] = True
+        if 'deltasorted' in self and range_:
+            values = self.deltasorted.read()
+            start = numpy.searchsorted(values, range_[0], side='left')
+            stop = numpy.searchsorted(values, range_[1], side='right')
+            if start < stop:
+                coords = self._table_coords(self.deltaindices[start:stop])
+                chunks = coords // cs
+                newmap[chunks[chunks < nchunks]] = True
+        return newmap
+
     def get_lookup_range(self, ops, limits):
         assert len(ops) in [1, 2]
         assert len(limits) in [1, 2]
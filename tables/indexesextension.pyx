@@ -49,7 +49,8 @@ from libc.stdlib cimport malloc, free
 from libc.string cimport memcpy, strncmp
 
 from definitions cimport hid_t, herr_t, hsize_t, H5Screate_simple, H5Sclose
-from lrucacheextension cimport NumCache
+from lrucacheextension cimport NumCache, SharedCache
+from libc.stdint cimport uint64_t
 
 
 
@@ -144,53 +145,66 @@ ctypedef fused number_type:
 DEF PYA_QS_STACK = 100
 DEF SMALL_QUICKSORT = 15
 
+_keysort_types = frozenset([
+    cnp.NPY_FLOAT16, cnp.NPY_FLOAT32, cnp.NPY_FLOAT64, cnp.NPY_LONGDOUBLE,
+    cnp.NPY_INT8, cnp.NPY_INT16, cnp.NPY_INT32, cnp.NPY_INT64,
+    cnp.NPY_UINT8, cnp.NPY_UINT16, cnp.NPY_UINT32, cnp.NPY_UINT64,
+    cnp.NPY_BOOL, cnp.NPY_STRING])
+
 def keysort(ndarray array1, ndarray array2):
     """Sort array1 in-place. array2 is also sorted following the array1 order.
 
     array1 can be of any type, except complex or string.  array2 may be made of
     elements on any size.
 
+    The GIL is released while sorting, so that several arrays can be
+    sorted concurrently from different threads.
+
     """
     cdef size_t size = cnp.PyArray_SIZE(array1)
     cdef size_t elsize1 = cnp.PyArray_ITEMSIZE(array1)
     cdef size_t elsize2 = cnp.PyArray_ITEMSIZE(array2)
     cdef int type_num = cnp.PyArray_TYPE(array1)
+    cdef char *data1 = array1.data
+    cdef char *data2 = array2.data
 
-    # floating types
-    if type_num == cnp.NPY_FLOAT16:
-        _keysort[npy_float16](<npy_float16*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_FLOAT32:
-        _keysort[npy_float32](<npy_float32*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_FLOAT64:
-        _keysort[npy_float64](<npy_float64*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_LONGDOUBLE:
-        _keysort[npy_longdouble](<npy_longdouble*>array1.data, array2.data, elsize2, size)
-    # signed integer types
-    elif type_num == cnp.NPY_INT8:
-        _keysort[npy_int8](<npy_int8*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_INT16:
-        _keysort[npy_int16](<npy_int16*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_INT32:
-        _keysort[npy_int32](<npy_int32*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_INT64:
-        _keysort[npy_int64](<npy_int64*>array1.data, array2.data, elsize2, size)
-    # unsigned integer types
-    elif type_num == cnp.NPY_UINT8:
-        _keysort[npy_uint8](<npy_uint8*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_UINT16:
-        _keysort[npy_uint16](<npy_uint16*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_UINT32:
-        _keysort[npy_uint32](<npy_uint32*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_UINT64:
-        _keysort[npy_uint64](<npy_uint64*>array1.data, array2.data, elsize2, size)
-    # other
-    elif type_num == cnp.NPY_BOOL:
-        _keysort[npy_bool](<npy_bool*>array1.data, array2.data, elsize2, size)
-    elif type_num == cnp.NPY_STRING:
-        _keysort_string(array1.data, elsize1, array2.data, elsize2, size)
-    else:
+    if type_num not in _keysort_types:
         raise ValueError("Unknown array datatype")
 
+    with nogil:
+        # floating types
+        if type_num == cnp.NPY_FLOAT16:
+            _keysort[npy_float16](<npy_float16*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_FLOAT32:
+            _keysort[npy_float32](<npy_float32*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_FLOAT64:
+            _keysort[npy_float64](<npy_float64*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_LONGDOUBLE:
+            _keysort[npy_longdouble](<npy_longdouble*>data1, data2, elsize2, size)
+        # signed integer types
+        elif type_num == cnp.NPY_INT8:
+            _keysort[npy_int8](<npy_int8*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_INT16:
+            _keysort[npy_int16](<npy_int16*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_INT32:
+            _keysort[npy_int32](<npy_int32*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_INT64:
+            _keysort[npy_int64](<npy_int64*>data1, data2, elsize2, size)
+        # unsigned integer types
+        elif type_num == cnp.NPY_UINT8:
+            _keysort[npy_uint8](<npy_uint8*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_UINT16:
+            _keysort[npy_uint16](<npy_uint16*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_UINT32:
+            _keysort[npy_uint32](<npy_uint32*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_UINT64:
+            _keysort[npy_uint64](<npy_uint64*>data1, data2, elsize2, size)
+        # other
+        elif type_num == cnp.NPY_BOOL:
+            _keysort[npy_bool](<npy_bool*>data1, data2, elsize2, size)
+        elif type_num == cnp.NPY_STRING:
+            _keysort_string(data1, elsize1, data2, elsize2, size)
+
 
 cdef inline void swap_bytes(char *x, char *y, size_t n) nogil:
     if n == 8:
@@ -601,6 +615,8 @@ cdef class IndexArray(Array):
   cdef int     l_chunksize, l_slicesize, nbounds, indsize
   cdef CacheArray bounds_ext
   cdef NumCache boundscache, sortedcache
+  cdef SharedCache sharedcache
+  cdef uint64_t boundskey, sortedkey
   cdef ndarray bufferbc, bufferlb
 
   def _read_index_slice(self, hsize_t irow, hsize_t start, hsize_t stop,
@@ -673,6 +689,10 @@ cdef class IndexArray(Array):
       maxslots = params['SORTED_MAX_SIZE'] / (self.chunksize*dtype.itemsize)
       self.sortedcache = <NumCache>NumCache(
         (maxslots, self.chunksize), dtype, 'sorted')
+      # Both are also looked up in the cache shared with other processes
+      self.sharedcache, self.boundskey = self._v_file._get_shared_cache(
+        self, 'bounds')
+      self.sortedkey = self._v_file._get_shared_cache(self, 'sorted')[1]
 
 
 
@@ -705,14 +725,20 @@ cdef class IndexArray(Array):
     """Get the bounds from the cache, or read them."""
 
     cdef void *vpointer
-    cdef long nslot
+    cdef long nslot, nbytes
 
     nslot = self.boundscache.getslot_(nrow)
     if nslot >= 0:
       vpointer = self.boundscache.getitem1_(nslot)
     else:
-      # Bounds row is not in cache. Read it and put it in the LRU cache.
-      self.bounds_ext.read_slice(nrow, 0, nbounds, self.rbufbc)
+      # Bounds row is not in cache. Look it up in the shared cache, or else
+      # read it, and put it in the LRU cache.
+      nbytes = nbounds * self.boundscache.itemsize
+      if (self.sharedcache is None or not self.sharedcache.getitem_(
+          self.boundskey, nrow, self.rbufbc, nbytes)):
+        self.bounds_ext.read_slice(nrow, 0, nbounds, self.rbufbc)
+        if self.sharedcache is not None:
+          self.sharedcache.setitem_(self.boundskey, nrow, self.rbufbc, nbytes)
       self.boundscache.setitem_(nrow, self.rbufbc, 0)
       vpointer = self.rbufbc
     return vpointer
@@ -724,7 +750,7 @@ cdef class IndexArray(Array):
 
     cdef void *vpointer
     cdef npy_int64 nckey
-    cdef long nslot
+    cdef long nslot, nbytes
     cdef hsize_t start, stop
 
     # Compute the number of chunk read and use it as the key for the cache.
@@ -733,10 +759,17 @@ cdef class IndexArray(Array):
     if nslot >= 0:
       vpointer = self.sortedcache.getitem1_(nslot)
     else:
-      # The sorted chunk is not in cache. Read it and put it in the LRU cache.
-      start = cs*nchunk
-      stop = cs*(nchunk+1)
-      vpointer = self._g_read_sorted_slice(nrow, start, stop)
+      # The sorted chunk is not in cache. Look it up in the shared cache,
+      # or else read it, and put it in the LRU cache.
+      nbytes = cs * self.sortedcache.itemsize
+      vpointer = self.rbuflb
+      if (self.sharedcache is None or not self.sharedcache.getitem_(
+          self.sortedkey, nckey, vpointer, nbytes)):
+        start = cs*nchunk
+        stop = cs*(nchunk+1)
+        vpointer = self._g_read_sorted_slice(nrow, start, stop)
+        if self.sharedcache is not None:
+          self.sharedcache.setitem_(self.sortedkey, nckey, vpointer, nbytes)
       self.sortedcache.setitem_(nckey, vpointer, 0)
     return vpointer
 
@@ -15,6 +15,7 @@ from __future__ import absolute_import
 
 import warnings
 import math
+import itertools
 
 import numpy
 
@@ -25,6 +26,7 @@ from .filters import Filters
 from .utils import byteorders, lazyattr, SizeType
 from .exceptions import PerformanceWarning
 from . import utilsextension
+from .hdf5extension import HAVE_DIRECT_CHUNK
 from six.moves import range
 
 
@@ -468,6 +470,41 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         return new_node
 
+    def _g_copy_chunks(self, other, start, stop, step):
+        """Copy the chunks of this leaf into `other` without filtering them.
+
+        This is only done when the whole leaf is copied into a leaf with
+        the same type, byteorder, filters and chunkshape.  If `other` is
+        enlargeable, it is enlarged to the size of this leaf first.
+        Returns whether the chunks have been copied.
+
+        """
+
+        shape = list(other.shape)
+        if other.extdim >= 0:
+            shape[other.extdim] = self.shape[other.extdim]
+        if (not HAVE_DIRECT_CHUNK or self.chunkshape is None or
+                (start, stop, step) != (0, self.nrows, 1) or
+                tuple(shape) != tuple(self.shape) or
+                other.chunkshape != self.chunkshape or
+                other.dtype != self.dtype or
+                other.byteorder != self.byteorder or
+                other.filters != self.filters):
+            return False
+        if tuple(other.shape) != tuple(self.shape):
+            other.truncate(self.nrows)
+        if self._v_file._iswritable():
+            self.flush()
+        ranges = [range(0, dim, cs)
+                  for (dim, cs) in zip(self.shape, self.chunkshape)]
+        for coords in itertools.product(*ranges):
+            offset = numpy.array(coords, dtype=numpy.int64)
+            chunk = self._g_read_chunk(offset)
+            # Chunks not written yet are left with the default values
+            if chunk is not None:
+                other._g_write_chunk(offset, *chunk)
+        return True
+
     def _g_fix_byteorder_data(self, data, dbyteorder):
         "Fix the byteorder of data passed in constructors."
         dbyteorder = byteorders[dbyteorder]
@@ -648,11 +685,83 @@ very small/large chunksize, you may want to increase/decrease it."""
             dimension.  Any other value should be an integer or a tuple
             matching the dimensions of the leaf.
 
+        When the whole leaf is copied keeping its filters and chunkshape,
+        its chunks are copied as they are stored in the file (see
+        :meth:`Leaf.read_chunk`), without decompressing and compressing
+        them again.
+
         """
 
         return self._f_copy(
             newparent, newname, overwrite, createparents, **kwargs)
 
+    def _get_chunk_offset(self, coords):
+        """Check the `coords` of a chunk and get them as an array."""
+
+        if self.chunkshape is None:
+            raise TypeError("leaf ``%s`` is not chunked" % self._v_pathname)
+        offset = numpy.array(coords, dtype=numpy.int64).reshape(-1)
+        if len(offset) != len(self.shape):
+            raise ValueError("chunk coordinates must have %d elements, "
+                             "but %d were given"
+                             % (len(self.shape), len(offset)))
+        if (offset < 0).any() or (offset >= self.shape).any():
+            raise IndexError("chunk coordinates out of bounds")
+        if (offset % self.chunkshape).any():
+            raise ValueError("coordinates %s are not the start of a chunk "
+                             "with shape %s" % (tuple(offset),
+                                                self.chunkshape))
+        return offset
+
+    def read_chunk(self, coords):
+        """Read the raw data of a chunk, bypassing the filter pipeline.
+
+        The chunk read is the one starting at the element with coordinates
+        `coords` (a sequence with an integer per dimension, or just an
+        integer for one-dimensional leaves), which must be multiples of
+        the :attr:`Leaf.chunkshape`.
+
+        A ``(data, filter_mask)`` tuple is returned, where data is a byte
+        string with the chunk as stored in the file (i.e. compressed, if
+        the leaf has compression filters), and filter_mask tells which
+        filters were *not* applied to it (a bit set per filter).  `None`
+        is returned if the chunk has not been written yet.
+
+        This requires HDF5 1.10.3 or later.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        offset = self._get_chunk_offset(coords)
+        # Chunks still in the HDF5 cache do not have their final size yet
+        if self._v_file._iswritable():
+            self.flush()
+        return self._g_read_chunk(offset)
+
+    def write_chunk(self, coords, data, filter_mask=0):
+        """Write the raw data of a chunk, bypassing the filter pipeline.
+
+        The chunk written is the one starting at the element with
+        coordinates `coords` (see :meth:`Leaf.read_chunk`), and data is a
+        byte string with its contents as they should be stored in the
+        file, i.e. with the filters of the leaf (except those flagged in
+        filter_mask) already applied.  This is typically the output of
+        :meth:`Leaf.read_chunk` on a leaf with the same type, filters and
+        chunkshape.  No check on data is done, so wrong data will only be
+        noticed when the chunk is read back.
+
+        This requires HDF5 1.10.3 or later.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        self._v_file._check_writable()
+        self._g_write_chunk(self._get_chunk_offset(coords), data, filter_mask)
+
     def truncate(self, size):
         """Truncate the main dimension to be size rows.
 
@@ -10,6 +10,7 @@
 #
 ########################################################################
 
+from libc.stdint cimport uint64_t, int64_t
 from numpy cimport ndarray
 
 # Declaration of instance variables for shared classes
@@ -76,6 +77,27 @@ cdef class NumCache(BaseCache):
   cdef void *getitem1_(self, long nslot)
 
 
+# The SharedCache class keeps numerical data in memory shared by processes
+cdef class SharedCache:
+  cdef readonly object filename
+  cdef readonly long nsets, setsize, nways
+  cdef readonly long long hits, misses, oversized
+  cdef object fd, mmap, lock
+  cdef ndarray header, slots, data
+  cdef uint64_t *rheader
+  cdef uint64_t *rslots
+  cdef char *rdata
+  cdef long getset_(self, uint64_t dskey, int64_t key)
+  cdef lockset_(self, long nset, int lock)
+  cdef int isfree_(self, long nset, uint64_t start, uint64_t nbytes)
+  cdef uint64_t compact_(self, long nset)
+  cdef long allocate_(self, long nset, uint64_t nbytes)
+  cdef int getitem_(self, uint64_t dskey, int64_t key, void *data,
+                    long nbytes) except -1
+  cdef int setitem_(self, uint64_t dskey, int64_t key, void *data,
+                    long nbytes) except -1
+
+
 ## Local Variables:
 ## mode: python
 ## py-indent-offset: 2
@@ -17,6 +17,7 @@ Classes (type extensions):
     NodeCache
     ObjectCache
     NumCache
+    SharedCache
 
 Functions:
 
@@ -27,15 +28,26 @@ Misc variables:
 cdef extern from "Python.h":
     int PyUnicode_Compare(object, object)
 
+import os
 import sys
+import mmap
+import warnings
+import threading
+
+try:
+  import fcntl
+except ImportError:
+  fcntl = None
 
 import numpy
-from libc.string cimport memcpy, strcmp
+from libc.stdint cimport uint64_t, int64_t
+from libc.string cimport memcpy, memmove, strcmp
 from cpython.unicode cimport PyUnicode_Check
 from numpy cimport import_array, ndarray
 
 from .parameters import (DISABLE_EVERY_CYCLES, ENABLE_EVERY_CYCLES,
   LOWEST_HIT_RATIO)
+from .exceptions import PerformanceWarning
 
 
 
@@ -454,6 +466,11 @@ cdef class ObjectCache(BaseCache):
     self.mrunode = node
     return node.obj
 
+  property nbytes:
+    """The size (in bytes) of the objects in cache."""
+    def __get__(self):
+      return self.cachesize
+
   def __repr__(self):
     if self.nprobes > 0:
       hitratio = self.hitratio / self.nprobes
@@ -514,6 +531,11 @@ cdef class NumCache(BaseCache):
     self.keys = <ndarray>(-numpy.ones(shape=nslots, dtype=numpy.int64))
     self.rkeys = <long long *>self.keys.data
 
+  property nbytes:
+    """The size (in bytes) of the memory allocated for the cache."""
+    def __get__(self):
+      return self.cacheobj.nbytes + self.keys.nbytes
+
   # Returns the address of nslot
   cdef void *getaddrslot_(self, long nslot):
     if nslot >= 0:
@@ -633,6 +655,304 @@ cdef class NumCache(BaseCache):
          cachesize, hitratio, self.iscachedisabled)
 
 
+# ------- LRU cache shared by several processes ---------
+
+cdef extern from "shared-cache.h":
+  uint64_t shared_cache_tick(uint64_t *clock)
+
+# Layout of the file backing a SharedCache.  Every field is an uint64.
+#
+# * A header with the magic number, the number of sets, the size of the
+#   data area of a set, the number of items per set and a clock for the
+#   LRU policy.
+# * A table with the dataset key, the key, the number of bytes, the last
+#   access time and the offset in the data area of its set of every item
+#   (a zero dataset key means a free entry).
+# * The data areas of the sets, starting at a page boundary.
+cdef uint64_t SHARED_CACHE_MAGIC = 0x5054534843414332ULL  # "PTSHCAC2"
+cdef int HEADER_FIELDS = 8
+cdef int SLOT_FIELDS = 5
+
+
+cdef class SharedCache:
+  """Least-Recently-Used (LRU) cache of numerical data shared by processes.
+
+  The data is kept in a file mapped in memory (usually in ``/dev/shm``,
+  i.e. a POSIX shared memory segment), so that every process opening the
+  same `filename` sees the same cache.  The cache is split in sets with a
+  data area of `setsize` bytes: an item can only go to the set chosen by
+  hashing its keys, where it takes just the bytes it needs.  A set keeps
+  up to `nways` items, and its least recently used items are evicted to
+  make room for a new one.  Items larger than `setsize` can not be cached
+  (they are counted in `oversized`, and a warning is issued for the first
+  one).  The accesses to a set are serialized by a POSIX advisory lock on
+  the file (and by a thread lock within the process), while the clock of
+  the LRU policy is updated atomically.
+
+  Items are identified by a pair of keys: a (non-zero) 64-bit key of the
+  dataset they belong to, and a 64-bit key of the item in the dataset
+  (e.g. the number of a chunk).  The cached data is never invalidated, so
+  the datasets must not be modified while the cache is in use.
+
+  If the file already exists, its geometry is used instead of the one
+  given by `size`, `setsize` and `nways`.
+
+  """
+
+  def __init__(self, object filename, long long size, long setsize,
+               long nways=256):
+    cdef long nsets
+    cdef uint64_t dataoffset
+
+    if fcntl is None:
+      raise NotImplementedError("shared caches are not supported on this "
+                                "platform")
+    self.filename = filename
+    self.fd = os.open(filename, os.O_RDWR | os.O_CREAT, 0o600)
+    # Serialize the initialization of the file among processes
+    fcntl.lockf(self.fd, fcntl.LOCK_EX)
+    try:
+      if os.fstat(self.fd).st_size == 0:
+        setsize = min(setsize, size)
+        nsets = max(size // setsize, 1)
+        dataoffset = self._dataoffset(nsets * nways)
+        # A new file is filled with zeros, so all the entries are free
+        os.ftruncate(self.fd, dataoffset + nsets * setsize)
+        self.mmap = mmap.mmap(self.fd, 0)
+        header = numpy.ndarray(HEADER_FIELDS, numpy.uint64, self.mmap)
+        header[:5] = [SHARED_CACHE_MAGIC, nsets, setsize, nways, 0]
+      else:
+        self.mmap = mmap.mmap(self.fd, 0)
+        header = numpy.ndarray(HEADER_FIELDS, numpy.uint64, self.mmap)
+        if header[0] != SHARED_CACHE_MAGIC:
+          raise ValueError("``%s`` is not a shared cache file" % filename)
+    finally:
+      fcntl.lockf(self.fd, fcntl.LOCK_UN)
+
+    self.nsets, self.setsize, self.nways = header[1:4]
+    self.header = header
+    self.rheader = <uint64_t *>self.header.data
+    self.slots = numpy.ndarray((self.nsets * self.nways, SLOT_FIELDS),
+                               numpy.uint64, self.mmap, HEADER_FIELDS * 8)
+    self.rslots = <uint64_t *>self.slots.data
+    dataoffset = self._dataoffset(self.nsets * self.nways)
+    self.data = numpy.ndarray(self.nsets * self.setsize, numpy.uint8,
+                              self.mmap, dataoffset)
+    self.rdata = self.data.data
+    self.lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.oversized = 0
+
+  def _dataoffset(self, long nslots):
+    """The offset of the data area in the file."""
+    cdef long offset
+
+    offset = (HEADER_FIELDS + nslots * SLOT_FIELDS) * 8
+    return (offset + mmap.PAGESIZE - 1) // mmap.PAGESIZE * mmap.PAGESIZE
+
+  property nbytes:
+    """The size (in bytes) of the memory shared for the cache."""
+    def __get__(self):
+      return len(self.mmap)
+
+  property nitems:
+    """The number of items in the cache."""
+    def __get__(self):
+      return int(numpy.count_nonzero(self.slots[:, 0]))
+
+  cdef long getset_(self, uint64_t dskey, int64_t key):
+    cdef uint64_t h
+
+    h = dskey ^ (<uint64_t>key * 0x9E3779B97F4A7C15ULL)
+    h ^= h >> 29
+    return <long>(h % <uint64_t>self.nsets)
+
+  cdef lockset_(self, long nset, int lock):
+    # Lock a byte per set.  The lock is advisory, so it does not matter
+    # that the byte is in the header or in the slot table.
+    fcntl.lockf(self.fd, fcntl.LOCK_EX if lock else fcntl.LOCK_UN, 1, nset)
+
+  cdef int isfree_(self, long nset, uint64_t start, uint64_t nbytes):
+    """Whether the `nbytes` at `start` in the data area of a set are free."""
+
+    cdef long nslot
+    cdef uint64_t *slot
+
+    if start + nbytes > <uint64_t>self.setsize:
+      return 0
+    for nslot in range(nset * self.nways, (nset + 1) * self.nways):
+      slot = self.rslots + nslot * SLOT_FIELDS
+      if (slot[0] != 0 and slot[4] < start + nbytes and
+          start < slot[4] + slot[2]):
+        return 0
+    return 1
+
+  cdef uint64_t compact_(self, long nset):
+    """Move the items of a set to the beginning of its data area.
+
+    The offset of the free bytes at the end of the area is returned.
+
+    """
+
+    cdef long nslot, nnext
+    cdef uint64_t end
+    cdef uint64_t *slot
+    cdef char *area
+
+    area = self.rdata + nset * self.setsize
+    end = 0
+    while True:
+      # The items are moved in the order of their offsets, so the ones
+      # not moved yet are always after `end`
+      nnext = -1
+      for nslot in range(nset * self.nways, (nset + 1) * self.nways):
+        slot = self.rslots + nslot * SLOT_FIELDS
+        if (slot[0] != 0 and slot[4] >= end and (
+            nnext < 0 or slot[4] < (self.rslots + nnext * SLOT_FIELDS)[4])):
+          nnext = nslot
+      if nnext < 0:
+        return end
+      slot = self.rslots + nnext * SLOT_FIELDS
+      memmove(area + end, area + slot[4], slot[2])
+      slot[4] = end
+      end += slot[2]
+
+  cdef long allocate_(self, long nset, uint64_t nbytes):
+    """Get a free entry of a set with room for `nbytes` of data.
+
+    The least recently used items of the set are evicted until there are
+    a free entry and enough free bytes, and the data area is compacted if
+    the free bytes are not contiguous.  The offset of the room is set in
+    the returned entry.
+
+    """
+
+    cdef long nslot, free, victim
+    cdef uint64_t used, offset
+    cdef uint64_t *slot
+
+    while True:
+      free, victim, used = -1, -1, 0
+      for nslot in range(nset * self.nways, (nset + 1) * self.nways):
+        slot = self.rslots + nslot * SLOT_FIELDS
+        if slot[0] == 0:
+          free = nslot
+        else:
+          used += slot[2]
+          if (victim < 0 or
+              slot[3] < (self.rslots + victim * SLOT_FIELDS)[3]):
+            victim = nslot
+      if free >= 0 and used + nbytes <= <uint64_t>self.setsize:
+        break
+      (self.rslots + victim * SLOT_FIELDS)[0] = 0
+
+    # Look for the first free bytes at the beginning of the area or after
+    # an item
+    offset = self.setsize
+    if self.isfree_(nset, 0, nbytes):
+      offset = 0
+    else:
+      for nslot in range(nset * self.nways, (nset + 1) * self.nways):
+        slot = self.rslots + nslot * SLOT_FIELDS
+        if (slot[0] != 0 and slot[4] + slot[2] < offset and
+            self.isfree_(nset, slot[4] + slot[2], nbytes)):
+          offset = slot[4] + slot[2]
+    if offset == <uint64_t>self.setsize:
+      offset = self.compact_(nset)
+    (self.rslots + free * SLOT_FIELDS)[4] = offset
+    return free
+
+  cdef int getitem_(self, uint64_t dskey, int64_t key, void *data,
+                    long nbytes) except -1:
+    """Copy the `nbytes` cached for the keys to `data`.
+
+    1 is returned on a hit, and 0 on a miss.
+
+    """
+
+    cdef long nset, nslot
+    cdef uint64_t *slot
+
+    nset = self.getset_(dskey, key)
+    with self.lock:
+      self.lockset_(nset, 1)
+      try:
+        for nslot in range(nset * self.nways, (nset + 1) * self.nways):
+          slot = self.rslots + nslot * SLOT_FIELDS
+          if (slot[0] == dskey and slot[1] == <uint64_t>key and
+              slot[2] == <uint64_t>nbytes):
+            memcpy(data, self.rdata + nset * self.setsize + slot[4], nbytes)
+            slot[3] = shared_cache_tick(self.rheader + 4)
+            self.hits += 1
+            return 1
+      finally:
+        self.lockset_(nset, 0)
+    self.misses += 1
+    return 0
+
+  cdef int setitem_(self, uint64_t dskey, int64_t key, void *data,
+                    long nbytes) except -1:
+    """Copy `nbytes` of `data` to the cache under the keys.
+
+    Items larger than the data area of a set are not cached, and 0 is
+    returned for them.  Otherwise, 1 is returned.
+
+    """
+
+    cdef long nset, nslot
+    cdef uint64_t *slot
+
+    if nbytes <= 0:
+      return 0
+    if nbytes > self.setsize:
+      self.oversized += 1
+      if self.oversized == 1:
+        warnings.warn("items larger than %d bytes can not be kept in the "
+                      "shared cache ``%s``; you may want to increase the "
+                      "``SHARED_CACHE_SET_SIZE`` parameter"
+                      % (self.setsize, self.filename), PerformanceWarning)
+      return 0
+    nset = self.getset_(dskey, key)
+    with self.lock:
+      self.lockset_(nset, 1)
+      try:
+        # Drop the item with the same keys, if any
+        for nslot in range(nset * self.nways, (nset + 1) * self.nways):
+          slot = self.rslots + nslot * SLOT_FIELDS
+          if slot[0] == dskey and slot[1] == <uint64_t>key:
+            slot[0] = 0
+        slot = self.rslots + self.allocate_(nset, nbytes) * SLOT_FIELDS
+        memcpy(self.rdata + nset * self.setsize + slot[4], data, nbytes)
+        slot[1] = <uint64_t>key
+        slot[2] = <uint64_t>nbytes
+        slot[3] = shared_cache_tick(self.rheader + 4)
+        slot[0] = dskey
+      finally:
+        self.lockset_(nset, 0)
+    return 1
+
+  def getitem(self, uint64_t dskey, int64_t key, ndarray nparr):
+    """Fill `nparr` with the data cached for the keys.
+
+    True is returned on a hit, and False on a miss.
+
+    """
+
+    return bool(self.getitem_(dskey, key, nparr.data, nparr.nbytes))
+
+  def setitem(self, uint64_t dskey, int64_t key, ndarray nparr):
+    """Cache the data in `nparr` under the keys."""
+
+    return bool(self.setitem_(dskey, key, nparr.data, nparr.nbytes))
+
+  def __repr__(self):
+    return """<%s(%s)
+  (%d sets of %d bytes and %d items, %d hits, %d misses, %d oversized)>
+  """ % (self.filename, str(self.__class__), self.nsets, self.setsize,
+         self.nways, self.hits, self.misses, self.oversized)
+
+
 ## Local Variables:
 ## mode: python
 ## py-indent-offset: 2
@@ -13,15 +13,19 @@
 """PyTables nodes."""
 from __future__ import absolute_import
 
+import sys
 import warnings
 
+import numpy
+
 from .registry import class_name_dict, class_id_dict
 from .exceptions import (ClosedNodeError, NodeError, UndoRedoWarning,
                                PerformanceWarning)
 from .path import join_path, split_path, isvisiblepath
-from .utils import lazyattr
+from .utils import lazyattr, synchronized
 from .undoredo import move_to_shadow
 from .attributeset import AttributeSet, NotLoggedAttributeSet
+from .lrucacheextension import NumCache, ObjectCache
 import six
 
 
@@ -159,9 +163,22 @@ class Node(six.with_metaclass(MetaNode, object)):
 
     _v_parent = property(_g_getparent)
 
+    @property
+    def _v_lock(self):
+        """The lock serializing the HDF5 calls on the file of this node.
+
+        It is None unless the file has been opened with the
+        ``THREAD_SAFE`` parameter.
+
+        """
+
+        file_ = self.__dict__.get('_v_file')
+        return None if file_ is None else file_._v_lock
+
     # '_v_attrs' is defined as a lazy read-only attribute.
     # This saves 0.7s/3.8s.
     @lazyattr
+    @synchronized
     def _v_attrs(self):
         """The associated `AttributeSet` instance.
 
@@ -308,9 +325,24 @@ class Node(six.with_metaclass(MetaNode, object)):
         self._v__deleting = True
 
         # If we get here, the `Node` is still open.
+        lock = self._v_lock
+        if lock is None:
+            self._g_kill()
+        else:
+            # Other threads may look up this node while waiting for the
+            # lock: they get a new instance instead of this one (see
+            # ``NodeManager.get_node()``).
+            with lock:
+                self._g_kill()
+
+    def _g_kill(self):
+        """Drop this node from the node manager and close it."""
+
         try:
             node_manager = self._v_file._node_manager
-            node_manager.drop_node(self, check_unregistered=False)
+            registered = node_manager.registry.get(self._v_pathname, self)
+            if registered is self:
+                node_manager.drop_node(self, check_unregistered=False)
         finally:
             # At this point the node can still be open if there is still some
             # alive reference around (e.g. if the __del__ method is called
@@ -454,6 +486,26 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
         pass
 
 
+    def _g_get_cache_cost(self):
+        """Estimate the memory (in bytes) kept alive by this node.
+
+        This accounts for the instance dictionary of the node plus the
+        I/O buffers, data caches and dictionaries referenced from it, and
+        it is used for limiting the size of the node cache (see
+        :data:`parameters.NODE_CACHE_SIZE`).
+
+        """
+
+        mydict = self.__dict__
+        cost = sys.getsizeof(mydict)
+        for value in six.itervalues(mydict):
+            if isinstance(value, (numpy.ndarray, NumCache, ObjectCache)):
+                cost += value.nbytes
+            elif isinstance(value, dict):
+                cost += sys.getsizeof(value)
+        return cost
+
+
     def _g_update_dependent(self):
         """Update dependent objects after a location change.
 
@@ -576,9 +628,13 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
         oldparent._g_unrefnode(oldname)
 
         # Remove location information for this node.
+        node_manager = self._v_file._node_manager
+        pinned = oldpathname in node_manager.pinned
         self._g_del_location()
         # Set new location information for this node.
         self._g_set_location(newparent, newname)
+        if pinned:
+            node_manager.pin_node(self)
 
         # hdf5extension operations:
         #   Update node attributes.
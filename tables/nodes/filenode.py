@@ -34,11 +34,13 @@ from __future__ import absolute_import
 import io
 import os
 import re
+import threading
 import warnings
 
 import numpy as np
 
 import tables
+from tables.lrucacheextension import ObjectCache
 import six
 
 
@@ -85,6 +87,23 @@ class RawPyTablesIO(io.RawIOBase):
         self._vshape = self._size_to_shape[self._version]
         self._vtype = node.atom.dtype.base.type
 
+        # Cache of blocks of data for small reads and readline(), one
+        # block per chunk of the node.  The last block read is kept in
+        # `_block`, and complete blocks (which never change, since data
+        # can only be appended) in an LRU cache.
+        if node.chunkshape:
+            self._blocksize = node.chunkshape[0]
+        else:
+            self._blocksize = io.DEFAULT_BUFFER_SIZE
+        self._block = None
+        self._blockstart = 0
+        params = node._v_file.params
+        self._blockcache = ObjectCache(params['FILENODE_MAX_SLOTS'],
+                                       params['FILENODE_MAX_SIZE'],
+                                       'file node block cache')
+        # Serializes the accesses to the node and the block cache.
+        self._lock = threading.Lock()
+
     # read only attribute
     @property
     def mode(self):
@@ -245,29 +264,57 @@ class RawPyTablesIO(io.RawIOBase):
         self._checkClosed()
         self._checkReadable()
 
-        if self._pos >= self._node.nrows:
+        nrows = self._node.nrows
+        if self._pos >= nrows:
             return 0
 
-        n = len(b)
-        start = self._pos
-        stop = self._pos + n
+        n = min(len(b), nrows - self._pos)
+        with self._lock:
+            self._read_at(self._pos, np.frombuffer(b, dtype=np.uint8, count=n))
+        self._pos += n
 
-        # XXX optimized path
-        #if stop <= self._node.nrows and isinstance(b, np.ndarray):
-        #    self._node.read(start, stop, out=b)
-        #    self._pos += n
-        #    return n
+        return n
 
-        if stop > self._node.nrows:
-            stop = self._node.nrows
-            n = stop - start
+    def pread(self, offset, size):
+        """Read up to `size` bytes starting at byte `offset`.
 
-        # XXX This ought to work with anything that supports the buffer API
-        b[:n] = self._node.read(start, stop).tostring()
+        Return the bytes read, which are less than `size` only if the end
+        of the file node is reached.  Unlike :meth:`read`, the current
+        position of the file node is neither used nor changed, so this
+        method may be called concurrently from several threads sharing
+        the file node.  Small reads are served from an LRU cache of
+        decompressed blocks (see :data:`parameters.FILENODE_MAX_SIZE`).
 
-        self._pos += n
+        .. versionadded:: 3.3
 
-        return n
+        """
+
+        self._checkClosed()
+        self._checkReadable()
+
+        if offset < 0:
+            raise ValueError("negative offset %r" % (offset,))
+        if size < 0:
+            raise ValueError("negative size %r" % (size,))
+
+        with self._lock:
+            n = min(size, self._node.nrows - offset)
+            if n <= 0:
+                return b''
+            b = bytearray(n)
+            self._read_at(offset, np.frombuffer(b, dtype=np.uint8))
+        return bytes(b)
+
+    def readall(self):
+        """Read until EOF, using a single read."""
+
+        self._checkClosed()
+        self._checkReadable()
+
+        b = bytearray(max(0, self._node.nrows - self._pos))
+        n = self.readinto(b)
+        del b[n:]
+        return bytes(b)
 
     #def readline(self, limit: int = -1) -> bytes:
     def readline(self, limit=-1):
@@ -284,71 +331,94 @@ class RawPyTablesIO(io.RawIOBase):
         self._checkClosed()
         self._checkReadable()
 
-        chunksize = self._node.chunkshape[0] if self._node.chunkshape else -1
+        if limit is None:
+            limit = -1
+        partial = []
+        with self._lock:
+            nrows = self._node.nrows
+            while self._pos < nrows and limit != 0:
+                block = self._get_block(self._pos)
+                offset = self._pos - self._blockstart
+                end = len(block)
+                if limit > 0:
+                    end = min(end, offset + limit)
+                eolindex = block.find(b'\n', offset, end)
+                if eolindex >= 0:
+                    end = eolindex + 1
+                partial.append(block[offset:end])
+                self._pos += end - offset
+                if eolindex >= 0:
+                    break
+                if limit > 0:
+                    limit -= end - offset
 
-        # XXX: check
-        lsep = b'\n'
-        lseplen = len(lsep)
+        return b''.join(partial)
 
-        # Set the remaining bytes to read to the specified size.
-        remsize = limit
+    def _get_block(self, pos):
+        """Get the cached block of data containing the byte at `pos`."""
 
-        partial = []
-        finished = False
+        block = self._block
+        if (block is not None and self._blockstart <= pos and
+                pos < self._blockstart + len(block)):
+            return block
 
-        while not finished:
-            # Read a string limited by the remaining number of bytes.
-            if limit <= 0:
-                ibuff = self.read(chunksize)
-            else:
-                ibuff = self.read(min(remsize, chunksize))
-            ibufflen = len(ibuff)
-            remsize -= ibufflen
-
-            if ibufflen >= lseplen:
-                # Separator fits, look for EOL string.
-                eolindex = ibuff.find(lsep)
-            elif ibufflen == 0:
-                # EOF was immediately reached.
-                finished = True
-                continue
-            else:  # ibufflen < lseplen
-                # EOF was hit and separator does not fit. ;)
-                partial.append(ibuff)
-                finished = True
-                continue
-
-            if eolindex >= 0:
-                # Found an EOL. If there are trailing characters,
-                # cut the input buffer and seek back;
-                # else add the whole input buffer.
-                trailing = ibufflen - lseplen - eolindex  # Bytes beyond EOL.
-                if trailing > 0:
-                    obuff = ibuff[:-trailing]
-                    self.seek(-trailing, 1)
-                    remsize += trailing
-                else:
-                    obuff = ibuff
-                finished = True
-            elif lseplen > 1 and (limit <= 0 or remsize > 0):
-                # Seek back a little since the end of the read string
-                # may have fallen in the middle of the line separator.
-                obuff = ibuff[:-lseplen + 1]
-                self.seek(-lseplen + 1, 1)
-                remsize += lseplen - 1
-            else:  # eolindex<0 and (lseplen<=1 or (limit>0 and remsize<=0))
-                # Did not find an EOL, add the whole input buffer.
-                obuff = ibuff
-
-            # Append (maybe cut) buffer.
-            partial.append(obuff)
-
-            # If a limit has been specified and the remaining count
-            # reaches zero, the reading is finished.
-            if limit > 0 and remsize <= 0:
-                finished = True
+        nblock = pos // self._blocksize
+        blockstart = nblock * self._blocksize
+        cache = self._blockcache
+        nslot = cache.getslot(nblock)
+        if nslot >= 0:
+            block = cache.getitem(nslot)
+        else:
+            stop = min(blockstart + self._blocksize, self._node.nrows)
+            block = self._node._read(blockstart, stop, 1).tostring()
+            if len(block) == self._blocksize:
+                cache.setitem(nblock, block, len(block))
+        self._block = block
+        self._blockstart = blockstart
+        return block
 
-        return b''.join(partial)
+    def _read_at(self, pos, out):
+        """Fill `out` with the data starting at `pos`.
+
+        Small reads are served from the block cache, while big ones go
+        straight into `out`.
+
+        """
+
+        n = len(out)
+        if n >= self._blocksize:
+            self._node._read(pos, pos + n, 1, out.reshape(self._vshape(n)))
+            return
+
+        copied = 0
+        while copied < n:
+            block = self._get_block(pos)
+            offset = pos - self._blockstart
+            count = min(n - copied, len(block) - offset)
+            out[copied:copied + count] = np.frombuffer(
+                block, dtype=np.uint8, count=count, offset=offset)
+            copied += count
+            pos += count
+
+    def _copy_to(self, f):
+        """Copy the data from the current position up to EOF into `f`.
+
+        `f` is a binary file object.  Data is read into a reusable
+        buffer of a whole number of chunks, which is then written to `f`.
+        Return the number of bytes copied.
+
+        """
+
+        buf = bytearray(64 * self._blocksize)
+        view = memoryview(buf)
+        ncopied = 0
+        while True:
+            n = self.readinto(buf)
+            if not n:
+                break
+            f.write(view[:n])
+            ncopied += n
+        return ncopied
 
     #def write(self, b: bytes) -> int:
     def write(self, b):
@@ -378,8 +448,10 @@ class RawPyTablesIO(io.RawIOBase):
             self._append_zeros(end2off)
 
         # Append data.
-        self._node.append(
-            np.ndarray(buffer=b, dtype=self._vtype, shape=self._vshape(n)))
+        with self._lock:
+            self._node.append(
+                np.ndarray(buffer=b, dtype=self._vtype, shape=self._vshape(n)))
+            self._block = None
 
         self._pos += n
 
@@ -484,8 +556,10 @@ class RawPyTablesIO(io.RawIOBase):
             return
 
         # XXX This may be redone to avoid a potentially large in-memory array.
-        self._node.append(
-            np.zeros(dtype=self._vtype, shape=self._vshape(size)))
+        with self._lock:
+            self._node.append(
+                np.zeros(dtype=self._vtype, shape=self._vshape(size)))
+            self._block = None
 
 
 class FileNodeMixin(object):
@@ -572,7 +646,8 @@ class RAFileNode(FileNodeMixin, RawPyTablesIO):
     must be passed to specify where the file node is to be created.
     Other named arguments such as 'title' and 'filters' may also be
     passed.  The special named argument 'expectedsize', indicating an
-    estimate of the file size in bytes, may also be passed.
+    estimate of the file size in bytes, may also be passed, as well as
+    'blocksize', the size in bytes of the chunks of the node.
 
     Write access means reading as well as appending data is allowed.
 
@@ -606,7 +681,7 @@ class RAFileNode(FileNodeMixin, RawPyTablesIO):
     ]
 
     __allowed_init_kwargs = [
-        'where', 'name', 'title', 'filters', 'expectedsize']
+        'where', 'name', 'title', 'filters', 'expectedsize', 'blocksize']
 
     def __init__(self, node, h5file, **kwargs):
         if node is not None:
@@ -632,6 +707,14 @@ class RAFileNode(FileNodeMixin, RawPyTablesIO):
             # Create a new array in the specified PyTables file.
             self._version = NodeTypeVersions[-1]
             shape = self._byte_shape[self._version]
+
+            # Turn 'blocksize' into 'chunkshape'.
+            if 'blocksize' in kwargs:
+                kwargs = kwargs.copy()
+                blocksize = kwargs.pop('blocksize')
+                if blocksize is not None:
+                    kwargs['chunkshape'] = (blocksize,) + shape[1:]
+
             node = h5file.create_earray(
                 atom=tables.UInt8Atom(), shape=shape, **kwargs)
 
@@ -674,6 +757,17 @@ def new_node(h5file, **kwargs):
     The special named argument expectedsize, indicating an estimate of the
     file size in bytes, may also be passed. It returns the file node object.
 
+    The special named argument blocksize sets the size in bytes of the
+    chunks of the node, i.e. the amount of data that is compressed
+    together.  Small blocks make random reads of compressed file nodes
+    cheaper, since a whole block has to be decompressed for reading any
+    byte in it (decompressed blocks are cached, see
+    :meth:`RawPyTablesIO.pread`).  By default, it is computed from
+    expectedsize.
+
+    .. versionchanged:: 3.3
+       Added the blocksize argument.
+
     """
 
     return RAFileNode(None, h5file, **kwargs)
@@ -703,7 +797,7 @@ def open_node(node, mode='r'):
 
 
 def save_to_filenode(h5file, filename, where, name=None, overwrite=False,
-                     title="", filters=None):
+                     title="", filters=None, blocksize=None):
     """Save a file's contents to a filenode inside a PyTables file.
 
     .. versionadded:: 3.2
@@ -741,6 +835,12 @@ def save_to_filenode(h5file, filename, where, name=None, overwrite=False,
        information about the desired I/O filters to be applied
        during the life of this object.
 
+    blocksize
+       The size in bytes of the chunks of the filenode (see
+       :func:`new_node`).
+
+       .. versionadded:: 3.3
+
     """
     # sanity checks
     if not os.access(filename, os.R_OK):
@@ -790,7 +890,8 @@ def save_to_filenode(h5file, filename, where, name=None, overwrite=False,
         pass
 
     # write file's contents to filenode
-    fnode = new_node(f, where=where, name=name, title=title, filters=filters)
+    fnode = new_node(f, where=where, name=name, title=title, filters=filters,
+                     blocksize=blocksize)
     fnode.write(data)
     fnode.attrs._filename = os.path.split(filename)[1]
     fnode.close()
@@ -869,16 +970,12 @@ def read_from_filenode(h5file, filename, where, name=None, overwrite=False,
             f.close()
         raise IOError("The file '%s' cannot be written to" % filename)
 
-    # read data from filenode
-    data = fnode.read()
-    fnode.close()
-
-    # store data to file
+    # copy data from filenode to file
     with open(filename, "wb") as fd:
-        fd.write(data)
+        fnode._copy_to(fd)
+    fnode.close()
 
     # cleanup
-    del data
     if new_h5file:
         f.close()
 
@@ -17,10 +17,11 @@ import os
 import shutil
 import tempfile
 import warnings
+from io import BytesIO
 
 from pkg_resources import resource_filename
 
-from ... import open_file, file, NoSuchNodeError
+from ... import open_file, file, Filters, NoSuchNodeError
 from ...nodes import filenode
 from ...tests.common import (
     unittest, TempFileMixin, parse_argv, print_versions,
@@ -412,6 +413,212 @@ class ReadFileTestCase(TempFileMixin, TestCase):
                 "PIL was not able to create an image from the file node.")
 
 
+class BufferedReadTestCase(TempFileMixin, TestCase):
+    """Tests chunk-aligned buffered reads from a file node."""
+
+    def setUp(self):
+        super(BufferedReadTestCase, self).setUp()
+
+        # A small chunk size makes reads cross many block boundaries.
+        self.data = b''.join(
+            ('line %d\n' % i).encode('ascii') * (i % 5)
+            for i in range(2000))
+        fnode = filenode.new_node(self.h5file, where='/', name='test',
+                                  expectedsize=1024)
+        fnode.write(self.data)
+        fnode.close()
+        self.fnode = filenode.open_node(self.h5file.get_node('/test'), 'a+')
+
+    def tearDown(self):
+        self.fnode.close()
+        self.fnode = None
+        super(BufferedReadTestCase, self).tearDown()
+
+    def test00_ReadIntoSmall(self):
+        """Reading small pieces into a caller buffer."""
+
+        buf = bytearray(7)
+        pieces = []
+        while True:
+            n = self.fnode.readinto(buf)
+            if not n:
+                break
+            pieces.append(bytes(buf[:n]))
+        self.assertEqual(b''.join(pieces), self.data)
+
+    def test01_ReadIntoBig(self):
+        """Reading a big block straight into a caller buffer."""
+
+        buf = bytearray(len(self.data) + 10)
+        self.fnode.seek(3)
+        n = self.fnode.readinto(memoryview(buf))
+        self.assertEqual(n, len(self.data) - 3)
+        self.assertEqual(bytes(buf[:n]), self.data[3:])
+        self.assertEqual(self.fnode.readinto(buf), 0)
+
+    def test02_ReadAll(self):
+        """Reading the rest of the node in one call."""
+
+        self.fnode.seek(100)
+        self.assertEqual(self.fnode.read(), self.data[100:])
+        self.assertEqual(self.fnode.read(), b'')
+
+    def test03_Readline(self):
+        """Reading lines across block boundaries."""
+
+        self.assertEqual(list(self.fnode), self.data.splitlines(True))
+
+    def test04_ReadlineLimit(self):
+        """Reading lines with a size limit."""
+
+        self.fnode.seek(len(self.data) // 2)
+        expected = self.data[len(self.data) // 2:]
+        pieces = []
+        while True:
+            line = self.fnode.readline(5)
+            if not line:
+                break
+            self.assertTrue(len(line) <= 5)
+            pieces.append(line)
+        self.assertEqual(b''.join(pieces), expected)
+
+    def test05_ReadAfterWrite(self):
+        """Reading data appended after the last block was cached."""
+
+        end = len(self.data)
+        self.fnode.seek(end - 1)
+        self.assertEqual(self.fnode.read(1), b'\n')
+        self.fnode.write(b'more')
+        self.fnode.seek(end - 1)
+        self.assertEqual(self.fnode.read(), b'\nmore')
+
+    def test06_CopyTo(self):
+        """Copying the node contents to another file."""
+
+        out = BytesIO()
+        self.fnode.seek(10)
+        self.assertEqual(self.fnode._copy_to(out), len(self.data) - 10)
+        self.assertEqual(out.getvalue(), self.data[10:])
+
+
+class PreadTestCase(TempFileMixin, TestCase):
+    """Tests positional reads from a compressed file node."""
+
+    blocksize = 1024
+
+    def setUp(self):
+        super(PreadTestCase, self).setUp()
+
+        self.data = bytes(bytearray(i * 7 % 251 for i in range(50000)))
+        fnode = filenode.new_node(
+            self.h5file, where='/', name='test', blocksize=self.blocksize,
+            filters=Filters(complevel=1, shuffle=False))
+        fnode.write(self.data)
+        fnode.close()
+        self.fnode = filenode.open_node(self.h5file.get_node('/test'))
+
+    def tearDown(self):
+        self.fnode.close()
+        self.fnode = None
+        super(PreadTestCase, self).tearDown()
+
+    def test00_BlockSize(self):
+        """Setting the size of the chunks of a new file node."""
+
+        self.assertEqual(self.fnode.node.chunkshape, (self.blocksize,))
+
+    def test01_Pread(self):
+        """Reading at given offsets without moving the pointer."""
+
+        self.fnode.seek(10)
+        for offset, size in [(0, 10), (1000, 100), (1020, 10),
+                             (49990, 5), (7000, 20000)]:
+            self.assertEqual(self.fnode.pread(offset, size),
+                             self.data[offset:offset + size])
+        self.assertEqual(self.fnode.tell(), 10)
+
+    def test02_PreadEOF(self):
+        """Reading at and beyond the end of a file node."""
+
+        self.assertEqual(self.fnode.pread(49990, 100), self.data[49990:])
+        self.assertEqual(self.fnode.pread(50000, 10), b'')
+        self.assertEqual(self.fnode.pread(60000, 10), b'')
+        self.assertEqual(self.fnode.pread(0, 0), b'')
+
+    def test03_PreadErrors(self):
+        """Reading with invalid arguments."""
+
+        self.assertRaises(ValueError, self.fnode.pread, -1, 10)
+        self.assertRaises(ValueError, self.fnode.pread, 0, -1)
+        self.fnode.close()
+        self.assertRaises(ValueError, self.fnode.pread, 0, 10)
+
+    def test04_BlockCache(self):
+        """Keeping decompressed blocks in the cache."""
+
+        blocksize = self.fnode._blocksize
+        self.fnode.pread(3, 10)
+        self.fnode.pread(2 * blocksize + 3, 10)
+        cache = self.fnode._blockcache
+        self.assertTrue(cache.getslot(0) >= 0)
+        self.assertTrue(cache.getslot(2) >= 0)
+        self.assertEqual(cache.getslot(1), -1)
+        self.assertEqual(self.fnode.pread(5, 10), self.data[5:15])
+
+    def test05_Threads(self):
+        """Reading concurrently from several threads."""
+
+        import random
+        import threading
+
+        errors = []
+
+        def reader(seed):
+            rnd = random.Random(seed)
+            for i in range(200):
+                offset = rnd.randrange(len(self.data))
+                size = rnd.randrange(1, 3000)
+                if (self.fnode.pread(offset, size) !=
+                        self.data[offset:offset + size]):
+                    errors.append((offset, size))
+
+        threads = [threading.Thread(target=reader, args=(i,))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test06_PreadAfterAppend(self):
+        """Reading the last block after appending data to it."""
+
+        self.fnode.close()
+        self.fnode = filenode.open_node(self.h5file.get_node('/test'), 'a+')
+        self.assertEqual(self.fnode.pread(49990, 100), self.data[49990:])
+        self.fnode.write(b'more')
+        self.assertEqual(self.fnode.pread(49990, 100),
+                         self.data[49990:] + b'more')
+
+    def test07_SaveWithBlockSize(self):
+        """Saving a file to a file node with a given block size."""
+
+        datafname = tempfile.mktemp()
+        try:
+            with open(datafname, 'wb') as fd:
+                fd.write(self.data)
+            filenode.save_to_filenode(self.h5file, datafname, '/saved',
+                                      blocksize=4096)
+        finally:
+            os.remove(datafname)
+        fnode = filenode.open_node(self.h5file.get_node('/saved'))
+        try:
+            self.assertEqual(fnode.node.chunkshape, (4096,))
+            self.assertEqual(fnode.pread(100, 10), self.data[100:110])
+        finally:
+            fnode.close()
+
+
 class ReadlineTestCase(TempFileMixin, TestCase):
     """Base class for text line-reading test cases.
 
@@ -1038,6 +1245,8 @@ def suite():
     theSuite.addTest(unittest.makeSuite(WriteFileTestCase))
     theSuite.addTest(unittest.makeSuite(OpenFileTestCase))
     theSuite.addTest(unittest.makeSuite(ReadFileTestCase))
+    theSuite.addTest(unittest.makeSuite(BufferedReadTestCase))
+    theSuite.addTest(unittest.makeSuite(PreadTestCase))
     theSuite.addTest(unittest.makeSuite(MonoReadlineTestCase))
     #theSuite.addTest(unittest.makeSuite(MultiReadlineTestCase))
     #theSuite.addTest(unittest.makeSuite(LineSeparatorTestCase))
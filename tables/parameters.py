@@ -34,6 +34,21 @@ BOUNDS_MAX_SIZE = 1 * _MB
 BOUNDS_MAX_SLOTS = 4 * _KB
 """The maximum number of slots for the BOUNDS cache."""
 
+FILENODE_MAX_SIZE = 8 * _MB
+"""The maximum size for the decompressed blocks of data cached by each
+opened file node (see :mod:`nodes.filenode`) for small reads.
+
+.. versionadded:: 3.3
+
+"""
+
+FILENODE_MAX_SLOTS = 256
+"""The maximum number of blocks cached by each opened file node.
+
+.. versionadded:: 3.3
+
+"""
+
 ITERSEQ_MAX_ELEMENTS = 1 * _KB
 """The maximum number of iterator elements cached in data lookups."""
 
@@ -177,6 +192,101 @@ be warned when the number of loaded nodes will reach the
 Finally, a value of zero means that any cache mechanism is disabled.
 """
 
+NODE_CACHE_SIZE = 0
+"""Maximum estimated memory (in bytes) to be kept alive by the nodes in
+the node cache.
+
+When larger than zero (and :data:`NODE_CACHE_SLOTS` is positive), the
+memory taken by each cached node (including its I/O buffers and data
+caches) is estimated, and least recently used nodes are unloaded so that
+the total does not exceed this value, besides limiting their number to
+:data:`NODE_CACHE_SLOTS`.  This way, a few big nodes (e.g. tables) can
+not keep lots of memory alive while many small ones (e.g. groups) can be
+cached.  The default (0) only limits the number of nodes.
+
+See :meth:`File.get_node_cache_stats` for monitoring the cache and
+:meth:`File.pin_node` for keeping some nodes always loaded.
+
+.. versionadded:: 3.3
+
+"""
+
+QUERY_CACHE_SLOTS = 0
+"""Maximum number of query results to be kept on disk for each table.
+
+When larger than zero, the coordinates of the rows returned by
+:meth:`Table.get_where_list` and :meth:`Table.read_where` are saved in a
+hidden group next to the table, so that the same queries (even from
+other processes) can be answered without evaluating the condition again.
+Only queries whose variables are scalars or columns of the table are
+cached, and only when ``QUERY_CACHE_WRITE`` is enabled and the file is
+writable (though the cache is used for read-only files too).  The cache
+of a table is removed when any of its rows is appended, modified or
+removed through PyTables, and ignored when the table has been appended
+to, shrunk or had its attributes changed by other tools.  Data
+overwritten in place by other tools can not be detected, though.  The
+oldest queries are discarded when the number of slots is exceeded.
+
+A value of zero (the default) disables this cache.
+
+.. versionadded:: 3.3
+
+"""
+
+QUERY_CACHE_WRITE = False
+"""Whether table queries save their results in the persistent query cache.
+
+As this makes :meth:`Table.get_where_list` and :meth:`Table.read_where`
+write to the file as a side effect, it is disabled by default.  It is
+best enabled only for the files which need it, by passing
+``query_cache_write=True`` to :func:`open_file` (along with
+``query_cache_slots``).  When disabled, the results already in the query
+cache are still used (if ``QUERY_CACHE_SLOTS`` is larger than zero), but
+queries never create, update nor drop caches.
+
+.. versionadded:: 3.3
+
+"""
+
+SHARED_CACHE_SIZE = 0
+"""Size (in bytes) of a cache for decompressed table chunks and index
+data shared by all the processes in the machine.
+
+When larger than zero, the chunks of tables read during indexed queries
+and the ``bounds`` and ``sorted`` data of optimized indexes are also
+kept in a file mapped in memory (see :data:`SHARED_CACHE_NAME`), so that
+other processes reading the same datasets do not need to read and
+decompress them again.  Only files opened in read-only mode with the
+default HDF5 driver use this cache, and they must not be modified while
+it is in use.  The least recently used data is evicted when the cache is
+full.  The size of the cache is fixed by the first process creating it.
+A value of zero (the default) disables this cache.
+
+.. versionadded:: 3.3
+
+"""
+
+SHARED_CACHE_SET_SIZE = 1 * _MB
+"""The size (in bytes) of each set of the shared cache (see
+:data:`SHARED_CACHE_SIZE`).  Data is kept in the set chosen by hashing
+its keys, taking just the bytes it needs, so this is also the maximum
+size of a chunk in the cache.  Larger chunks are not cached, and a
+:exc:`PerformanceWarning` is issued for the first one.
+
+.. versionadded:: 3.3
+
+"""
+
+SHARED_CACHE_NAME = 'pytables-cache'
+"""The name of the file backing the shared cache (see
+:data:`SHARED_CACHE_SIZE`).  Relative names are taken from
+:file:`/dev/shm` (or the temporary directory if it does not exist).
+Processes using the same name share the same cache.
+
+.. versionadded:: 3.3
+
+"""
+
 
 # Parameters for the I/O buffer in `Leaf` objects
 # -----------------------------------------------
@@ -213,6 +323,57 @@ system attributes are not considered for guessing the class of the node
 during its loading from disk (this work is delegated to the PyTables'
 class discoverer function for general HDF5 files)."""
 
+EAGER_NODE_ATTRS = False
+"""Set this to ``True`` to read all the attributes of a node as soon as
+its attribute set is opened (e.g. for interactive use).  By default, only
+the names of the attributes are read then, and every value is read (and
+unpickled, if needed) when it is first accessed.
+
+.. versionadded:: 3.3
+
+"""
+
+MMAP = False
+"""Set this to ``True`` to map in memory the data of arrays stored
+contiguously in the file without any filters and in the native byteorder
+(see :meth:`Array.as_memmap`), instead of reading it through HDF5.  This
+only applies to files opened in read-only mode, and only to slices and
+:meth:`Array.read` calls without an ``out`` argument, which then return
+read-only views of the mapped data.
+
+.. versionadded:: 3.3
+
+"""
+
+THREAD_SAFE = False
+"""Set this to ``True`` to share a file opened in read-only mode among
+several threads.  The calls to the HDF5 library (which is not
+thread-safe) are then serialized under a process-wide lock, so that
+reading nodes, attributes and data, as well as the node cache, the
+group listings and the chunk and sequence caches of tables, can be used
+concurrently from any thread.  The lock is released while running pure
+Python or NumPy code, so other threads can use the data already read
+while one of them is in the HDF5 library.  Iterating over an
+:class:`Array` or :class:`VLArray` node directly keeps its state in the
+node, so every thread should use its own slices or ``read()`` calls
+instead, while :class:`Table` row iterators are private to each thread.
+The *prefetch* argument of :meth:`Table.iterrows` is only honored for
+files opened with this parameter.  Opening a file in any other mode with
+this parameter set raises a ValueError.
+
+.. versionadded:: 3.3
+
+"""
+
+AIO_MAX_WORKERS = 4
+"""Maximum number of threads used by :mod:`tables.aio` to read from a
+file.  Only files opened with the ``THREAD_SAFE`` parameter set can be
+read asynchronously.
+
+.. versionadded:: 3.3
+
+"""
+
 MAX_NUMEXPR_THREADS = 2
 """The maximum number of threads that PyTables should use internally in
 Numexpr.  If `None`, it is automatically set to the number of cores in
@@ -227,6 +388,48 @@ your machine. In general, it is a good idea to set this to the number of
 cores in your machine or, when your machine has many of them (e.g. > 8),
 perhaps stay at 8 at maximum.  In general, 2 threads is a good tradeoff."""
 
+MAX_QUERY_THREADS = 1
+"""The maximum number of worker threads that PyTables should use for
+evaluating in-kernel (i.e. non-indexed) queries in :meth:`Table.where`,
+:meth:`Table.read_where` and :meth:`Table.get_where_list`.  When larger
+than 1, the query range is split in chunk-aligned pieces that are read
+and evaluated concurrently, and the results are merged in row order.
+The workers share the Numexpr and Blosc threads (see
+``MAX_NUMEXPR_THREADS`` and ``MAX_BLOSC_THREADS``, which are not changed
+during queries), so the number of workers is also limited to the number
+of cores of the machine divided by the larger of those.  The default (1)
+disables parallel queries.
+
+.. versionadded:: 3.3
+
+"""
+
+INDEX_DELTA_MAX_ROWS = 0
+"""The maximum number of modified or removed rows whose changes can be
+kept in the delta of an index, instead of making the index dirty.
+Queries and sorted reads merge the delta with the index in memory, so
+that modifying or removing a few rows does not require to rebuild it.  The delta is merged (i.e. the
+index is rebuilt) when it grows larger than this, when rows are appended
+after removing others, and by :meth:`Table.reindex_dirty`.  The default
+(0) disables index deltas.
+
+.. versionadded:: 3.3
+
+"""
+
+MAX_INDEX_THREADS = 1
+"""The maximum number of worker threads that PyTables should use for
+sorting the slices of an index while it is being built or updated (see
+:meth:`Column.create_index`).  The column values are still read and the
+index is still written from the calling thread, but that I/O overlaps
+with the sorting of other slices.  If `None`, it is automatically set to
+the number of cores in your machine.  The default (1) sorts the slices
+one after another.
+
+.. versionadded:: 3.3
+
+"""
+
 USER_BLOCK_SIZE = 0
 """Sets the user block size of a file.
 
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 18, 2026
+#
+# $Id$
+#
+########################################################################
+
+"""Persistent cache for the coordinates resulting from table queries.
+
+The coordinates of the rows fulfilling a condition are kept in a hidden
+group which lives next to the table (as the group of indexes does), so
+that they can be reused by later processes opening the same file.  The
+cache is dropped as a whole as soon as the table is modified, and it is
+ignored when the table has changed since it was built (see
+`QueryCacheG.stamp`).
+
+"""
+
+from __future__ import absolute_import
+
+import ast
+import hashlib
+
+import numpy
+
+from .node import NotLoggedMixin
+from .group import Group
+from .earray import EArray
+from .atom import Int64Atom
+from .filters import Filters
+from .path import join_path, split_path
+
+
+query_cache_filters = Filters(complevel=1, complib='zlib', shuffle=True)
+"""The filters used for the arrays of cached coordinates."""
+
+
+def _query_cache_name_of(table):
+    return '_p_qcache_%s' % table._v_name
+
+
+def _query_cache_pathname_of(table):
+    parentpath = split_path(table._v_pathname)[0]
+    return join_path(parentpath, _query_cache_name_of(table))
+
+
+def query_key(condition, condvars, start, stop, step):
+    """Get the persistent cache key for a query.
+
+    The key is a string built out of the normalized `condition`, the
+    `condvars` mapping (as returned by ``Table._required_expr_vars()``)
+    and the range of the query.  None is returned if the query can not
+    be cached (i.e. it uses non-scalar variables).
+
+    """
+
+    # Comparing syntax trees makes the key independent of spacing
+    # and redundant parentheses in the condition.
+    normcond = ast.dump(ast.parse(condition.strip(), mode='eval'))
+    variables = []
+    for var, val in sorted(condvars.items()):
+        if hasattr(val, 'pathname'):  # column
+            variables.append((var, 'column', val.pathname))
+        elif val.shape == ():
+            variables.append((var, val.dtype.str, val.item()))
+        else:
+            return None
+    return repr((normcond, tuple(variables), (start, stop, step)))
+
+
+class QueryCacheArray(NotLoggedMixin, EArray):
+    """Container for the coordinates resulting from a cached query."""
+
+    # Class identifier.
+    _c_classid = 'QCACHEARRAY'
+
+
+class QueryCacheG(NotLoggedMixin, Group):
+    """Container for the cached queries of a table.
+
+    The coordinates of every query are kept in a `QueryCacheArray`
+    named after a hash of the query key.  The number of rows of the
+    table and the time of the last change of its dataset when the group
+    was created are saved in its ``NROWS`` and ``CTIME`` attributes,
+    and the names of cached queries (oldest first) in ``QUERIES``.
+
+    """
+
+    _c_classid = 'QCACHE'
+
+    def _g_check_name(self, name):
+        if not name.startswith('_p_qcache_'):
+            raise ValueError(
+                "names of query cache groups must start with "
+                "``_p_qcache_``: %s" % name)
+
+    @staticmethod
+    def _entry_name(key):
+        return 'q' + hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _queries(self):
+        if 'QUERIES' not in self._v_attrs:
+            return []
+        return str(self._v_attrs.QUERIES).split()
+
+    def get(self, key):
+        """Get the coordinates cached for `key` (None if missing)."""
+
+        name = self._entry_name(key)
+        if name not in self:
+            return None
+        entry = self._f_get_child(name)
+        if entry._v_attrs.QUERY != key:  # hash collision
+            return None
+        return entry.read()
+
+    def put(self, key, coords, maxslots):
+        """Cache the `coords` for `key`, keeping at most `maxslots`."""
+
+        name = self._entry_name(key)
+        queries = self._queries()
+        if name in queries:
+            return
+        while len(queries) >= maxslots:
+            # Make room by discarding the oldest query
+            self._f_get_child(queries.pop(0))._g_remove(False, False)
+        entry = QueryCacheArray(
+            self, name, Int64Atom(), (0,), "Cached query coordinates",
+            filters=query_cache_filters, expectedrows=max(len(coords), 1),
+            _log=False)
+        entry.append(numpy.asarray(coords, dtype=numpy.int64))
+        entry._v_attrs.QUERY = key
+        queries.append(name)
+        self._v_attrs.QUERIES = ' '.join(queries)
+
+    @property
+    def stamp(self):
+        """The state of the table the cached queries refer to.
+
+        This is a tuple with the number of rows of the table and the
+        time of the last change in the metadata of its dataset (see
+        `table_stamp()`), or None for caches without this information.
+
+        """
+
+        attrs = self._v_attrs
+        if 'NROWS' not in attrs or 'CTIME' not in attrs:
+            return None
+        return (int(attrs.NROWS), int(attrs.CTIME))
+
+
+def table_stamp(table):
+    """Get the current state of `table` to be matched by its query cache.
+
+    Besides PyTables dropping the cache of a table on every modification,
+    this detects the tables appended to, shrunk or otherwise changed by
+    other tools (or by PyTables versions without query caches).  However,
+    data overwritten in place by such tools can not be detected.
+
+    """
+
+    return (table.nrows, table._get_obj_ctime())
+
+
+def create_query_cache(table):
+    qcgroup = QueryCacheG(
+        table._v_parent, _query_cache_name_of(table),
+        "Query cache for table " + table._v_pathname, new=True)
+    qcgroup._v_attrs.NROWS, qcgroup._v_attrs.CTIME = table_stamp(table)
+    return qcgroup
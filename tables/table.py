@@ -13,11 +13,14 @@
 """Here is defined the Table class."""
 from __future__ import absolute_import
 
+import collections
 import math
 import operator
 import os.path
 import sys
+import threading
 import warnings
+import weakref
 
 from functools import reduce as _reduce
 from time import time
@@ -25,15 +28,18 @@ from time import time
 import numpy
 import numexpr
 
+from . import indexesextension
 from . import tableextension
 from .lrucacheextension import ObjectCache, NumCache
 from .atom import Atom
-from .conditions import compile_condition
+from .conditions import compile_condition, call_on_recarr
 from numexpr.necompiler import (
     getType as numexpr_getType, double, is_cpu_amd_intel)
 from numexpr.expressions import functions as numexpr_functions
+from numexpr import interpreter as numexpr_interpreter
 from .flavor import flavor_of, array_as_internal, internal_to_flavor
-from .utils import is_idx, lazyattr, SizeType, NailedDict as CacheDict
+from .utils import (is_idx, lazyattr, SizeType, NailedDict as CacheDict,
+                    synchronized, get_caller_frame, detect_number_of_cores)
 from .leaf import Leaf
 from .description import (IsDescription, Description, Col, descr_from_dtype)
 from .exceptions import (
@@ -45,10 +51,18 @@ from .path import join_path, split_path
 from .index import (
     OldIndex, default_index_filters, default_auto_index, Index, IndexesDescG,
     IndexesTableG)
+from .querycache import (
+    create_query_cache, query_key, table_stamp, _query_cache_name_of,
+    _query_cache_pathname_of)
+from .zonemap import (
+    check_bloom_dtype, check_zonemap_dtype, compute_blooms, compute_zones,
+    create_zonemap_group, bloom_bits_per_row, _zonemap_name_of,
+    _zonemap_pathname_of)
 
 import six
 from six.moves import range
 from six.moves import zip
+from six.moves import queue
 
 profile = False
 # profile = True  # Uncomment for profiling
@@ -109,6 +123,10 @@ if hasattr(numpy, 'complex256'):
 # The NumPy scalar type corresponding to `SizeType`.
 _npsizetype = numpy.array(SizeType(0)).dtype.type
 
+# Scattered reads and updates of uncompressed tables touching at least this
+# fraction of the rows in their chunks access whole chunks, not single rows.
+_scatter_chunk_density = 1. / 8
+
 
 def _index_name_of(node):
     return '_i_%s' % node._v_name
@@ -148,6 +166,10 @@ def restorecache(self):
     nslots = params['TABLE_MAX_SIZE'] / (chunksize * self._v_dtype.itemsize)
     self._chunkcache = NumCache((nslots, chunksize), self._v_dtype,
                                 'table chunk cache')
+    # The chunks are also looked up in the cache shared with other
+    # processes, if any
+    self._sharedcache, self._sharedcachekey = (
+        self._v_file._get_shared_cache(self, 'chunks'))
     self._seqcache = ObjectCache(params['ITERSEQ_MAX_SLOTS'],
                                  params['ITERSEQ_MAX_SIZE'],
                                  'Iter sequence cache')
@@ -191,17 +213,46 @@ def _table__where_indexed(self, compiled, condition, condvars,
         # in the iterator if possible. (Row._finish_riterator)
         self._seqcache_key = seqkey
 
+    chunkmap = _table__indexed_chunkmap(self, compiled, condvars)
+    if chunkmap is None:
+        # No candidates found, so the result is empty
+        self._seqcache.setitem(seqkey, [], 1)
+        return iter([])
+
+    if profile:
+        show_stats("Exiting table_whereIndexed", tref)
+    return chunkmap
+
+
+def _table__indexed_chunkmap(self, compiled, condvars):
+    """Get the map of the chunks which may hold rows fulfilling `compiled`.
+
+    The map is computed from the indexes (or zone maps) of the columns
+    in the index expressions of `compiled`.  None is returned when no
+    chunk may hold such rows.
+
+    """
+
     # Compute the chunkmap for every index in indexed expression
     idxexprs = compiled.index_expressions
     strexpr = compiled.string_expression
     cmvars = {}
     tcoords = 0
+    zonemapped = deltas = False
+    nrowsinchunk = self.chunkshape[0]
+    nchunks = int(math.ceil(float(self.nrows) / nrowsinchunk))
     for i, idxexpr in enumerate(idxexprs):
         var, ops, lims = idxexpr
         col = condvars[var]
         index = col.index
-        assert index is not None, "the chosen column is not indexed"
-        assert not index.dirty, "the chosen column has a dirty index"
+        if index is None or index.dirty:
+            # Get the chunkmap from the zone map of the column
+            zmgroup = self._get_zonemaps()
+            assert zmgroup is not None, "the chosen column is not indexed"
+            cmvars["e%d" % i] = zmgroup.get_chunkmap(col.pathname, ops,
+                                                     lims, nchunks, col.dtype)
+            zonemapped = True
+            continue
 
         # Get the number of rows that the indexed condition yields.
         range_ = index.get_lookup_range(ops, lims)
@@ -209,30 +260,243 @@ def _table__where_indexed(self, compiled, condition, condvars,
         tcoords += ncoords
         if index.reduction == 1 and ncoords == 0:
             # No values from index condition, thus the chunkmap should be empty
-            nrowsinchunk = self.chunkshape[0]
-            nchunks = int(math.ceil(float(self.nrows) / nrowsinchunk))
             chunkmap = numpy.zeros(shape=nchunks, dtype="bool")
         else:
             # Get the chunkmap from the index
             chunkmap = index.get_chunkmap()
+        if index.has_delta:
+            # Merge the changes not in the sorted index yet
+            chunkmap = index.apply_delta(chunkmap, range_, nchunks)
+            deltas = True
         # Assign the chunkmap to the cmvars dictionary
         cmvars["e%d" % i] = chunkmap
 
-    if index.reduction == 1 and tcoords == 0:
+    if (not (zonemapped or deltas) and index.reduction == 1
+            and tcoords == 0):
         # No candidates found in any indexed expression component, so leave now
-        self._seqcache.setitem(seqkey, [], 1)
-        return iter([])
+        return None
 
     # Compute the final chunkmap
     chunkmap = numexpr.evaluate(strexpr, cmvars)
     if not chunkmap.any():
         # The chunkmap is all False, so the result is empty
-        self._seqcache.setitem(seqkey, [], 1)
-        return iter([])
+        return None
+    return chunkmap
+
+
+def _table__index_slices_parallel(self, index, colname, start, nslices,
+                                  nthreads, update):
+    """Add `nslices` slices of `colname` from row `start` to `index`.
+
+    The column is read and the sorted slices are appended to the index
+    from the calling thread (the HDF5 library is not thread-safe), while
+    up to `nthreads` worker threads sort the slices.  The sort releases
+    the GIL, so that several slices are sorted at a time while the next
+    ones are read.
+
+    """
+
+    slicesize = index.slicesize
+    tasks = queue.Queue()
+    pending = collections.deque()
+    errors = []
+
+    def worker():
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            arr, idx, done = task
+            try:
+                indexesextension.keysort(arr, idx)
+            except Exception:
+                errors.append(sys.exc_info())
+            finally:
+                done.set()
+
+    def append_sorted():
+        arr, idx, done = pending.popleft()
+        done.wait()
+        if errors:
+            six.reraise(*errors[0])
+        index.append([arr], update=update, idx=idx)
+
+    workers = [threading.Thread(target=worker) for i in range(nthreads)]
+    for thread in workers:
+        thread.daemon = True
+        thread.start()
+    nrow = start // slicesize
+    try:
+        for nslice in range(nrow, nrow + nslices):
+            arr = self._read(nslice * slicesize, (nslice + 1) * slicesize, 1,
+                             colname)
+            if index.indsize == 8 and index.nelementsILR > 0:
+                # The values in the last row (already sorted) are merged
+                # with the first slice, so it can not be sorted apart
+                index.append([arr], update=update)
+                continue
+            idx = index.slice_indices(len(arr), nslice)
+            task = (arr, idx, threading.Event())
+            pending.append(task)
+            tasks.put(task)
+            # Keep every worker busy, but bound the memory in use
+            if len(pending) > nthreads:
+                append_sorted()
+        while pending:
+            append_sorted()
+    finally:
+        for thread in workers:
+            tasks.put(None)
+        for thread in workers:
+            thread.join()
+
+
+def _table__iter_prefetching(row):
+    """Iterate over the prefetching `row` iterator.
+
+    The read-ahead of `row` is stopped when the generator is closed, so
+    that no read is left in flight after leaving a loop with ``break``.
+
+    """
+
+    try:
+        for item in row:
+            yield item
+    finally:
+        row._stop_prefetching()
+
+
+def _table__iter_where_parallel(self, compiled, condvars, start, stop, step,
+                                nthreads, getrows=False):
+    """Evaluate an in-kernel query over chunk-aligned ranges in parallel.
+
+    The ``[start, stop)`` range is split at multiples of `nrowsinbuf`
+    (which is itself a multiple of the chunk size).  Every piece is read
+    by the calling thread, so that the HDF5 library (which is not
+    thread-safe) is never called from other threads, and the condition
+    is evaluated on it by one of `nthreads` worker threads while the
+    next pieces are being read.
+
+    This is a generator yielding a ``(coords, rows)`` tuple for every
+    piece, in row order, as soon as it has been evaluated.  `coords`
+    holds the matching coordinates in the piece, and `rows` is a
+    structured array with the matching rows when `getrows` is true, or
+    None otherwise.  At most ``nthreads + 1`` pieces are kept in memory.
+
+    """
+
+    nrowsinbuf = self.nrowsinbuf
+    bounds = [start] + list(range(start - start % nrowsinbuf + nrowsinbuf,
+                                  stop, nrowsinbuf)) + [stop]
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+    nthreads = min(nthreads, len(ranges))
+    func = compiled.function
+    condargs = [condvars[param] for param in compiled.parameters]
+
+    tasks = queue.Queue()
+    pending = collections.deque()
+    buffers = [self._get_container(nrowsinbuf) for i in range(nthreads + 1)]
+    errors = []
+
+    def worker():
+        # Numexpr function objects are not reentrant, so every worker
+        # needs its own copy of the compiled condition
+        condfunc = numexpr_interpreter.NumExpr(
+            func.signature, func.tempsig, func.program, func.constants,
+            func.input_names)
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            iobuf, nrecords, rstart, done, result = task
+            recarr = iobuf[:nrecords]
+            try:
+                valid = call_on_recarr(condfunc, condargs, recarr)
+                coords = numpy.arange(rstart, rstart + nrecords,
+                                      dtype=SizeType)
+                if step > 1:
+                    valid &= ((coords - start) % step == 0)
+                rows = recarr[valid] if getrows else None
+                result.append((coords[valid], rows))
+            except Exception:
+                errors.append(sys.exc_info())
+            finally:
+                done.set()
+
+    def collect():
+        iobuf, nrecords, rstart, done, result = pending.popleft()
+        done.wait()
+        if errors:
+            six.reraise(*errors[0])
+        buffers.append(iobuf)
+        return result[0]
+
+    # The Numexpr and Blosc thread pools are process-wide, so the workers
+    # share them as configured when the file was opened, instead of
+    # changing them under other threads
+    workers = [threading.Thread(target=worker) for i in range(nthreads)]
+    for thread in workers:
+        thread.daemon = True
+        thread.start()
+    try:
+        for rstart, rstop in ranges:
+            if not buffers:
+                yield collect()
+            iobuf = buffers.pop()
+            nrecords = self._read_records(rstart, rstop - rstart, iobuf)
+            task = (iobuf, nrecords, rstart, threading.Event(), [])
+            pending.append(task)
+            tasks.put(task)
+        while pending:
+            yield collect()
+    finally:
+        for thread in workers:
+            tasks.put(None)
+        for thread in workers:
+            thread.join()
+
+
+def _table__where_parallel(self, compiled, condvars, start, stop, step,
+                           nthreads, getrows=False):
+    """Evaluate an in-kernel query in parallel and merge the results.
+
+    A ``(coords, rows)`` tuple is returned with the matching coordinates
+    in row order, and the matching rows (or None) as in
+    ``_table__iter_where_parallel()``.
+
+    """
 
     if profile:
-        show_stats("Exiting table_whereIndexed", tref)
-    return chunkmap
+        tref = time()
+    if profile:
+        show_stats("Entering table_whereParallel", tref)
+    results = list(_table__iter_where_parallel(
+        self, compiled, condvars, start, stop, step, nthreads, getrows))
+    coords = numpy.concatenate([res[0] for res in results])
+    if getrows:
+        rows = numpy.concatenate([res[1] for res in results])
+    else:
+        rows = None
+    if profile:
+        show_stats("Exiting table_whereParallel", tref)
+    return coords, rows
+
+
+def _table__iter_where_parallel_rows(self, pieces):
+    """Iterate over the rows matching a parallel query, piece by piece.
+
+    `pieces` is the generator returned by
+    ``_table__iter_where_parallel()``.
+
+    """
+
+    try:
+        for coords, rows in pieces:
+            if len(coords) > 0:
+                for row in self.itersequence(coords):
+                    yield row
+    finally:
+        pieces.close()
 
 
 def create_indexes_table(table):
@@ -747,10 +1011,16 @@ class Table(tableextension.Table, Leaf):
         """Cache of already compiled conditions."""
         self._exprvars_cache = {}
         """Cache of variables participating in numexpr expressions."""
+        self._has_query_cache = None
+        """Whether the table has a persistent query cache (None if unknown)."""
+        self._has_zonemaps = None
+        """Whether the table has zone maps (None if unknown)."""
         self._enabled_indexing_in_queries = True
         """Is indexing enabled in queries?  *Use only for testing.*"""
         self._empty_array_cache = {}
         """Cache of empty arrays."""
+        self._prefetchers = weakref.WeakSet()
+        """Read-ahead helpers of the active prefetching row iterators."""
 
         self._v_dtype = None
         """The NumPy datatype fopr this table."""
@@ -900,7 +1170,7 @@ class Table(tableextension.Table, Leaf):
         # since their respective index objects share
         # the same number of elements.
         if self.indexed:
-            self._indexedrows = indexobj.nelements
+            self._indexedrows = indexobj.nelements - indexobj.nremoved
             self._unsaved_indexedrows = self.nrows - self._indexedrows
             # Put the autoindex value in a cache variable
             self._autoindex = self.autoindex
@@ -1227,7 +1497,7 @@ very small/large chunksize, you may want to increase/decrease it."""
             # * ``table._where()`` (depth 1) is called by
             # * ``table.where()`` (depth 2) is called by
             # * user-space functions (depth 3)
-            user_frame = sys._getframe(depth)
+            user_frame = get_caller_frame(depth)
             user_locals = user_frame.f_locals
             user_globals = user_frame.f_globals
 
@@ -1338,7 +1608,8 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         # start with normal variables
         typemap = dict(list(zip(varnames, vartypes)))
-        indexedcols = []
+        indexedcols, eqonlycols = [], []
+        zonemapped, bloomed = self._zonemapped_colpathnames()
         for colname in colnames:
             col = condvars[colname]
 
@@ -1346,14 +1617,22 @@ very small/large chunksize, you may want to increase/decrease it."""
             coltype = col.dtype.type
             typemap[colname] = _nxtype_from_nptype[coltype]
 
-            # Get the set of columns with usable indexes.
-            if (self._enabled_indexing_in_queries  # no in-kernel searches
-                    and self.colindexed[col.pathname] and not col.index.dirty):
+            # Get the set of columns with usable indexes or zone maps.
+            # Columns with just Bloom filters only help equality tests.
+            if not self._enabled_indexing_in_queries:
+                continue  # no in-kernel searches
+            if ((self.colindexed[col.pathname] and not col.index.dirty)
+                    or col.pathname in zonemapped):
+                indexedcols.append(colname)
+            elif col.pathname in bloomed:
                 indexedcols.append(colname)
+                eqonlycols.append(colname)
 
         indexedcols = frozenset(indexedcols)
+        eqonlycols = frozenset(eqonlycols)
         # Now let ``compile_condition()`` do the Numexpr-related job.
-        compiled = compile_condition(condition, typemap, indexedcols)
+        compiled = compile_condition(condition, typemap, indexedcols,
+                                     eqonlycols)
 
         # Check that there actually are columns in the condition.
         if not set(compiled.parameters).intersection(set(colnames)):
@@ -1364,6 +1643,28 @@ very small/large chunksize, you may want to increase/decrease it."""
         condcache[condkey] = compiled
         return compiled.with_replaced_vars(condvars)
 
+    def _get_query_threads(self, compiled, start, stop):
+        """Get the number of threads for evaluating `compiled` in-kernel.
+
+        A value of 1 means that the query should be run serially: this
+        is the case for indexed queries, for ranges fitting in a single
+        I/O buffer, and when ``MAX_QUERY_THREADS`` is not larger than 1.
+
+        Since every worker may use all the Numexpr (or Blosc) threads, the
+        number of workers is also limited so that they do not use more
+        threads than the cores of the machine.
+
+        """
+
+        params = self._v_file.params
+        nthreads = params['MAX_QUERY_THREADS']
+        if (not nthreads or nthreads < 2 or compiled.index_expressions or
+                stop - start <= self.nrowsinbuf):
+            return 1
+        pooled = max(params['MAX_NUMEXPR_THREADS'] or 1,
+                     params['MAX_BLOSC_THREADS'] or 1)
+        return max(1, min(nthreads, detect_number_of_cores() // pooled))
+
     def will_query_use_indexing(self, condition, condvars=None):
         """Will a query for the condition use indexing?
 
@@ -1482,6 +1783,7 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         return self._where(condition, condvars, start, stop, step)
 
+    @synchronized
     def _where(self, condition, condvars, start=None, stop=None, step=None):
         """Low-level counterpart of `self.where()`."""
 
@@ -1513,6 +1815,13 @@ very small/large chunksize, you may want to increase/decrease it."""
                 return chunkmap
         else:
             chunkmap = None  # default to an in-kernel query
+            nthreads = self._get_query_threads(compiled, start, stop)
+            if nthreads > 1:
+                pieces = _table__iter_where_parallel(
+                    self, compiled, condvars, start, stop, step, nthreads)
+                self._use_index = False
+                self._where_condition = None
+                return _table__iter_where_parallel_rows(self, pieces)
 
         args = [condvars[param] for param in compiled.parameters]
         self._where_condition = (compiled.function, args)
@@ -1521,6 +1830,99 @@ very small/large chunksize, you may want to increase/decrease it."""
             show_stats("Exiting table._where", tref)
         return row._iter(start, stop, step, chunkmap=chunkmap)
 
+    def _where_parallel(self, condition, condvars, start, stop, step,
+                        getrows=False):
+        """Run an in-kernel query in parallel, if it is worth it.
+
+        Return the ``(coords, rows)`` tuple from a parallel evaluation of
+        `condition` (see ``_table__where_parallel()``), or None when the
+        query should go through the regular `self._where()` path.  This
+        must be called *directly* from an API callable (see
+        `self._required_expr_vars()`).
+
+        """
+
+        if (self._v_file.params['MAX_QUERY_THREADS'] or 1) < 2:
+            return None  # fast path for the default, serial setting
+        (start, stop, step) = self._process_range_read(start, stop, step)
+        if start >= stop:
+            return None
+        condvars = self._required_expr_vars(condition, condvars, depth=3)
+        compiled = self._compile_condition(condition, condvars)
+        nthreads = self._get_query_threads(compiled, start, stop)
+        if nthreads < 2:
+            return None
+        return _table__where_parallel(self, compiled, condvars,
+                                      start, stop, step, nthreads, getrows)
+
+    def _get_query_cache(self, create=False):
+        """Get the persistent query cache group of this table.
+
+        None is returned if the table has no query cache and `create` is
+        false.  Query caches are only created (and caches left behind by
+        modifications of the table that were not made through PyTables
+        are only discarded) when `create` is true, i.e. when query results
+        are to be saved (see ``QUERY_CACHE_WRITE``).  Otherwise, such
+        stale caches are just ignored.
+
+        """
+
+        qcname = _query_cache_name_of(self)
+        if self._has_query_cache is None:
+            self._has_query_cache = qcname in self._v_parent
+        writable = create and self._v_file._iswritable()
+        if self._has_query_cache:
+            qcgroup = self._v_parent._f_get_child(qcname)
+            if qcgroup.stamp == table_stamp(self):
+                return qcgroup
+            elif not writable:
+                return None
+            self._drop_query_cache()
+        if writable:
+            self._has_query_cache = True
+            return create_query_cache(self)
+        return None
+
+    def _drop_query_cache(self):
+        """Remove the persistent query cache of this table (if any)."""
+
+        qcname = _query_cache_name_of(self)
+        if self._has_query_cache is None:
+            self._has_query_cache = qcname in self._v_parent
+        if self._has_query_cache:
+            self._v_parent._f_get_child(qcname)._g_remove(recursive=True)
+            self._has_query_cache = False
+
+    def _query_cache_get(self, condition, condvars, start, stop, step):
+        """Look up a query in the persistent query cache.
+
+        Return a ``(key, coords)`` tuple, where `coords` is the array of
+        cached coordinates (None on a cache miss) and `key` is the key
+        for saving them with `self._query_cache_put()` (None if the
+        query can not be cached, or results are not to be saved, see
+        ``QUERY_CACHE_WRITE``).  `condvars` must be the mapping returned
+        by `self._required_expr_vars()`.
+
+        """
+
+        (start, stop, step) = self._process_range_read(start, stop, step)
+        key = query_key(condition, condvars, start, stop, step)
+        if key is None:
+            return None, None
+        qcgroup = self._get_query_cache()
+        coords = None if qcgroup is None else qcgroup.get(key)
+        if not self._v_file.params['QUERY_CACHE_WRITE']:
+            key = None
+        return key, coords
+
+    def _query_cache_put(self, key, coords):
+        """Save the `coords` of a query in the persistent query cache."""
+
+        qcgroup = self._get_query_cache(create=True)
+        if qcgroup is not None:
+            qcgroup.put(key, coords, self._v_file.params['QUERY_CACHE_SLOTS'])
+
+    @synchronized
     def read_where(self, condition, condvars=None, field=None,
                    start=None, stop=None, step=None):
         """Read table data fulfilling the given *condition*.
@@ -1535,9 +1937,26 @@ very small/large chunksize, you may want to increase/decrease it."""
         """
 
         self._g_check_open()
-        coords = [p.nrow for p in
-                  self._where(condition, condvars, start, stop, step)]
-        self._where_condition = None  # reset the conditions
+        key, coords = None, None
+        if self._v_file.params['QUERY_CACHE_SLOTS'] > 0:
+            condvars = self._required_expr_vars(condition, condvars, depth=2)
+            key, coords = self._query_cache_get(condition, condvars,
+                                                start, stop, step)
+        if coords is None:
+            parallel = self._where_parallel(condition, condvars, start, stop,
+                                            step, getrows=True)
+            if parallel is not None:
+                coords, rows = parallel
+                if key is not None:
+                    self._query_cache_put(key, coords)
+                if field:
+                    rows = get_nested_field(rows, field)
+                return internal_to_flavor(rows, self.flavor)
+            coords = [p.nrow for p in
+                      self._where(condition, condvars, start, stop, step)]
+            self._where_condition = None  # reset the conditions
+            if key is not None:
+                self._query_cache_put(key, coords)
         if len(coords) > 1:
             cstart, cstop = coords[0], coords[-1] + 1
             if cstop - cstart == len(coords):
@@ -1587,6 +2006,7 @@ very small/large chunksize, you may want to increase/decrease it."""
         dstTable.flush()
         return nrows
 
+    @synchronized
     def get_where_list(self, condition, condvars=None, sort=False,
                        start=None, stop=None, step=None):
         """Get the row coordinates fulfilling the given condition.
@@ -1602,15 +2022,29 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         self._g_check_open()
 
-        coords = [p.nrow for p in
-                  self._where(condition, condvars, start, stop, step)]
-        coords = numpy.array(coords, dtype=SizeType)
-        # Reset the conditions
-        self._where_condition = None
+        key, coords = None, None
+        if self._v_file.params['QUERY_CACHE_SLOTS'] > 0:
+            condvars = self._required_expr_vars(condition, condvars, depth=2)
+            key, coords = self._query_cache_get(condition, condvars,
+                                                start, stop, step)
+        if coords is None:
+            parallel = self._where_parallel(condition, condvars, start, stop,
+                                            step)
+            if parallel is not None:
+                coords = parallel[0]
+            else:
+                coords = [p.nrow for p in
+                          self._where(condition, condvars, start, stop, step)]
+                coords = numpy.array(coords, dtype=SizeType)
+            # Reset the conditions
+            self._where_condition = None
+            if key is not None:
+                self._query_cache_put(key, coords)
         if sort:
             coords = numpy.sort(coords)
         return internal_to_flavor(coords, self.flavor)
 
+    @synchronized
     def itersequence(self, sequence):
         """Iterate over a sequence of row coordinates."""
 
@@ -1644,6 +2078,7 @@ very small/large chunksize, you may want to increase/decrease it."""
                 "`sortby` can only be a `Column` or string object, "
                 "but you passed an object of type: %s" % type(sortby))
         if icol.is_indexed and icol.index.kind == "full":
+            # The delta of the index (if any) is merged when reading it.
             if checkCSI and not icol.index.is_csi:
                 # The index exists, but it is not a CSI one.
                 raise ValueError(
@@ -1656,6 +2091,7 @@ very small/large chunksize, you may want to increase/decrease it."""
                 "Field `%s` must have associated a 'full' index "
                 "in table `%s`." % (sortby, self))
 
+    @synchronized
     def itersorted(self, sortby, checkCSI=False,
                    start=None, stop=None, step=None):
         """Iterate table data following the order of the index of sortby
@@ -1686,6 +2122,7 @@ very small/large chunksize, you may want to increase/decrease it."""
         row = tableextension.Row(self)
         return row._iter(start, stop, step, coords=index)
 
+    @synchronized
     def read_sorted(self, sortby, checkCSI=False, field=None,
                     start=None, stop=None, step=None):
         """Read table data following the order of the index of sortby column.
@@ -1714,7 +2151,8 @@ very small/large chunksize, you may want to increase/decrease it."""
         coords = index[start:stop:step]
         return self.read_coordinates(coords, field)
 
-    def iterrows(self, start=None, stop=None, step=None):
+    @synchronized
+    def iterrows(self, start=None, stop=None, step=None, prefetch=False):
         """Iterate over the table using a Row instance.
 
         If a range is not supplied, *all the rows* in the table are iterated
@@ -1722,6 +2160,19 @@ very small/large chunksize, you may want to increase/decrease it."""
         that purpose. If you want to iterate over a given *range of rows* in
         the table, you may use the start, stop and step parameters.
 
+        If prefetch is true (and step is positive), the next block of rows
+        is read and decompressed by a background thread while the current
+        one is being processed.  This can speed up loops over compressed
+        tables considerably.  As the HDF5 library is not thread-safe, this
+        is only done for files opened with the ``THREAD_SAFE`` parameter
+        (see :data:`parameters.THREAD_SAFE`), where the background reads
+        are serialized with any other I/O done by the body of the loop or
+        by other threads; *prefetch* is ignored for other files.  The read
+        in flight is waited for when the iterator is exhausted or closed,
+        which happens as soon as a loop over it is left with ``break`` (or
+        an exception).  Remember to call the ``close()`` method of
+        iterators kept around before their end.
+
         .. warning::
 
             When in the middle of a table row iterator, you should not
@@ -1746,13 +2197,22 @@ very small/large chunksize, you may want to increase/decrease it."""
            table is iterated from *start* to the last line.
            In PyTables < 3.0 only one element was returned.
 
+        .. versionchanged:: 3.3
+           Added the *prefetch* parameter.
+
         """
         (start, stop, step) = self._process_range(start, stop, step,
                                                   warn_negstep=False)
         if (start > stop and 0 < step) or (start < stop and 0 > step):
             # Fall-back action is to return an empty iterator
             return iter([])
+        # The background reads can only be serialized with the other calls
+        # to HDF5 in thread-safe files
+        prefetch = prefetch and self._v_lock is not None
         row = tableextension.Row(self)
+        if prefetch:
+            return _table__iter_prefetching(
+                row._iter(start, stop, step, prefetch=True))
         return row._iter(start, stop, step)
 
     def __iter__(self):
@@ -1781,6 +2241,99 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         return self.iterrows()
 
+    def iter_batches(self, batch_rows=None, columns=None, condition=None,
+                     condvars=None, start=None, stop=None, step=None):
+        """Iterate over the table in batches of rows, column by column.
+
+        Each iteration yields a dictionary mapping column names to arrays
+        (of the current flavor) with the values of a batch of (at most)
+        batch_rows consecutive rows in the selected range.  The default
+        for batch_rows is the number of rows in the I/O buffer of the
+        table.  The columns argument is a sequence with the names of the
+        columns to be returned; by default all top-level columns are.
+        Columns under a nested column can be specified by using a slash
+        character (/) as a separator (e.g. 'position/x').
+
+        If a condition is given, only the rows fulfilling it are included
+        in the batches, which may then be shorter than batch_rows (empty
+        batches are never yielded).  The meaning of condition and
+        condvars is the same as in the :meth:`Table.where` method.  The
+        meaning of the start, stop and step parameters is the same as for
+        Python slices.
+
+        In order to avoid memory allocations, the data of every batch is
+        read into the same buffers, so the arrays of a batch are only
+        valid until the next one is fetched.  Copy them if you need to
+        keep them around.
+
+        Examples
+        --------
+
+        ::
+
+            total = 0
+            for batch in table.iter_batches(columns=['col2'],
+                                            condition='col1 > 0'):
+                total += batch['col2'].sum()
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        if batch_rows is None:
+            batch_rows = self.nrowsinbuf
+        if batch_rows < 1:
+            raise ValueError("``batch_rows`` must be a positive integer")
+        if columns is None:
+            columns = self.colnames
+        else:
+            for colname in columns:
+                self._check_column(colname)
+        (start, stop, step) = self._process_range(start, stop, step)
+
+        compiled = None
+        if condition is not None:
+            condvars = self._required_expr_vars(condition, condvars, depth=2)
+            compiled = self._compile_condition(condition, condvars)
+            condvars = [condvars[param] for param in compiled.parameters]
+        return self._iter_batches(batch_rows, columns, compiled, condvars,
+                                  start, stop, step)
+
+    def _iter_batches(self, batch_rows, columns, compiled, condargs,
+                      start, stop, step):
+        """Generator behind `self.iter_batches()`."""
+
+        buf = self._get_container(batch_rows)
+        # Contiguous buffers for the selected columns
+        colbufs = []
+        for colname in columns:
+            field = get_nested_field(buf, colname)
+            colbufs.append((colname, numpy.empty(field.shape, field.dtype)))
+        for bstart in range(start, stop, batch_rows * step):
+            bstop = min(bstart + batch_rows * step, stop)
+            nrows = len(range(bstart, bstop, step))
+            batch = buf[:nrows]
+            self._read(bstart, bstop, step, out=batch)
+            valid = None
+            if compiled is not None:
+                valid = call_on_recarr(compiled.function, condargs, batch)
+                nrows = int(valid.sum())
+                if nrows == 0:
+                    continue
+            result = {}
+            for colname, colbuf in colbufs:
+                field = get_nested_field(batch, colname)
+                column = colbuf[:nrows]
+                if valid is None:
+                    column[...] = field
+                else:
+                    # Place the valid rows at the beginning of the buffer
+                    numpy.compress(valid, field, axis=0, out=column)
+                result[colname] = internal_to_flavor(column, self.flavor)
+            yield result
+
+    @synchronized
     def _read(self, start, stop, step, field=None, out=None):
         """Read a range of rows and return an in-memory object."""
 
@@ -1926,6 +2479,78 @@ very small/large chunksize, you may want to increase/decrease it."""
         arr = self._read(start, stop, step, field, out)
         return internal_to_flavor(arr, self.flavor)
 
+    def _plan_chunk_runs(self, coords):
+        """Group the rows at `coords` by chunk, to access whole chunks.
+
+        None is returned when accessing the rows with a point selection
+        is expected to be cheaper, i.e. when the table is neither
+        compressed nor checksummed and the rows are sparse in their
+        chunks (see ``_scatter_chunk_density``).  Otherwise, a tuple is
+        returned with the indices sorting `coords` (in a stable way, so
+        that repeated coordinates keep their order), the sorted
+        coordinates and a list of ``(start, stop, lo, hi)`` runs of
+        consecutive touched chunks, which fit in the I/O buffer and hold
+        the sorted coordinates from `lo` to `hi`.
+
+        """
+
+        chunksize = self.chunkshape[0]
+        order = numpy.argsort(coords, kind='mergesort')
+        scoords = coords[order]
+        chunks = scoords // chunksize
+        bounds = numpy.flatnonzero(chunks[1:] != chunks[:-1]) + 1
+        touched = chunks[numpy.concatenate(([0], bounds))]
+
+        filters = self.filters
+        if not (filters.complevel or filters.fletcher32 or
+                len(coords) >= (len(touched) * chunksize *
+                                _scatter_chunk_density)):
+            return None
+
+        # Split the touched chunks in runs of consecutive ones
+        maxchunks = max(1, self.nrowsinbuf // chunksize)
+        firsts = numpy.flatnonzero(touched[1:] != touched[:-1] + 1) + 1
+        firsts = numpy.union1d(firsts,
+                               numpy.arange(0, len(touched), maxchunks))
+        lasts = numpy.append(firsts[1:], len(touched)) - 1
+        starts = touched[firsts] * chunksize
+        stops = numpy.minimum((touched[lasts] + 1) * chunksize, self.nrows)
+        his = numpy.searchsorted(scoords, stops)
+        los = numpy.concatenate(([0], his[:-1]))
+        runs = [tuple(int(v) for v in run)
+                for run in zip(starts, stops, los, his)]
+        return (order, scoords, runs)
+
+    def _read_grouped_elements(self, coords, recarr):
+        """Read the rows at `coords` into `recarr`, returning their number.
+
+        This works like `_read_elements()`, but the touched chunks are
+        read (and decompressed) only once when `_plan_chunk_runs()` finds
+        it worth it, and the selected rows are then put back in the order
+        of `coords`.  An `IndexError` is raised if any coordinate is out
+        of the bounds of the table.
+
+        """
+
+        ncoords = coords.size
+        if ncoords == 0:
+            return 0
+        flatcoords = numpy.asarray(coords, dtype=SizeType).ravel()
+        if flatcoords.min() < 0 or flatcoords.max() >= self.nrows:
+            raise IndexError("Index out of bounds")
+        plan = self._plan_chunk_runs(flatcoords)
+        if plan is None:
+            return self._read_elements(coords, recarr)
+
+        order, scoords, runs = plan
+        buf = self._get_container(max(stop - start
+                                      for start, stop, lo, hi in runs))
+        for start, stop, lo, hi in runs:
+            self._read_records(start, stop - start, buf)
+            recarr[order[lo:hi]] = buf[scoords[lo:hi] - start]
+        return ncoords
+
+    @synchronized
     def _read_coordinates(self, coords, field=None):
         """Private part of `read_coordinates()` with no flavor conversion."""
 
@@ -1949,7 +2574,7 @@ very small/large chunksize, you may want to increase/decrease it."""
                     coords.flags.aligned):
                 # Get a contiguous and aligned coordinate array
                 coords = numpy.array(coords, dtype=SizeType)
-            self._read_elements(coords, result)
+            self._read_grouped_elements(coords, result)
 
         # Do the final conversions, if needed
         if field:
@@ -1976,6 +2601,86 @@ very small/large chunksize, you may want to increase/decrease it."""
         result = self._read_coordinates(coords, field)
         return internal_to_flavor(result, self.flavor)
 
+    def aread(self, start=None, stop=None, step=None, field=None):
+        """Get an awaitable future for ``self.read(start, stop, step, field)``.
+
+        The read is run in the thread pool of the file (see
+        :mod:`tables.aio`), so that it does not block the asyncio event
+        loop awaiting the result.  Reads overlapping a running read of a
+        superset of their rows wait for it and get a copy of their part of
+        its result.
+
+        The file must have been opened with the ``THREAD_SAFE`` parameter
+        set (see :data:`parameters.THREAD_SAFE`), since its nodes are then
+        used from several threads; a ValueError is raised otherwise.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        return aio.get_reader(self._v_file).read(self, start, stop, step,
+                                                 field)
+
+    def aread_coordinates(self, coords, field=None):
+        """Get an awaitable future for :meth:`Table.read_coordinates`.
+
+        See :meth:`Table.aread`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        return aio.get_reader(self._v_file).read_coordinates(self, coords,
+                                                             field)
+
+    def aread_where(self, condition, condvars=None, field=None,
+                    start=None, stop=None, step=None):
+        """Get an awaitable future for the result of :meth:`Table.read_where`.
+
+        The variables in *condition* missing from *condvars* are looked up
+        in the frame of the caller when this method is called.  See
+        :meth:`Table.aread`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        condvars = self._required_expr_vars(condition, condvars, depth=2)
+        return aio.get_reader(self._v_file).read_where(
+            self, condition, condvars, field, start, stop, step)
+
+    def aiter_batches(self, batch_rows=None, columns=None, condition=None,
+                      condvars=None, start=None, stop=None, step=None):
+        """Iterate asynchronously over the table in batches of rows.
+
+        Use it with ``async for`` to get the same batches as
+        :meth:`Table.iter_batches` (with the same arguments), every one of
+        them being read in the thread pool of the file when the previous
+        one has been consumed.  The arrays of a batch are only valid until
+        the next one is fetched.  See :meth:`Table.aread`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        if condition is not None:
+            condvars = self._required_expr_vars(condition, condvars, depth=2)
+        batches = self.iter_batches(batch_rows, columns, condition, condvars,
+                                    start, stop, step)
+        return aio.get_reader(self._v_file).iterate(batches)
+
     def get_enum(self, colname):
         """Get the enumerated type associated with the named column.
 
@@ -2155,10 +2860,19 @@ very small/large chunksize, you may want to increase/decrease it."""
         self._open_append(wbufRA)
         self._append_records(lenrows)
         self._close_append()
+        self._drop_query_cache()
+        self._update_zonemaps(self.nrows - lenrows)
         if self.indexed:
             self._unsaved_indexedrows += lenrows
             # The table caches for indexed queries are dirty now
             self._dirtycache = True
+            # Rows can not be added to indexes with removed rows in their
+            # delta (coordinates would not match), so rebuild them later
+            removedcols = [colname for colname in self.colpathnames
+                           if self.colindexed[colname] and
+                           self.cols._g_col(colname).index.nremoved > 0]
+            if removedcols:
+                self._mark_columns_as_dirty(removedcols)
             if self.autoindex:
                 # Flush the unindexed rows
                 self.flush_rows_to_index(_lastrow=False)
@@ -2251,6 +2965,47 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         return recarr
 
+    def _update_coordinates(self, coords, values, colname=None):
+        """Write `values` to the rows at `coords`.
+
+        `values` are records with the structure of the table or, if
+        `colname` is given, values for that column only.  In case of
+        repeated coordinates, the last value is kept.
+
+        The touched chunks are read, modified in memory and written back
+        only once when `_plan_chunk_runs()` finds it worth it.  Otherwise,
+        the rows are written with a single point selection.
+
+        """
+
+        ncoords = len(coords)
+        if ncoords == 0:
+            return
+        coords = numpy.asarray(coords, dtype=SizeType).ravel()
+        plan = self._plan_chunk_runs(coords)
+        if plan is None:
+            if not (coords.flags.contiguous and coords.flags.aligned):
+                coords = coords.copy()
+            if colname is None:
+                self._update_elements(ncoords, coords, values)
+            else:
+                rows = self._read_coordinates(coords)
+                get_nested_field(rows, colname)[:] = values[:ncoords]
+                self._update_elements(ncoords, coords, rows)
+            return
+
+        order, scoords, runs = plan
+        svalues = values[:ncoords][order]
+        for start, stop, lo, hi in runs:
+            rows = self._get_container(stop - start)
+            self._read_records(start, stop - start, rows)
+            if colname is None:
+                target = rows
+            else:
+                target = get_nested_field(rows, colname)
+            target[scoords[lo:hi] - start] = svalues[lo:hi]
+            self._update_records(start, stop, 1, rows)
+
     def modify_coordinates(self, coords, rows):
         """Modify a series of rows in positions specified in coords.
 
@@ -2278,10 +3033,11 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         if len(coords) > 0:
             # Do the actual update of rows
-            self._update_elements(lcoords, coords, recarr)
+            self._update_coordinates(coords, recarr)
+            self._update_zonemaps(coords.min(), coords.max() + 1)
 
         # Redo the index if needed
-        self._reindex(self.colpathnames)
+        self._reindex(self.colpathnames, coords)
 
         return SizeType(lcoords)
 
@@ -2334,9 +3090,10 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         # Do the actual update
         self._update_records(start, stop, step, recarr)
+        self._update_zonemaps(start, stop)
 
         # Redo the index if needed
-        self._reindex(self.colpathnames)
+        self._reindex(self.colpathnames, slice(start, stop, step))
 
         return SizeType(lenrows)
 
@@ -2416,8 +3173,9 @@ very small/large chunksize, you may want to increase/decrease it."""
         mod_col[:] = column
         # save this modified rows in table
         self._update_records(start, stop, step, mod_recarr)
+        self._update_zonemaps(start, stop)
         # Redo the index if needed
-        self._reindex([colname])
+        self._reindex([colname], slice(start, stop, step))
 
         return SizeType(nrows)
 
@@ -2492,8 +3250,9 @@ very small/large chunksize, you may want to increase/decrease it."""
             mod_col[:] = recarray[name].squeeze()
         # save this modified rows in table
         self._update_records(start, stop, step, mod_recarr)
+        self._update_zonemaps(start, stop)
         # Redo the index if needed
-        self._reindex(names)
+        self._reindex(names, slice(start, stop, step))
 
         return SizeType(nrows)
 
@@ -2536,6 +3295,13 @@ very small/large chunksize, you may want to increase/decrease it."""
         startLR = index.sorted.nrows * slicesize
         indexedrows = startLR - start
         stop = start + nrows - slicesize + 1
+        nslices = (max(stop - startLR, 0) + slicesize - 1) // slicesize
+        nthreads = min(self._v_file.params['MAX_INDEX_THREADS'], nslices)
+        if nthreads > 1:
+            _table__index_slices_parallel(
+                self, index, colname, startLR, nslices, nthreads, update)
+            indexedrows += nslices * slicesize
+            startLR += nslices * slicesize
         while startLR < stop:
             index.append(
                 [self._read(startLR, startLR + slicesize, 1, colname)],
@@ -2550,16 +3316,40 @@ very small/large chunksize, you may want to increase/decrease it."""
             indexedrows += self.nrows - startLR
         return indexedrows
 
-    def remove_rows(self, start=None, stop=None, step=None):
+    def write_chunk(self, coords, data, filter_mask=0):
+        """Write the raw data of a chunk, bypassing the filter pipeline.
+
+        This method has the behavior described in :meth:`Leaf.write_chunk`.
+        Besides that, the indexes and zone maps of the table are updated
+        for the rows in the chunk.
+
+        """
+
+        super(Table, self).write_chunk(coords, data, filter_mask)
+        start = int(self._get_chunk_offset(coords)[0])
+        stop = min(start + self.chunkshape[0], self.nrows)
+        self._update_zonemaps(start, stop)
+        # Redo the index if needed
+        self._reindex(self.colpathnames, slice(start, stop, 1))
+
+    def remove_rows(self, start=None, stop=None, step=None, coords=None):
         """Remove a range of rows in the table.
 
         If only start is supplied, that row and all following will be deleted.
         If a range is supplied, i.e. both the start and stop parameters are
         passed, all the rows in the range are removed.
 
+        Rows can also be selected with coords instead, and then all the rows
+        after the first removed one (or, with a step, after the first one in
+        the range) are moved in a single pass over the table, which is then
+        truncated only once.
+
         .. versionchanged:: 3.0
            The start, stop and step parameters now behave like in slice.
 
+        .. versionchanged:: 3.3
+           Added the *coords* parameter.
+
         .. seealso:: remove_row()
 
         Parameters
@@ -2577,6 +3367,15 @@ very small/large chunksize, you may want to increase/decrease it."""
 
             .. versionadded:: 3.0
 
+        coords : array_like
+            A sequence of the coordinates of the rows to remove (in any
+            order, negative values are allowed and duplicates are ignored),
+            or a boolean array with one entry per row of the table which is
+            true for the rows to remove.  It can not be combined with start,
+            stop and step.
+
+            .. versionadded:: 3.3
+
         Examples
         --------
 
@@ -2592,6 +3391,14 @@ very small/large chunksize, you may want to increase/decrease it."""
 
             t.remove_rows(6, 7)
 
+        Removing every 10th row::
+
+            t.remove_rows(step=10)
+
+        Removing the rows flagged in the 'purge' column::
+
+            t.remove_rows(coords=t.col('purge'))
+
         .. note::
 
             removing a single row can be done using the specific
@@ -2599,10 +3406,41 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         """
 
+        if coords is not None:
+            if start is not None or stop is not None or step is not None:
+                raise ValueError("coords can not be combined with start, "
+                                 "stop and step")
+            return self._remove_coordinates(coords)
+
         (start, stop, step) = self._process_range(start, stop, step)
         nrows = self._remove_rows(start, stop, step)
+        self._update_zonemaps(start)
         # remove_rows is a invalidating index operation
-        self._reindex(self.colpathnames)
+        self._reindex(self.colpathnames, slice(start, stop, step),
+                      removed=True)
+
+        return SizeType(nrows)
+
+    def _remove_coordinates(self, coords):
+        """Remove the rows selected by `coords` (see `remove_rows()`)."""
+
+        self._g_check_open()
+        coords = numpy.unique(self._point_selection(coords))
+        if len(coords) == 0:
+            return SizeType(0)
+
+        def removed(bstart, bstop, rows):
+            first, last = coords.searchsorted([bstart, bstop])
+            if first == last:
+                return None
+            mask = numpy.zeros(bstop - bstart, dtype=numpy.bool_)
+            mask[coords[first:last] - bstart] = True
+            return mask
+
+        nrows = self._compact_records(int(coords[0]), removed)
+        self._update_zonemaps(int(coords[0]))
+        # Removing rows is an invalidating index operation
+        self._reindex(self.colpathnames, coords, removed=True)
 
         return SizeType(nrows)
 
@@ -2637,6 +3475,83 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         self.remove_rows(start=n, stop=n + 1)
 
+    def remove_where(self, condition, condvars=None,
+                     start=None, stop=None, step=None):
+        """Remove the rows fulfilling the given condition.
+
+        The meaning of the arguments is the same as in the
+        :meth:`Table.where` method.  The condition is evaluated in-kernel
+        while the rows following the first removed one are moved, in a
+        single pass over the table; if it can use indexes, they are used to
+        skip the chunks holding no row to remove.  The table is only
+        truncated once, and the changes are kept in the delta of indexes
+        when possible (see :data:`parameters.INDEX_DELTA_MAX_ROWS`).
+
+        The number of removed rows is returned.
+
+        Examples
+        --------
+
+        ::
+
+            nremoved = table.remove_where('(status == 0) & (age > limit)')
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        self._v_file._check_writable()
+        condvars = self._required_expr_vars(condition, condvars, depth=2)
+        compiled = self._compile_condition(condition, condvars)
+        (start, stop, step) = self._process_range(start, stop, step)
+        first = start  # the first row which may be removed
+        chunkmap = None
+        if compiled.index_expressions:
+            # Rows appended after the last update of the indexes would be
+            # missed otherwise
+            self.flush_rows_to_index()
+            if self._dirtycache:
+                restorecache(self)
+            chunkmap = _table__indexed_chunkmap(self, compiled, condvars)
+            if chunkmap is None:
+                return SizeType(0)
+            chunksize = self.chunkshape[0]
+            first = max(start, int(chunkmap.argmax()) * chunksize)
+
+        condargs = [condvars[param] for param in compiled.parameters]
+        # The removed coordinates are only needed for the index deltas
+        removed_coords = [] if self.indexed else None
+
+        def removed(bstart, bstop, rows):
+            if bstart >= stop:
+                return None
+            if chunkmap is not None:
+                lo, hi = bstart // chunksize, (bstop - 1) // chunksize + 1
+                if hi <= len(chunkmap) and not chunkmap[lo:hi].any():
+                    return None  # the indexes tell that no row is removed
+            nrows = min(bstop, stop) - bstart
+            mask = numpy.zeros(bstop - bstart, dtype=numpy.bool_)
+            mask[:nrows] = call_on_recarr(compiled.function, condargs,
+                                          rows[:nrows])
+            if step > 1:
+                mask[:nrows][(numpy.arange(bstart, bstart + nrows) - start)
+                             % step != 0] = False
+            if removed_coords is not None:
+                removed_coords.append(bstart + numpy.flatnonzero(mask))
+            return mask
+
+        nrows = self._compact_records(first, removed)
+        if nrows == 0:
+            return SizeType(0)
+        self._update_zonemaps(first)
+        # Removing rows is an invalidating index operation
+        if removed_coords is not None:
+            removed_coords = numpy.concatenate(removed_coords)
+        self._reindex(self.colpathnames, removed_coords, removed=True)
+
+        return SizeType(nrows)
+
     def _g_update_dependent(self):
         super(Table, self)._g_update_dependent()
 
@@ -2655,6 +3570,8 @@ very small/large chunksize, you may want to increase/decrease it."""
         """
 
         itgpathname = _index_pathname_of(self)
+        qcgpathname = _query_cache_pathname_of(self)
+        zmgpathname = _zonemap_pathname_of(self)
 
         # First, move the table to the new location.
         super(Table, self)._g_move(newparent, newname)
@@ -2669,6 +3586,22 @@ very small/large chunksize, you may want to increase/decrease it."""
             newiname = _index_name_of(self)
             itgroup._g_move(newigroup, newiname)
 
+        # Move the associated query cache group (if any) too.
+        try:
+            qcgroup = self._v_file._get_node(qcgpathname)
+        except NoSuchNodeError:
+            pass
+        else:
+            qcgroup._g_move(self._v_parent, _query_cache_name_of(self))
+
+        # And the associated zone maps group (if any).
+        try:
+            zmgroup = self._v_file._get_node(zmgpathname)
+        except NoSuchNodeError:
+            pass
+        else:
+            zmgroup._g_move(self._v_parent, _zonemap_name_of(self))
+
     def _g_remove(self, recursive=False, force=False):
         # Remove the associated index group (if any).
         itgpathname = _index_pathname_of(self)
@@ -2679,6 +3612,12 @@ very small/large chunksize, you may want to increase/decrease it."""
         else:
             itgroup._f_remove(recursive=True)
             self.indexed = False   # there are indexes no more
+        # Remove the associated query cache and zone maps (if any).
+        self._drop_query_cache()
+        zmgroup = self._get_zonemaps()
+        if zmgroup is not None:
+            zmgroup._g_remove(recursive=True)
+            self._has_zonemaps = False
 
         # Remove the leaf itself from the hierarchy.
         super(Table, self)._g_remove(recursive, force)
@@ -2696,11 +3635,177 @@ very small/large chunksize, you may want to increase/decrease it."""
         colindexed[colpathname] = isindexed
         self.indexed = max(colindexed.values())  # this is an OR :)
 
-    def _mark_columns_as_dirty(self, colnames):
-        """Mark column indexes in `colnames` as dirty."""
+    def _get_zonemaps(self):
+        """Get the group keeping the zone maps of this table.
+
+        None is returned if the table has no zone maps.
+
+        """
+
+        zmname = _zonemap_name_of(self)
+        if self._has_zonemaps is None:
+            self._has_zonemaps = zmname in self._v_parent
+        if self._has_zonemaps:
+            return self._v_parent._f_get_child(zmname)
+        return None
+
+    def _zonemapped_colpathnames(self):
+        """Get the sets of path names of columns with zone maps and of
+        columns with Bloom filters."""
+
+        zmgroup = self._get_zonemaps()
+        if zmgroup is None:
+            return frozenset(), frozenset()
+        return (frozenset(zmgroup.colpathnames),
+                frozenset(zmgroup.bloomcolpathnames))
+
+    def _create_zonemap(self, colpathname, bloom=False):
+        """Create the zone map of the `colpathname` column.
+
+        If `bloom` is true, Bloom filters are created instead.
+
+        """
+
+        zmgroup = self._get_zonemaps()
+        if zmgroup is None:
+            zmgroup = create_zonemap_group(self)
+            self._has_zonemaps = True
+        elif colpathname in (zmgroup.bloomcolpathnames if bloom
+                             else zmgroup.colpathnames):
+            return  # already there
+        chunksize = self.chunkshape[0]
+        nchunks = int(math.ceil(float(self.nrows) / chunksize))
+        if bloom:
+            nbytes = int(math.ceil(chunksize * bloom_bits_per_row / 8.))
+            zmgroup.add_bloom(colpathname, nbytes, nchunks)
+        else:
+            zmgroup.add_column(colpathname, self.coldtypes[colpathname],
+                               nchunks)
+        self._update_zonemaps(0, colpathnames=[colpathname])
+        # Changing the set of zone maps invalidates the condition cache
+        self._condition_cache.clear()
+
+    def _remove_zonemap(self, colpathname, bloom=False):
+        """Remove the zone map of the `colpathname` column.
+
+        If `bloom` is true, its Bloom filters are removed instead.
+
+        """
+
+        zmgroup = self._get_zonemaps()
+        if zmgroup is None:
+            return
+        if bloom and colpathname in zmgroup.bloomcolpathnames:
+            zmgroup.remove_bloom(colpathname)
+        elif not bloom and colpathname in zmgroup.colpathnames:
+            zmgroup.remove_column(colpathname)
+        else:
+            return
+        if not zmgroup._v_children:
+            zmgroup._g_remove(recursive=True)
+            self._has_zonemaps = False
+        # Changing the set of zone maps invalidates the condition cache
+        self._condition_cache.clear()
+
+    def _update_zonemaps(self, start, stop=None, colpathnames=None):
+        """Recompute the zone maps of chunks with rows in [start, stop).
+
+        When `stop` is None, the zones of all the chunks from `start` to
+        the end of the table are recomputed, and longer zone maps are
+        truncated.  By default, all the zone maps (and Bloom filters)
+        are recomputed, but a sequence of `colpathnames` can be
+        specified instead.
+
+        """
+
+        zmgroup = self._get_zonemaps()
+        if zmgroup is None:
+            return
+        zonecols, bloomcols = zmgroup.colpathnames, zmgroup.bloomcolpathnames
+        if colpathnames is not None:
+            zonecols = [name for name in zonecols if name in colpathnames]
+            bloomcols = [name for name in bloomcols if name in colpathnames]
+        nrows, chunksize = self.nrows, self.chunkshape[0]
+        nchunks = int(math.ceil(float(nrows) / chunksize))
+        firstchunk = start // chunksize
+        if firstchunk > zmgroup.nzones:
+            # Zones are missing before `start`: recompute them too
+            firstchunk, stop = zmgroup.nzones, None
+        if stop is None or stop > nrows:
+            stop = nrows
+        else:
+            lastchunk = int(math.ceil(float(stop) / chunksize))
+            stop = min(nrows, lastchunk * chunksize)
+        zmgroup.truncate(nchunks)
+        nbytes = int(math.ceil(chunksize * bloom_bits_per_row / 8.))
+        # Read whole chunks, as many as fit in the I/O buffer each time
+        for bstart in range(firstchunk * chunksize, stop, self.nrowsinbuf):
+            rows = self._read(bstart, min(bstart + self.nrowsinbuf, stop), 1)
+            bchunk = bstart // chunksize
+            for colpathname in zonecols:
+                zones = compute_zones(get_nested_field(rows, colpathname),
+                                      chunksize)
+                zmgroup.set_zones(colpathname, bchunk, zones)
+            for colpathname in bloomcols:
+                blooms = compute_blooms(get_nested_field(rows, colpathname),
+                                        chunksize, nbytes)
+                zmgroup.set_blooms(colpathname, bchunk, blooms)
+
+    def _add_index_deltas(self, colnames, coords, removed=False):
+        """Keep the changes in rows at `coords` in the delta of indexes.
+
+        `coords` can be a sequence of coordinates or a slice, and they
+        are the rows which have been modified or, if `removed` is true,
+        removed (in that case, `coords` refer to the rows before their
+        removal).  The indexes of columns in `colnames` whose delta would
+        grow too large (see ``INDEX_DELTA_MAX_ROWS``) are left alone, and
+        a list with the names of these columns is returned.
+
+        """
+
+        maxrows = self._v_file.params['INDEX_DELTA_MAX_ROWS']
+        if not maxrows or coords is None or self._unsaved_indexedrows > 0:
+            return colnames
+        if isinstance(coords, slice):
+            ncoords = len(range(coords.start, coords.stop, coords.step))
+        else:
+            ncoords = len(coords)
+        leftcols, recorded = [], False
+        for colname in colnames:
+            if not self.colindexed[colname]:
+                continue
+            index = self.cols._g_col(colname).index
+            if index.dirty or index.ndelta + ncoords > maxrows:
+                leftcols.append(colname)
+                continue
+            if isinstance(coords, slice):
+                coords = numpy.arange(coords.start, coords.stop, coords.step,
+                                      dtype=numpy.int64)
+            if removed:
+                index.add_removed(coords)
+            else:
+                index.add_delta(self._read_coordinates(coords, colname),
+                                coords)
+            recorded = True
+        if recorded:
+            if removed:
+                self._indexedrows -= ncoords
+            # The table caches for indexed queries are dirty now
+            self._dirtycache = True
+        return leftcols
+
+    def _mark_columns_as_dirty(self, colnames, coords=None):
+        """Mark column indexes in `colnames` as dirty.
+
+        If the `coords` of the modified rows are given, their changes are
+        kept in the delta of the indexes instead, when possible.
+
+        """
 
         assert len(colnames) > 0
+        self._drop_query_cache()
         if self.indexed:
+            colnames = self._add_index_deltas(colnames, coords)
             colindexed, cols = self.colindexed, self.cols
             # Mark the proper indexes as dirty
             for colname in colnames:
@@ -2708,10 +3813,19 @@ very small/large chunksize, you may want to increase/decrease it."""
                     col = cols._g_col(colname)
                     col.index.dirty = True
 
-    def _reindex(self, colnames):
-        """Re-index columns in `colnames` if automatic indexing is true."""
+    def _reindex(self, colnames, coords=None, removed=False):
+        """Re-index columns in `colnames` if automatic indexing is true.
+
+        If the `coords` of the modified (or `removed`) rows are given,
+        their changes are kept in the delta of the indexes instead, when
+        possible (see `_add_index_deltas()`).
+
+        """
 
+        # Modified rows invalidate the results of cached queries
+        self._drop_query_cache()
         if self.indexed:
+            colnames = self._add_index_deltas(colnames, coords, removed)
             colindexed, cols = self.colindexed, self.cols
             colstoindex = []
             # Mark the proper indexes as dirty
@@ -2760,14 +3874,21 @@ very small/large chunksize, you may want to increase/decrease it."""
         update the indexes after a invalidating index operation
         (:meth:`Table.remove_rows`, for example).
 
+        Indexes keeping changes in their delta (see the
+        ``INDEX_DELTA_MAX_ROWS`` parameter) are recomputed as well.
+
         """
 
-        self._do_reindex(dirty=True)
+        for (colname, colindexed) in six.iteritems(self.colindexed):
+            if colindexed:
+                self.cols._g_col(colname).reindex_dirty()
 
     def _g_copy_rows(self, object, start, stop, step, sortby, checkCSI):
         "Copy rows from self to object"
         if sortby is None:
-            self._g_copy_rows_optim(object, start, stop, step)
+            # Copy the chunks as they are if possible
+            if not self._g_copy_chunks(object, start, stop, step):
+                self._g_copy_rows_optim(object, start, stop, step)
             return
         lenbuf = self.nrowsinbuf
         absstep = step
@@ -2899,7 +4020,7 @@ very small/large chunksize, you may want to increase/decrease it."""
                  % (self._indexedrows, self.nrows))
             if self._dirtyindexes:
                 # Finally, re-index any dirty column
-                self.reindex_dirty()
+                self._do_reindex(dirty=True)
 
         super(Table, self).flush()
 
@@ -2952,6 +4073,10 @@ very small/large chunksize, you may want to increase/decrease it."""
         #   to first close ``Table`` objects and then ``Index`` hierarchies.
         #
 
+        # Stop any background reads of prefetching row iterators.
+        for prefetcher in list(self._prefetchers):
+            prefetcher.close()
+
         # Flush right now so the row object does not get in the middle.
         if flush:
             self.flush()
@@ -3351,6 +4476,16 @@ class Column(object):
         else:
             return True
 
+    @property
+    def has_zonemap(self):
+        """True if the column has a zone map, false otherwise.
+
+        .. versionadded:: 3.3
+
+        """
+        zmgroup = self.table._get_zonemaps()
+        return zmgroup is not None and self.pathname in zmgroup.colpathnames
+
     @property
     def maindim(self):
         """"The dimension along which iterators work. Its value is 0 (i.e. the
@@ -3477,6 +4612,12 @@ class Column(object):
         value.  If key is a slice, the range of elements determined by it is
         set to value.
 
+        In addition, NumPy-style point selections are supported.  If key
+        is a list or array of row coordinates, the elements at them are set
+        to value.  If key is an array of boolean values (with as many items
+        as rows in the table), the elements where key is True are set to
+        value.
+
         Examples
         --------
 
@@ -3488,6 +4629,9 @@ class Column(object):
             # Modify rows 1 and 3
             table.cols.col1[1::2] = [2,3]
 
+            # Modify rows 7 and 2
+            table.cols.col1[[7,2]] = [4,5]
+
         Which is equivalent to::
 
             # Modify row 1
@@ -3525,8 +4669,27 @@ class Column(object):
                 key.start, key.stop, key.step)
             return table.modify_column(start, stop, step,
                                        value, self.pathname)
-        else:
+
+        # Try with a boolean or point selection
+        try:
+            coords = table._point_selection(key)
+        except TypeError:
             raise ValueError("Non-valid index or slice: %s" % key)
+        column = numpy.empty(len(coords), dtype=self._itemtype)
+        try:
+            column[...] = value
+        except Exception as exc:
+            raise ValueError("value parameter cannot be converted into a "
+                             "ndarray object compliant with column '%s'. "
+                             "The error was: <%s>" % (self.pathname, exc))
+        if len(coords) > 0:
+            table._update_coordinates(coords, column, self.pathname)
+            table._update_zonemaps(coords.min(), coords.max() + 1,
+                                   [self.pathname])
+        # Redo the index if needed
+        table._reindex([self.pathname], coords)
+
+        return SizeType(len(coords))
 
     def create_index(self, optlevel=6, kind="medium", filters=None,
                      tmp_dir=None, _blocksizes=None, _testmode=False,
@@ -3556,6 +4719,19 @@ class Column(object):
             the query speed) at the price of using more disk space as well as
             more CPU, memory and I/O resources for creating the index.
 
+            The 'bloom' kind builds a Bloom filter per chunk of the table
+            instead of a sorted index.  Bloom filters are small and cheap to
+            build, and they let equality queries (like ``col == value`` or
+            ``(col == v1) | (col == v2)``) skip the chunks which surely do
+            not contain the looked up values, which makes them well suited
+            for high-cardinality columns (like identifiers) that are not
+            sorted.  They are kept up to date when the table is modified,
+            and they do not help range queries nor sorting.  Bloom filters
+            are not reported by :attr:`Column.index` and the optlevel,
+            filters and tmp_dir arguments are ignored for them.  They can
+            not be created for 64-bit unsigned integer columns, which are
+            not supported in conditions.
+
             Note that selecting a full kind with an optlevel of 9 (the maximum)
             guarantees the creation of an index with zero entropy, that is, a
             completely sorted index (CSI) - provided that the number of rows in
@@ -3573,11 +4749,22 @@ class Column(object):
             to create it in the same directory as the file containing the
             original table.
 
+        .. versionchanged:: 3.3
+           The 'bloom' kind was added.
+
         """
 
-        kinds = ['ultralight', 'light', 'medium', 'full']
+        kinds = ['ultralight', 'light', 'medium', 'full', 'bloom']
         if kind not in kinds:
             raise ValueError("Kind must have any of these values: %s" % kinds)
+        if kind == 'bloom':
+            self._table_file._check_writable()
+            table = self.table
+            if not table._chunked:
+                raise TypeError("Bloom filters need a chunked table")
+            check_bloom_dtype(self.descr._v_dtypes[self.name])
+            table._create_zonemap(self.pathname, bloom=True)
+            return SizeType(table.nrows)
         if (not isinstance(optlevel, six.integer_types) or
                 (optlevel < 0 or optlevel > 9)):
             raise ValueError("Optimization level must be an integer in the "
@@ -3665,23 +4852,28 @@ class Column(object):
         This can be useful when you have set :attr:`Table.autoindex` to false
         for the table and you want to update the column's index after an
         invalidating index operation (like :meth:`Table.remove_rows`).
+        An index keeping changes in its delta (see the
+        ``INDEX_DELTA_MAX_ROWS`` parameter) is recomputed as well.
 
         This method does nothing if the column is not indexed.
 
         """
 
-        self._do_reindex(dirty=True)
+        index = self.index
+        self._do_reindex(dirty=index is None or not index.has_delta)
 
     def remove_index(self):
         """Remove the index associated with this column.
 
         This method does nothing if the column is not indexed. The removed
         index can be created again by calling the :meth:`Column.create_index`
-        method.
+        method.  Bloom filters (see :meth:`Column.create_index`) are removed
+        as well.
 
         """
 
         self._table_file._check_writable()
+        self.table._remove_zonemap(self.pathname, bloom=True)
 
         # Remove the index if existing.
         if self.is_indexed:
@@ -3689,6 +4881,44 @@ class Column(object):
             index._f_remove()
             self.table._set_column_indexing(self.pathname, False)
 
+    def create_zonemap(self):
+        """Create a zone map for this column.
+
+        A zone map keeps the minimum and maximum values of the column
+        (and its number of NaNs, for floating point columns) for every
+        chunk of the table.  Queries on the column use it for skipping
+        the chunks which can not fulfill the condition, much like with
+        indexes, which makes zone maps effective for columns whose
+        values are clustered along the table (e.g. timestamps in a log).
+        Zone maps are much cheaper to build and to store than indexes,
+        and they are kept up to date when the table is modified.
+
+        Only numerical, boolean and string columns can have zone maps.
+        This method does nothing if the column already has a zone map.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._table_file._check_writable()
+        table = self.table
+        if not table._chunked:
+            raise TypeError("zone maps need a chunked table")
+        check_zonemap_dtype(self.descr._v_dtypes[self.name])
+        table._create_zonemap(self.pathname)
+
+    def remove_zonemap(self):
+        """Remove the zone map of this column.
+
+        This method does nothing if the column has no zone map.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._table_file._check_writable()
+        self.table._remove_zonemap(self.pathname)
+
     def close(self):
         """Close this column."""
 
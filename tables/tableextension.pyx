@@ -24,9 +24,14 @@ Misc variables:
 """
 
 import sys
+import threading
+import weakref
 import numpy
 from time import time
 
+import six
+from six.moves import queue
+
 from .description import Col
 from .exceptions import HDF5ExtError
 from .conditions import call_on_recarr
@@ -62,7 +67,7 @@ from definitions cimport (hid_t, herr_t, hsize_t, htri_t,
   conv_float64_timeval32, truncate_dset,
   pt_H5free_memory)
 
-from lrucacheextension cimport ObjectCache, NumCache
+from lrucacheextension cimport ObjectCache, NumCache, SharedCache
 
 
 
@@ -142,6 +147,110 @@ cdef join_path(object parent, object name):
     return parent + '/' + name
 
 
+def _serve_read_requests(requests, results, cond):
+  """Thread target for serving the reads issued by a `_RowPrefetcher`."""
+
+  while True:
+    request = requests.get()
+    if request is None:
+      return
+    table, start, nrecords, recarr = request
+    request = None  # do not keep the table alive while waiting
+    with cond:
+      try:
+        results.append(table._read_records(start, nrecords, recarr))
+      except Exception:
+        results.append(sys.exc_info())
+      cond.notify()
+    table = recarr = None
+
+
+class _RowPrefetcher(object):
+  """Read-ahead of I/O buffers for sequential `Row` iterators.
+
+  The next block of rows is read (and decompressed) into a private buffer
+  by a background thread while the current one is being consumed.  Only
+  tables in files opened with the ``THREAD_SAFE`` parameter can be
+  prefetched: the background reads are done with the HDF5 lock of the
+  file held, so they are serialized with any other call to HDF5 (which
+  may happen in the body of the loop or in other threads).  At most one
+  read is in flight at any time, and it is waited for (with the lock
+  released) before the next block is handed over, and when the
+  prefetcher is closed (which happens as well when the iterator is
+  exhausted, abandoned or garbage collected).
+
+  """
+
+  def __init__(self, table, nrowsinbuf):
+    self.table = table
+    self.buffer = table._get_container(nrowsinbuf)
+    self.start = -1         # the start of the block in `self.buffer`
+    self.result = None      # records read for that block (or exc_info)
+    self.inflight = False
+    self.closed = False
+    self.requests = queue.Queue()
+    self.results = []
+    self.cond = threading.Condition(table._v_file._v_lock)
+    thread = threading.Thread(target=_serve_read_requests,
+                              args=(self.requests, self.results, self.cond))
+    thread.daemon = True
+    thread.start()
+    table._prefetchers.add(self)
+
+  def __del__(self):
+    self.close()
+
+  def wait(self):
+    """Wait for the read in flight (if any) to complete."""
+
+    if self.inflight:
+      with self.cond:
+        # The lock is released while waiting, even if the caller holds it
+        while not self.results:
+          self.cond.wait()
+        self.result = self.results.pop()
+      self.inflight = False
+
+  def read(self, start, nrecords, recarr, nextstart):
+    """Read `nrecords` rows at `start`.
+
+    The block starting at `nextstart` is then prefetched, unless
+    `nextstart` is negative.  A tuple is returned with the number of rows
+    read and the buffer holding them.  This is `recarr` unless the block
+    was already prefetched: then the private buffer is handed over
+    instead of copying it, and `recarr` becomes the new private buffer.
+
+    """
+
+    with self.cond:
+      self.wait()
+      if self.start == start:
+        result = self.result
+        if isinstance(result, tuple):
+          six.reraise(*result)
+        recarr, self.buffer = self.buffer, recarr
+      else:
+        result = self.table._read_records(start, nrecords, recarr)
+      self.start = nextstart
+      self.result = None
+      if 0 <= nextstart < self.table.nrows:
+        self.requests.put((self.table, nextstart, nrecords, self.buffer))
+        self.inflight = True
+    return (result, recarr)
+
+  def close(self):
+    """Wait for the read in flight and stop the background thread."""
+
+    if self.closed:
+      return
+    self.closed = True
+    self.wait()
+    self.start = -1
+    self.result = None
+    self.requests.put(None)
+    self.table._prefetchers.discard(self)
+
+
 # Public classes
 
 cdef class Table(Leaf):
@@ -587,6 +696,7 @@ cdef class Table(Leaf):
     cdef int ret
     cdef void *rbuf
     cdef NumCache chunkcache
+    cdef SharedCache sharedcache
 
     chunkcache = self._chunkcache
     chunkshape = chunkcache.slotsize
@@ -601,13 +711,20 @@ cdef class Table(Leaf):
     if nslot >= 0:
       chunkcache.getitem_(nslot, rbuf, 0)
     else:
-      # Chunk is not in cache. Read it and put it in the LRU cache.
-      with nogil:
-          ret = H5TBOread_records(self.dataset_id, self.type_id,
-                                  start, nrecords, rbuf)
+      # Chunk is not in cache. Look it up in the shared cache, or else
+      # read it, and put it in the LRU cache.
+      sharedcache = self._sharedcache
+      if (sharedcache is None or not sharedcache.getitem_(
+          self._sharedcachekey, nchunk, rbuf, nrecords * chunkcache.itemsize)):
+        with nogil:
+            ret = H5TBOread_records(self.dataset_id, self.type_id,
+                                    start, nrecords, rbuf)
 
-      if ret < 0:
-        raise HDF5ExtError("Problems reading chunk records.")
+        if ret < 0:
+          raise HDF5ExtError("Problems reading chunk records.")
+        if sharedcache is not None:
+          sharedcache.setitem_(self._sharedcachekey, nchunk, rbuf,
+                               nrecords * chunkcache.itemsize)
       nslot = chunkcache.setitem_(nchunk, rbuf, 0)
     return nrecords
 
@@ -639,7 +756,6 @@ cdef class Table(Leaf):
   def _remove_rows(self, hsize_t start, hsize_t stop, long step):
     cdef size_t rowsize
     cdef hsize_t nrecords=0, nrecords2
-    cdef hsize_t i
 
     if step == 1:
       nrecords = stop - start
@@ -660,20 +776,82 @@ cdef class Table(Leaf):
       self._dirtycache = True
     elif step == -1:
       nrecords = self._remove_rows(stop+1, start+1, 1)
-    elif step >= 1:
-      # always want to go through the space backwards
-      for i in range(stop - step, <ssize_t>start - step, -step):
-        nrecords += self._remove_rows(i, i+1, 1)
-    elif step <= -1:
-      # always want to go through the space backwards
-      for i in range(start, stop, step):
-        nrecords += self._remove_rows(i, i+1, 1)
+    elif step > 1:
+      nrecords = self._remove_strided_rows(start, stop, step)
+    elif step < -1:
+      # Remove the same rows, but going forwards
+      nrecords = len(range(start, stop, step))
+      if nrecords > 0:
+        nrecords = self._remove_strided_rows(
+          start + step * (nrecords - 1), start + 1, -step)
     else:
       raise ValueError("step size may not be 0.")
 
     # Return the number of records removed
     return nrecords
 
+  def _remove_strided_rows(self, hsize_t start, hsize_t stop, long step):
+    """Remove the rows in ``range(start, stop, step)`` (`step` > 0)."""
+
+    def removed(bstart, bstop, rows):
+      if bstart >= stop:
+        return None
+      mask = numpy.zeros(bstop - bstart, dtype=numpy.bool_)
+      # The first row to remove in the buffer
+      first = start + max(0, -((start - bstart) // step)) * step
+      mask[first - bstart:min(bstop, stop) - bstart:step] = True
+      return mask
+
+    if start >= stop:
+      return 0
+    return self._compact_records(start, removed)
+
+  def _compact_records(self, hsize_t start, object removed):
+    """Remove rows from `start` on in a single pass over the table.
+
+    `removed` is called as ``removed(bstart, bstop, rows)`` for every
+    buffer of `rows` read, and it must return a boolean array telling
+    which rows of the buffer are to be removed (or None if none of them
+    is).  The rows kept are written back one after the other, and the
+    table is truncated only once at the end.  The number of removed rows
+    is returned.
+
+    """
+
+    cdef hsize_t nrows, nrowsinbuf, bstart, bstop, wstart, nkept
+    cdef hsize_t nrecords2
+    cdef ndarray buf, kept
+
+    nrows = self.nrows
+    nrowsinbuf = self.nrowsinbuf
+    buf = self._get_container(nrowsinbuf)
+    wstart = bstart = start
+    while bstart < nrows:
+      bstop = min(bstart + nrowsinbuf, nrows)
+      self._read_records(bstart, bstop - bstart, buf)
+      kept = buf[:bstop - bstart]
+      mask = removed(bstart, bstop, kept)
+      if mask is not None:
+        kept = kept[~mask]
+      nkept = len(kept)
+      # Rows stay in place until the first one is removed
+      if nkept > 0 and (wstart < bstart or nkept < bstop - bstart):
+        self._update_records(wstart, wstart + nkept, 1, kept)
+      wstart += nkept
+      bstart = bstop
+
+    if wstart == nrows:
+      return 0
+    self._g_truncate(wstart)
+    if self._v_file.params['PYTABLES_SYS_ATTRS']:
+      # Attach the NROWS attribute
+      nrecords2 = self.nrows
+      H5ATTRset_attribute(self.dataset_id, "NROWS", H5T_STD_I64,
+                          0, NULL, <char *>&nrecords2)
+    # Set the caches to dirty
+    self._dirtycache = True
+    return nrows - wstart
+
 cdef class Row:
   """Table row iterator and field accessor.
 
@@ -731,6 +909,8 @@ cdef class Row:
   cdef object  _table_file, _table_path
   cdef object  modified_fields
   cdef object  seqcache_key
+  cdef object  prefetcher
+  cdef object  lock
 
   # The nrow() method has been converted into a property, which is handier
   property nrow:
@@ -754,6 +934,8 @@ cdef class Row:
     # Location-dependent information.
     self._table_file = table._v_file
     self._table_path = table._v_pathname
+    # Rows are read under the lock of thread-safe files
+    self.lock = table._v_file._v_lock
     self._unsaved_nrows = 0
     self._mod_nrows = 0
     self._row = 0
@@ -777,12 +959,28 @@ cdef class Row:
     self.rfieldscache = {}
     self.wfieldscache = {}
     self.modified_fields = set()
+    self.prefetcher = None
 
-  def _iter(self, start=0, stop=0, step=1, coords=None, chunkmap=None):
+  def __dealloc__(self):
+    if self.prefetcher is not None:
+      self.prefetcher.close()
+
+  def _iter(self, start=0, stop=0, step=1, coords=None, chunkmap=None,
+            prefetch=False):
     """Return an iterator for traversiong the data in table."""
     self._init_loop(start, stop, step, coords, chunkmap)
+    if (prefetch and self.step > 0 and not self.wherecond and
+        not self.indexed and self.coords is None):
+      self.prefetcher = _RowPrefetcher(self.table, self.nrowsinbuf)
     return iter(self)
 
+  def _stop_prefetching(self):
+    """Wait for the read in flight (if any) and stop the read-ahead."""
+
+    if self.prefetcher is not None:
+      self.prefetcher.close()
+      self.prefetcher = None
+
   def __iter__(self):
     """Iterator that traverses all the data in the Table"""
     return self
@@ -802,22 +1000,29 @@ cdef class Row:
       self.wfields[name] = self.wrec[name]
 
     # Get the read buffer for this instance (it is private, remember!)
-    buff = self.iobuf = table._get_container(self.nrowsinbuf)
+    buff = table._get_container(self.nrowsinbuf)
+    self._set_iobuf(buff)
+
+    # Get the stride of these buffers
+    self._stride = buff.strides[0]
+    # The rowsize
+    self._rowsize = self.dtype.itemsize
+    self.nrows = table.nrows  # This value may change
+
+  cdef _set_iobuf(self, buff):
+    """Use `buff` as the read buffer of this instance."""
+
+    self.iobuf = buff
     # Build the rfields dictionary for faster access to columns
     # This is quite fast, as it only takes around 5 us per column
     # in my laptop (Pentium 4 @ 2 GHz).
     # F. Alted 2006-08-18
     self.rfields = {}
+    self.rfieldscache = {}
     for i, name in enumerate(self.dtype.names):
       self.rfields[i] = buff[name]
       self.rfields[name] = buff[name]
 
-    # Get the stride of these buffers
-    self._stride = buff.strides[0]
-    # The rowsize
-    self._rowsize = self.dtype.itemsize
-    self.nrows = table.nrows  # This value may change
-
   cdef _init_loop(self, hsize_t start, long long stop, long long step,
                  object coords, object chunkmap):
     """Initialization for the __iter__ iterator"""
@@ -891,6 +1096,13 @@ cdef class Row:
   def __next__(self):
     """next() method for __iter__() that is called on each iteration"""
 
+    if self.lock is None or self.prefetcher is not None:
+      # Prefetching iterators only take the lock for their reads
+      return self._next()
+    with self.lock:
+      return self._next()
+
+  cdef _next(self):
     if not self._riterator:
       # The iterator is already exhausted!
       raise StopIteration
@@ -1021,7 +1233,7 @@ cdef class Row:
           self.bufcoords = numpy.array(tmp, dtype="uint64")
           self._row = -1
           if self.bufcoords.size > 0:
-            recout = self.table._read_elements(self.bufcoords, self.iobuf)
+            recout = self.table._read_grouped_elements(self.bufcoords, self.iobuf)
           else:
             recout = 0
           self.bufcoords_data = <hsize_t*>self.bufcoords.data
@@ -1045,7 +1257,7 @@ cdef class Row:
           else:
             tmp = self.coords[self.nextelement - (<long long> self.nrowsinbuf) + 1:self.nextelement + 1]
           self.bufcoords = numpy.array(tmp, dtype="uint64")
-          recout = self.table._read_elements(self.bufcoords, self.iobuf)
+          recout = self.table._read_grouped_elements(self.bufcoords, self.iobuf)
           self.bufcoords_data = <hsize_t*>self.bufcoords.data
           self.nrowsread = self.nrowsread + self.nrowsinbuf
           self._row = len(self.bufcoords) - 1
@@ -1132,8 +1344,14 @@ cdef class Row:
             self.stopb = self.nrowsinbuf
           self._row = self.startb - self.step
           # Read a chunk
-          recout = self.table._read_records(self.nrowsread, self.nrowsinbuf,
-                                            self.iobuf)
+          if self.prefetcher is not None:
+            recout, iobuf = self.prefetcher.read(
+              self.nrowsread, self.nrowsinbuf, self.iobuf, self._next_block())
+            if iobuf is not self.iobuf:
+              self._set_iobuf(iobuf)
+          else:
+            recout = self.table._read_records(self.nrowsread,
+                                              self.nrowsinbuf, self.iobuf)
           self.nrowsread = self.nrowsread + recout
 
         self._row = self._row + self.step
@@ -1166,10 +1384,32 @@ cdef class Row:
       else:
         self._finish_riterator()
 
+  cdef long long _next_block(self):
+    """Get the start of the block to be read after the current one.
+
+    This is only meant for the general iterator with a positive step.  A
+    negative value is returned when no more blocks are needed.
+
+    """
+
+    cdef long long blockend, nextelement
+
+    blockend = self.nrowsread + self.nrowsinbuf
+    # The first element to be returned past the current block
+    nextelement = self.nextelement
+    if nextelement < blockend:
+      nextelement = nextelement + ((blockend - nextelement + self.step - 1)
+                                   // self.step) * self.step
+    if nextelement >= self.stop:
+      return -1
+    return blockend + ((nextelement - blockend) // self.nrowsinbuf *
+                       self.nrowsinbuf)
+
   cdef _finish_riterator(self):
     """Clean-up things after iterator has been done"""
     cdef ObjectCache seqcache
 
+    self._stop_prefetching()
     self.rfieldscache = {}     # empty rfields cache
     self.wfieldscache = {}     # empty wfields cache
     # Make a copy of the last read row in the private record
@@ -1418,13 +1658,18 @@ cdef class Row:
   def _flush_mod_rows(self):
     """Flush any possible modified row using Row.update()"""
 
+    if self.prefetcher is not None:
+      self.prefetcher.wait()
     table = self.table
     # Save the records on disk
-    table._update_elements(self._mod_nrows, self.mod_elements, self.iobufcpy)
+    elements = self.mod_elements[:self._mod_nrows]
+    table._update_coordinates(elements, self.iobufcpy)
+    # Refresh the zone maps of the chunks with modified rows
+    table._update_zonemaps(elements.min(), elements.max() + 1)
     # Reset the counter of modified rows to 0
     self._mod_nrows = 0
     # Mark the modified fields' indexes as dirty.
-    table._mark_columns_as_dirty(self.modified_fields)
+    table._mark_columns_as_dirty(self.modified_fields, elements)
 
 
   def __contains__(self, item):
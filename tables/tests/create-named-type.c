@@ -0,0 +1,45 @@
+// This program creates a file with named (committed) datatypes for
+// testing purposes.
+
+#include "hdf5.h"
+#include <stdio.h>
+
+
+int
+main(int argc, char **argv)
+{
+    hid_t file_id, group_id, space_id, type_id, dataset_id;
+    hsize_t dims[1] = { 3 };
+    int data[3] = { 1, 2, 3 };
+
+    if (argc < 2) {
+        printf("Pass the name of the file to create as argument\n");
+        return(0);
+    }
+
+    // Create a new file
+    file_id = H5Fcreate(argv[1], H5F_ACC_TRUNC, H5P_DEFAULT, H5P_DEFAULT);
+    // Commit a datatype in the root group and another one in a subgroup
+    group_id = H5Gcreate(file_id, "group", H5P_DEFAULT, H5P_DEFAULT,
+                         H5P_DEFAULT);
+    type_id = H5Tcopy(H5T_NATIVE_INT);
+    H5Tcommit(file_id, "type", type_id, H5P_DEFAULT, H5P_DEFAULT,
+              H5P_DEFAULT);
+    H5Tclose(type_id);
+    type_id = H5Tcopy(H5T_NATIVE_DOUBLE);
+    H5Tcommit(group_id, "type", type_id, H5P_DEFAULT, H5P_DEFAULT,
+              H5P_DEFAULT);
+    H5Tclose(type_id);
+    // Create an array next to the named datatypes
+    space_id = H5Screate_simple(1, dims, NULL);
+    dataset_id = H5Dcreate(file_id, "array", H5T_NATIVE_INT, space_id,
+                           H5P_DEFAULT, H5P_DEFAULT, H5P_DEFAULT);
+    H5Dwrite(dataset_id, H5T_NATIVE_INT, H5S_ALL, H5S_ALL, H5P_DEFAULT, data);
+    // Free resources
+    H5Dclose(dataset_id);
+    H5Sclose(space_id);
+    H5Gclose(group_id);
+    H5Fclose(file_id);
+
+    return(1);
+}
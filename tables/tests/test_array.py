@@ -636,6 +636,54 @@ class SizeOnDiskInMemoryPropertyTestCase(common.TempFileMixin, TestCase):
         self.assertEqual(self.array.size_in_memory, 10 * 10 * 4)
 
 
+class MemmapTestCase(common.TempFileMixin, TestCase):
+    """Contiguous arrays can be mapped in memory."""
+
+    def setUp(self):
+        super(MemmapTestCase, self).setUp()
+        self.array = numpy.arange(1000, dtype='i4').reshape(100, 10)
+        self.h5file.create_array('/', 'array', self.array)
+        self.h5file.create_carray('/', 'carray', obj=self.array,
+                                  filters=tables.Filters(complevel=1))
+
+    def test00_as_memmap(self):
+        """Uncompressed, contiguous arrays are mapped."""
+
+        mmarr = self.h5file.root.array.as_memmap()
+        self.assertTrue(isinstance(mmarr, numpy.memmap))
+        self.assertFalse(mmarr.flags.writeable)
+        npt.assert_array_equal(mmarr, self.array)
+        self._reopen()
+        mmarr = self.h5file.root.array.as_memmap()
+        self.assertTrue(isinstance(mmarr, numpy.memmap))
+        npt.assert_array_equal(mmarr[10:20, ::3], self.array[10:20, ::3])
+
+    def test01_as_memmap_fallback(self):
+        """Chunked arrays are read instead."""
+
+        arr = self.h5file.root.carray.as_memmap()
+        self.assertFalse(isinstance(arr, numpy.memmap))
+        npt.assert_array_equal(arr, self.array)
+
+    def test02_mmap_reads(self):
+        """Reads from read-only files can be mapped."""
+
+        self._reopen(mmap=True)
+        array = self.h5file.root.array
+        for key in [5, (5, 3), slice(3, 70, 4), (slice(None), 7),
+                    (slice(10, 20), slice(2, 8, 3)), Ellipsis]:
+            result = array[key]
+            npt.assert_array_equal(result, self.array[key])
+            if isinstance(result, numpy.ndarray):
+                self.assertFalse(result.flags.writeable)
+        npt.assert_array_equal(array.read(3, 30, 2), self.array[3:30:2])
+        npt.assert_array_equal([row for row in array], self.array)
+        npt.assert_array_equal(array[[1, 5, 7], 2:4],
+                               self.array[[1, 5, 7], 2:4])
+        npt.assert_array_equal(self.h5file.root.carray[3:9],
+                               self.array[3:9])
+
+
 class UnalignedAndComplexTestCase(common.TempFileMixin, TestCase):
     """Basic test for all the supported typecodes present in numpy.
 
@@ -2686,6 +2734,7 @@ def suite():
         theSuite.addTest(unittest.makeSuite(ReadOutArgumentTests))
         theSuite.addTest(unittest.makeSuite(
             SizeOnDiskInMemoryPropertyTestCase))
+        theSuite.addTest(unittest.makeSuite(MemmapTestCase))
         theSuite.addTest(unittest.makeSuite(GroupsArrayTestCase))
         theSuite.addTest(unittest.makeSuite(ComplexNotReopenNotEndianTestCase))
         theSuite.addTest(unittest.makeSuite(ComplexReopenNotEndianTestCase))
@@ -1692,7 +1692,58 @@ class UnsupportedAttrTypeTestCase(common.TestFileMixin, TestCase):
     def test00_unsupportedType(self):
         """Checking file with unsupported type."""
 
-        self.assertWarns(DataTypeWarning, repr, self.h5file)
+        # Attributes are only read when accessed
+        attrs = self.h5file.get_node('/wfm_group0/axes/axis0')._v_attrs
+        self.assertEqual(attrs._v_unimplemented, [])
+        self.assertWarns(DataTypeWarning, getattr, attrs, 'ref_time')
+        self.assertEqual(attrs._v_unimplemented, ['ref_time'])
+
+    def test01_unsupportedType_eager(self):
+        """Checking file with unsupported type (eager attributes)."""
+
+        with tables.open_file(self.h5fname, eager_node_attrs=True) as h5file:
+            self.assertWarns(DataTypeWarning, repr, h5file)
+
+
+class LazyAttributesTestCase(common.TempFileMixin, TestCase):
+    def setUp(self):
+        super(LazyAttributesTestCase, self).setUp()
+        array = self.h5file.create_array('/', 'array', [1, 2, 3])
+        array.attrs.pickled = {'a': list(range(10))}
+        array.attrs.number = 3
+        self._reopen(mode='a')
+
+    def test00_lazy(self):
+        """Attribute values are read when first accessed."""
+
+        attrs = self.h5file.root.array._v_attrs
+        self.assertEqual(attrs._v_attrnamesuser, ['number', 'pickled'])
+        self.assertNotIn('pickled', attrs.__dict__)
+        self.assertIn('pickled', dir(attrs))
+        self.assertEqual(attrs.pickled, {'a': list(range(10))})
+        self.assertIn('pickled', attrs.__dict__)
+        self.assertNotIn('number', attrs.__dict__)
+
+        # Unread attributes can be deleted, renamed and copied
+        del attrs.number
+        self.assertEqual(attrs._v_attrnamesuser, ['pickled'])
+        attrs.number = 4
+        self._reopen(mode='a')
+        attrs = self.h5file.root.array._v_attrs
+        attrs._f_rename('pickled', 'renamed')
+        self.assertEqual(attrs.renamed, {'a': list(range(10))})
+        self.h5file.create_group('/', 'group')
+        self._reopen(mode='a')
+        self.h5file.root.array._v_attrs._f_copy(self.h5file.root.group)
+        self.assertEqual(self.h5file.root.group._v_attrs.number, 4)
+
+    def test01_eager(self):
+        """Attribute values are read on opening with EAGER_NODE_ATTRS."""
+
+        self._reopen(eager_node_attrs=True)
+        attrs = self.h5file.root.array._v_attrs
+        self.assertIn('pickled', attrs.__dict__)
+        self.assertIn('number', attrs.__dict__)
 
 
 # Test for specific system attributes
@@ -1752,6 +1803,7 @@ def suite():
         theSuite.addTest(unittest.makeSuite(EmbeddedNullsTestCase))
         theSuite.addTest(unittest.makeSuite(VlenStrAttrTestCase))
         theSuite.addTest(unittest.makeSuite(UnsupportedAttrTypeTestCase))
+        theSuite.addTest(unittest.makeSuite(LazyAttributesTestCase))
         theSuite.addTest(unittest.makeSuite(SpecificAttrsTestCase))
 
     return theSuite
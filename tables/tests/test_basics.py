@@ -1193,6 +1193,329 @@ class DictNodeCacheOpenFile(OpenFileTestCase):
     open_kwargs = dict(node_cache_slots=node_cache_slots)
 
 
+class SizedNodeCacheOpenFile(OpenFileTestCase):
+    node_cache_slots = NODE_CACHE_SLOTS
+    open_kwargs = dict(node_cache_slots=node_cache_slots,
+                       node_cache_size=16 * 1024)
+
+
+class NodeCacheStatsTestCase(common.TempFileMixin, TestCase):
+    open_kwargs = dict(node_cache_slots=8)
+
+    def setUp(self):
+        super(NodeCacheStatsTestCase, self).setUp()
+        for i in range(10):
+            self.h5file.create_array('/', 'array%d' % i, numpy.arange(10))
+        self._reopen(node_cache_slots=8)
+
+    def test00_hits_and_misses(self):
+        stats = self.h5file.get_node_cache_stats()
+        self.assertEqual(stats['nodes'], 0)
+        self.h5file.get_node('/array0')
+        stats = self.h5file.get_node_cache_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['nodes'], 1)
+        hits = stats['hits']
+        self.h5file.get_node('/array0')
+        stats = self.h5file.get_node_cache_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], hits + 1)
+        self.assertEqual(stats['maxsize'], 0)
+
+    def test01_evictions_by_count(self):
+        for i in range(10):
+            self.h5file.get_node('/array%d' % i)
+        stats = self.h5file.get_node_cache_stats()
+        self.assertEqual(stats['nodes'], 8)
+        self.assertEqual(stats['evictions'], 2)
+
+    def test02_evictions_by_size(self):
+        self._reopen(node_cache_slots=8, node_cache_size=1)
+        for i in range(10):
+            self.h5file.get_node('/array%d' % i)
+        stats = self.h5file.get_node_cache_stats()
+        # The most recently used node is always kept.
+        self.assertEqual(stats['nodes'], 1)
+        self.assertEqual(stats['evictions'], 9)
+        self.assertTrue(stats['size'] > 0)
+        self.assertEqual(stats['maxsize'], 1)
+
+    def test03_size_budget(self):
+        array0 = self.h5file.get_node('/array0')
+        cost = array0._g_get_cache_cost()
+        self._reopen(node_cache_slots=8, node_cache_size=3 * cost)
+        for i in range(10):
+            self.h5file.get_node('/array%d' % i)
+        stats = self.h5file.get_node_cache_stats()
+        self.assertTrue(stats['size'] <= 3 * cost)
+        self.assertTrue(0 < stats['nodes'] <= 3)
+
+    def test04_pin_node(self):
+        self.h5file.pin_node('/array0')
+        for i in range(1, 10):
+            self.h5file.get_node('/array%d' % i)
+        stats = self.h5file.get_node_cache_stats()
+        self.assertEqual(stats['pinned'], 1)
+        self.assertEqual(stats['nodes'], 8)
+        misses = stats['misses']
+        self.h5file.get_node('/array0')
+        stats = self.h5file.get_node_cache_stats()
+        self.assertEqual(stats['misses'], misses)
+
+        self.h5file.unpin_node('/array0')
+        stats = self.h5file.get_node_cache_stats()
+        self.assertEqual(stats['pinned'], 0)
+        self.assertTrue('/array0' in self.h5file._node_manager.cache)
+
+    def test05_pin_renamed_and_removed_node(self):
+        self._reopen(mode='a', node_cache_slots=8)
+        self.h5file.pin_node('/array0')
+        self.h5file.rename_node('/array0', 'renamed')
+        self.assertTrue('/renamed' in self.h5file._node_manager.pinned)
+        self.h5file.remove_node('/renamed')
+        stats = self.h5file.get_node_cache_stats()
+        self.assertEqual(stats['pinned'], 0)
+
+
+class ThreadSafeTestCase(common.TempFileMixin, TestCase):
+    nthreads = 8
+    nrows = 1000
+
+    def setUp(self):
+        super(ThreadSafeTestCase, self).setUp()
+        filters = tables.Filters(complevel=1, complib='zlib')
+        for i in range(4):
+            group = self.h5file.create_group('/', 'group%d' % i)
+            group._v_attrs.number = i
+            self.h5file.create_carray(group, 'array', obj=numpy.arange(
+                self.nrows) * i, chunkshape=(100,), filters=filters)
+            table = self.h5file.create_table(
+                group, 'table', {'x': IntCol(pos=0), 'y': FloatCol(pos=1)},
+                filters=filters, chunkshape=(64,))
+            table.append([(j, j * i) for j in range(self.nrows)])
+            vlarray = self.h5file.create_vlarray(group, 'vlarray',
+                                                 tables.Int32Atom())
+            for j in range(100):
+                vlarray.append(numpy.arange(j) + i)
+        self._reopen(thread_safe=True, node_cache_slots=4)
+
+    def _check_group(self, i):
+        group = self.h5file.get_node('/group%d' % i)
+        self.assertEqual(group._v_attrs.number, i)
+        self.assertEqual(sorted(group._v_children),
+                         ['array', 'table', 'vlarray'])
+        array = self.h5file.get_node(group, 'array')
+        self.assertTrue(common.allequal(array[:], numpy.arange(self.nrows) * i))
+        self.assertEqual(array[[5, 50, 500]].tolist(), [5 * i, 50 * i, 500 * i])
+        table = group.table
+        self.assertEqual(table.read(field='x').tolist(),
+                         list(range(self.nrows)))
+        self.assertEqual(sum(row['x'] for row in table), sum(range(self.nrows)))
+        self.assertEqual(table.read_where('x < 10', field='y').tolist(),
+                         [float(j * i) for j in range(10)])
+        self.assertEqual(table.read_coordinates([3, 300])['x'].tolist(),
+                         [3, 300])
+        self.assertEqual(group.vlarray[50].tolist(), list(range(i, 50 + i)))
+
+    def test00_read_only(self):
+        self.h5file.close()
+        for mode in ('a', 'r+'):
+            self.assertRaises(ValueError, tables.open_file, self.h5fname,
+                              mode, thread_safe=True)
+        self.h5file = tables.open_file(self.h5fname)
+
+    def test01_lock(self):
+        self.assertTrue(self.h5file._v_lock is tables.utils.hdf5_lock)
+        self.assertTrue(self.h5file.root.group0._v_lock is
+                        tables.utils.hdf5_lock)
+        self.assertTrue(self.h5file.root._v_attrs._v_lock is
+                        tables.utils.hdf5_lock)
+        self._reopen()
+        self.assertTrue(self.h5file._v_lock is None)
+        self.assertTrue(self.h5file.root.group0._v_lock is None)
+
+    def test02_concurrent_reads(self):
+        errors = []
+
+        def reader(n):
+            try:
+                for k in range(5):
+                    self._check_group((n + k) % 4)
+            except Exception:
+                errors.append(sys.exc_info())
+
+        threads = [threading.Thread(target=reader, args=(n,))
+                   for n in range(self.nthreads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            six.reraise(*errors[0])
+
+    def test03_prefetch(self):
+        table = self.h5file.root.group1.table
+        table.nrowsinbuf = 100
+        errors = []
+
+        def reader(n):
+            try:
+                rows = [row['y'] for row in table.iterrows(prefetch=True)]
+                self.assertEqual(rows, [float(j) for j in range(self.nrows)])
+                self._check_group(n % 4)
+            except Exception:
+                errors.append(sys.exc_info())
+
+        rows = table.iterrows(prefetch=True)
+        self.assertEqual(next(rows)['y'], 0.)
+        self.assertEqual(len(table._prefetchers), 1)
+        threads = [threading.Thread(target=reader, args=(n,))
+                   for n in range(self.nthreads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            six.reraise(*errors[0])
+        self.assertEqual([row['y'] for row in rows],
+                         [float(j) for j in range(1, self.nrows)])
+        self.assertEqual(len(table._prefetchers), 0)
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'requires Python 3.5')
+class AsyncReadTestCase(common.TempFileMixin, TestCase):
+    nrows = 1000
+
+    def setUp(self):
+        super(AsyncReadTestCase, self).setUp()
+        import asyncio
+        table = self.h5file.create_table(
+            '/', 'table', {'x': IntCol(pos=0), 'y': FloatCol(pos=1)},
+            chunkshape=(64,))
+        table.append([(j, j / 2.) for j in range(self.nrows)])
+        self.h5file.create_carray('/', 'array', obj=numpy.arange(self.nrows),
+                                  chunkshape=(100,))
+        vlarray = self.h5file.create_vlarray('/', 'vlarray',
+                                             tables.Int32Atom())
+        for j in range(100):
+            vlarray.append(numpy.arange(j))
+        self._reopen(thread_safe=True)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        import asyncio
+        self.h5file.close()
+        asyncio.set_event_loop(None)
+        self.loop.close()
+        super(AsyncReadTestCase, self).tearDown()
+
+    def _run(self, *futures):
+        import asyncio
+        if len(futures) == 1:
+            return self.loop.run_until_complete(futures[0])
+        return self.loop.run_until_complete(asyncio.gather(*futures))
+
+    def _collect(self, batches):
+        # Like ``[batch async for batch in batches]``.
+        result = []
+        while True:
+            try:
+                future = batches.__anext__()
+                result.append(self._run(future))
+            except StopAsyncIteration:
+                return result
+
+    def test00_reads(self):
+        root = self.h5file.root
+        table, array, vlarray = root.table, root.array, root.vlarray
+        self.assertEqual(self._run(table.aread(10, 20, field='x')).tolist(),
+                         list(range(10, 20)))
+        self.assertEqual(self._run(table.aread()).tolist(),
+                         table.read().tolist())
+        self.assertEqual(
+            self._run(table.aread_coordinates([3, 300], 'y')).tolist(),
+            [1.5, 150.])
+        limit = 5
+        self.assertEqual(self._run(table.aread_where('x < limit')).tolist(),
+                         table.read(0, 5).tolist())
+        self.assertEqual(self._run(array.aread(5, 8)).tolist(), [5, 6, 7])
+        self.assertEqual(self._run(array.agetitem(slice(0, 1000, 100)))
+                         .tolist(), list(range(0, 1000, 100)))
+        self.assertEqual([row.tolist() for row in
+                          self._run(vlarray.aread(2, 4))], [[0, 1], [0, 1, 2]])
+        self.assertEqual(self._run(vlarray.agetitem(3)).tolist(), [0, 1, 2])
+        self.assertRaises(IndexError, self._run, array.agetitem(2000))
+
+    def test01_coalescing(self):
+        from tables import aio
+        table, array = self.h5file.root.table, self.h5file.root.array
+        whole, part, part2 = self._run(
+            table.aread(), table.aread(100, 200), table.aread(100, 200))
+        reader = aio.get_reader(self.h5file)
+        self.assertEqual(reader.coalesced, 2)
+        self.assertEqual(part.tolist(), whole[100:200].tolist())
+        self.assertEqual(part2.tolist(), part.tolist())
+        part['x'] = -1
+        self.assertEqual(whole['x'][100], 100)
+        self.assertEqual(part2['x'][0], 100)
+
+        coords = [1, 10, 100]
+        result1, result2 = self._run(array.agetitem(coords),
+                                     array.agetitem(coords))
+        self.assertEqual(reader.coalesced, 2)
+        result1, result2 = self._run(table.aread_coordinates(coords),
+                                     table.aread_coordinates(coords))
+        self.assertEqual(reader.coalesced, 3)
+        self.assertEqual(result1.tolist(), result2.tolist())
+        self._run(table.aread_where('x > 990'), table.aread_where('x > 990'))
+        self.assertEqual(reader.coalesced, 4)
+        # Reads not running at the same time are not coalesced.
+        self._run(table.aread(100, 200))
+        self._run(table.aread(100, 200))
+        self.assertEqual(reader.coalesced, 4)
+
+    def test02_batches(self):
+        table, array = self.h5file.root.table, self.h5file.root.array
+        batches = self._collect(array.aiter_batches(300, start=50))
+        self.assertEqual([len(batch) for batch in batches],
+                         [300, 300, 300, 50])
+        self.assertEqual(numpy.concatenate(batches).tolist(),
+                         list(range(50, self.nrows)))
+        self.assertEqual(
+            len(self._collect(self.h5file.root.vlarray.aiter_batches(30))), 4)
+
+        limit = 900
+        total = 0
+        for batch in self._collect(table.aiter_batches(
+                128, columns=['y'], condition='x >= limit')):
+            total += batch['y'].sum()
+        self.assertEqual(total, sum(j / 2. for j in range(900, self.nrows)))
+        self.assertRaises(ValueError, array.aiter_batches, 0)
+
+    def test03_close(self):
+        from tables import aio
+        self._reopen(thread_safe=True, aio_max_workers=3)
+        array = self.h5file.root.array
+        futures = [array.aread(j, j + 10) for j in range(0, 1000, 10)]
+        reader = aio.get_reader(self.h5file)
+        self.assertEqual(reader._executor._max_workers, 3)
+        self.h5file.close()
+        self.assertEqual(numpy.concatenate(self._run(*futures)).tolist(),
+                         list(range(self.nrows)))
+        self.assertRaises(tables.ClosedNodeError, array.aread)
+        self.h5file = tables.open_file(self.h5fname)
+
+    def test04_not_thread_safe(self):
+        from tables import aio
+        self._reopen()
+        root = self.h5file.root
+        self.assertRaises(ValueError, root.table.aread)
+        self.assertRaises(ValueError, root.array.agetitem, 0)
+        self.assertRaises(ValueError, aio.get_reader, self.h5file)
+        self.assertIsNone(self.h5file._v_aio)
+
+
 class CheckFileTestCase(common.TempFileMixin, TestCase):
     def setUp(self):
         super(CheckFileTestCase, self).setUp()
@@ -2485,6 +2808,10 @@ def suite():
         theSuite.addTest(unittest.makeSuite(NodeCacheOpenFile))
         theSuite.addTest(unittest.makeSuite(NoNodeCacheOpenFile))
         theSuite.addTest(unittest.makeSuite(DictNodeCacheOpenFile))
+        theSuite.addTest(unittest.makeSuite(SizedNodeCacheOpenFile))
+        theSuite.addTest(unittest.makeSuite(NodeCacheStatsTestCase))
+        theSuite.addTest(unittest.makeSuite(ThreadSafeTestCase))
+        theSuite.addTest(unittest.makeSuite(AsyncReadTestCase))
         theSuite.addTest(unittest.makeSuite(CheckFileTestCase))
         theSuite.addTest(unittest.makeSuite(ThreadingTestCase))
         theSuite.addTest(unittest.makeSuite(PythonAttrsTestCase))
@@ -1900,6 +1900,128 @@ class CopyIndexTestCase(common.TempFileMixin, TestCase):
         self.assertEqual(r2.shape[0], array2.nrows)
 
 
+class DirectChunkTestCase(common.TempFileMixin, TestCase):
+    """Tests for the direct chunk read/write API and raw chunk copies."""
+
+    def setUp(self):
+        super(DirectChunkTestCase, self).setUp()
+        if not tables.hdf5extension.HAVE_DIRECT_CHUNK:
+            self.skipTest("direct chunk I/O not supported by HDF5")
+        self.filters = tables.Filters(complevel=1, complib='zlib',
+                                       shuffle=False)
+        self.data = numpy.arange(100 * 6, dtype='int32').reshape(100, 6)
+        self.array = self.h5file.create_carray(
+            '/', 'array', atom=Int32Atom(), shape=(100, 6),
+            chunkshape=(10, 3), filters=self.filters)
+        self.array[:] = self.data
+
+    def test00_read_chunk(self):
+        """Reading a chunk gives its contents as stored in the file."""
+
+        data, filter_mask = self.array.read_chunk((10, 3))
+        self.assertEqual(filter_mask, 0)
+        self.assertTrue(isinstance(data, bytes))
+        self.assertTrue(len(data) < 10 * 3 * 4)
+
+        array = self.h5file.create_carray(
+            '/', 'plain', atom=Int32Atom(), shape=(100, 6),
+            chunkshape=(10, 3))
+        array[:] = self.data
+        data, filter_mask = array.read_chunk((10, 3))
+        chunk = numpy.frombuffer(data, dtype='int32').reshape(10, 3)
+        self.assertTrue(allequal(chunk, self.data[10:20, 3:6]))
+
+    def test01_read_unwritten_chunk(self):
+        """Reading a chunk which has not been written gives None."""
+
+        array = self.h5file.create_carray(
+            '/', 'empty', atom=Int32Atom(), shape=(100, 6),
+            chunkshape=(10, 3), filters=self.filters)
+        self.assertTrue(array.read_chunk((0, 0)) is None)
+
+    def test02_write_chunk(self):
+        """Writing the raw data of a chunk into another leaf."""
+
+        array = self.h5file.create_carray(
+            '/', 'other', atom=Int32Atom(), shape=(100, 6),
+            chunkshape=(10, 3), filters=self.filters)
+        data, filter_mask = self.array.read_chunk((20, 0))
+        array.write_chunk((20, 0), data, filter_mask)
+        self._reopen()
+        array = self.h5file.root.other
+        self.assertTrue(allequal(array[20:30, 0:3], self.data[20:30, 0:3]))
+        self.assertTrue(allequal(array[30:40, 0:3],
+                                 numpy.zeros((10, 3), dtype='int32')))
+
+    def test03_bad_coords(self):
+        """Checking errors on bad chunk coordinates."""
+
+        self.assertRaises(ValueError, self.array.read_chunk, (0,))
+        self.assertRaises(ValueError, self.array.read_chunk, (5, 0))
+        self.assertRaises(IndexError, self.array.read_chunk, (100, 0))
+        self.assertRaises(IndexError, self.array.read_chunk, (0, -3))
+        array = self.h5file.create_array('/', 'plain', self.data)
+        self.assertRaises(TypeError, array.read_chunk, (0, 0))
+
+    def test04_write_read_only(self):
+        """Writing chunks in a read-only file is not allowed."""
+
+        data, filter_mask = self.array.read_chunk((0, 0))
+        self._reopen()
+        self.assertRaises(tables.FileModeError,
+                          self.h5file.root.array.write_chunk,
+                          (0, 0), data, filter_mask)
+
+    def test05_copy_keep_filters(self):
+        """Copying with the same filters copies the raw chunks."""
+
+        array2 = self.array.copy('/', 'array2')
+        self.assertEqual(array2.filters, self.filters)
+        self.assertEqual(array2.read_chunk((90, 3)),
+                         self.array.read_chunk((90, 3)))
+        self.assertTrue(allequal(array2.read(), self.data))
+
+    def test06_copy_other_filters(self):
+        """Copying with different filters goes through the pipeline."""
+
+        array2 = self.array.copy('/', 'array2', filters=tables.Filters())
+        self.assertEqual(array2.filters, tables.Filters())
+        self.assertTrue(allequal(array2.read(), self.data))
+
+    def test07_copy_range(self):
+        """Copying only a range of rows."""
+
+        array2 = self.array.copy('/', 'array2', start=5, stop=55)
+        self.assertTrue(allequal(array2.read(), self.data[5:55]))
+
+    def test08_copy_earray(self):
+        """Copying an enlargeable array with raw chunks."""
+
+        earray = self.h5file.create_earray(
+            '/', 'earray', atom=Int32Atom(), shape=(0, 6),
+            chunkshape=(16, 6), filters=self.filters)
+        earray.append(self.data)
+        earray2 = earray.copy('/', 'earray2')
+        self.assertEqual(earray2.nrows, 100)
+        self.assertEqual(earray2.read_chunk((96, 0)),
+                         earray.read_chunk((96, 0)))
+        self.assertTrue(allequal(earray2.read(), self.data))
+        earray2.append(self.data[:10])
+        self.assertTrue(allequal(earray2[100:], self.data[:10]))
+
+    def test09_copy_table(self):
+        """Copying a table with raw chunks."""
+
+        table = self.h5file.create_table(
+            '/', 'table', {'x': tables.Int32Col(), 'y': tables.Float64Col()},
+            filters=self.filters, chunkshape=16)
+        table.append([(i, i * 0.5) for i in range(100)])
+        table2 = table.copy('/', 'table2')
+        self.assertEqual(table2.nrows, 100)
+        self.assertTrue(allequal(table2.col('x'), table.col('x')))
+        self.assertTrue(allequal(table2.col('y'), table.col('y')))
+
+
 class CopyIndex1TestCase(CopyIndexTestCase):
     nrowsinbuf = 1
     start = 0
@@ -2763,6 +2885,7 @@ def suite():
             SizeOnDiskInMemoryPropertyTestCase))
         theSuite.addTest(unittest.makeSuite(CloseCopyTestCase))
         theSuite.addTest(unittest.makeSuite(OpenCopyTestCase))
+        theSuite.addTest(unittest.makeSuite(DirectChunkTestCase))
         theSuite.addTest(unittest.makeSuite(CopyIndex1TestCase))
         theSuite.addTest(unittest.makeSuite(CopyIndex2TestCase))
         theSuite.addTest(unittest.makeSuite(CopyIndex3TestCase))
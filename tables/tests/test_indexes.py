@@ -3,8 +3,11 @@
 from __future__ import print_function
 from __future__ import absolute_import
 import os
+import sys
 import copy
 import tempfile
+import warnings
+import subprocess
 
 import numpy
 
@@ -15,7 +18,7 @@ from tables import (
 )
 from tables.index import Index, default_auto_index, default_index_filters
 from tables.idxutils import calc_chunksize
-from tables.exceptions import OldIndexWarning
+from tables.exceptions import OldIndexWarning, PerformanceWarning
 from tables.tests import common
 from tables.tests.common import verbose, allequal, heavy, TempFileMixin
 from tables.tests.common import unittest, test_filename
@@ -2657,6 +2660,398 @@ class TestIndexingNans(TempFileMixin, TestCase):
         self.assertEqual(len(results), 100*2)
 
 
+class ParallelIndexTestCase(TempFileMixin, TestCase):
+    """Indexes built with several threads are the same as serial ones."""
+
+    open_kwargs = dict(MAX_INDEX_THREADS=4)
+    nrows = 1000
+
+    def setUp(self):
+        super(ParallelIndexTestCase, self).setUp()
+        description = dict(c_int=Int32Col(pos=0), c_float=FloatCol(pos=1),
+                           c_string=StringCol(itemsize=4, pos=2))
+        self.table = self.h5file.create_table('/', 'table', description)
+        self.values = numpy.random.RandomState(0).randint(0, 100, self.nrows)
+        self.table.append([(i, i / 3., str(i).encode('ascii'))
+                           for i in self.values])
+
+    def build(self, colname, nthreads, **kwargs):
+        self.h5file.params['MAX_INDEX_THREADS'] = nthreads
+        column = self.table.colinstances[colname]
+        column.create_index(_blocksizes=small_blocksizes, **kwargs)
+        index = column.index
+        result = (index.sorted.read(), index.indices.read(),
+                  index.sortedLR.read(), index.indicesLR.read())
+        column.remove_index()
+        return result
+
+    def test00_same_index(self):
+        """Parallel index building produces the same index."""
+
+        for colname in ['c_int', 'c_float', 'c_string']:
+            for kind, optlevel in [('ultralight', 3), ('light', 6),
+                                   ('medium', 6), ('full', 9)]:
+                serial = self.build(colname, 1, kind=kind, optlevel=optlevel)
+                parallel = self.build(colname, 4, kind=kind,
+                                      optlevel=optlevel)
+                for sarr, parr in zip(serial, parallel):
+                    self.assertTrue(allequal(sarr, parr),
+                                    "%s, %s" % (colname, kind))
+
+    def test01_queries(self):
+        """Queries on indexes built in parallel give the right results."""
+
+        table = self.table
+        table.cols.c_int.create_csindex(_blocksizes=small_blocksizes)
+        self.assertTrue(allequal(table.read_sorted('c_int')['c_int'],
+                                 numpy.sort(self.values).astype('int32')))
+        # Appending several slices also sorts them in parallel
+        table.append([(i, 0, b'') for i in self.values])
+        table.flush()
+        values = numpy.concatenate((self.values, self.values))
+        result = table.get_where_list('(c_int > 20) & (c_int < 30)')
+        expected = numpy.where((values > 20) & (values < 30))[0]
+        self.assertTrue(allequal(numpy.sort(result), expected))
+
+
+class IndexDeltaTestCase(TempFileMixin, TestCase):
+    """Changes in indexed tables can be kept in the delta of indexes."""
+
+    open_kwargs = dict(INDEX_DELTA_MAX_ROWS=1000)
+    nrows = 5000
+    kind = 'medium'
+
+    def setUp(self):
+        super(IndexDeltaTestCase, self).setUp()
+        description = dict(c_int=Int32Col(pos=0), c_float=FloatCol(pos=1))
+        self.table = self.h5file.create_table('/', 'table', description,
+                                              chunkshape=100)
+        values = numpy.random.RandomState(0).randint(0, 1000, self.nrows)
+        self.table.append([(i, i / 2.) for i in values])
+        for column in [self.table.cols.c_int, self.table.cols.c_float]:
+            column.create_index(kind=self.kind, _blocksizes=small_blocksizes)
+
+    def check_query(self, condition):
+        table = self.table
+        self.assertTrue(table.will_query_use_indexing(condition))
+        result = table.get_where_list(condition)
+        table._disable_indexing_in_queries()
+        try:
+            expected = table.get_where_list(condition)
+        finally:
+            table._enable_indexing_in_queries()
+        self.assertTrue(allequal(numpy.sort(result), expected), condition)
+        return len(result)
+
+    def check_queries(self):
+        for condition in ['c_int == 5000', 'c_int > 2000',
+                          '(c_int > 100) & (c_int < 120)', 'c_float < 0']:
+            self.check_query(condition)
+
+    def test00_modify(self):
+        """Modified rows are kept in the delta."""
+
+        table = self.table
+        table.modify_column(5, 10, column=[5000] * 5, colname='c_int')
+        table.modify_rows(20, 22, rows=[(5000, -1), (3000, -2)])
+        table.modify_coordinates([4000, 30], [(5000, 0), (1, -3)])
+        for row in table.iterrows(300, 305):
+            row['c_int'] = 6000
+            row.update()
+        table.flush()
+        index = table.cols.c_int.index
+        self.assertFalse(index.dirty)
+        self.assertEqual(index.ndelta, 14)
+        self.assertEqual(self.check_query('c_int == 5000'), 7)
+        self.assertEqual(self.check_query('c_float < 0'), 3)
+        self.check_queries()
+
+    def test01_remove(self):
+        """Removed rows are kept in the delta."""
+
+        table = self.table
+        table.modify_column(10, 15, column=[5000] * 5, colname='c_int')
+        table.remove_rows(0, 12)
+        table.remove_rows(100, 1000, 9)
+        table.remove_rows(coords=[50, 2000, -1])
+        self.assertFalse(table.cols.c_int.index.dirty)
+        self.assertEqual(table._indexedrows, table.nrows)
+        self.assertEqual(self.check_query('c_int == 5000'), 3)
+        self.check_queries()
+        table.modify_column(0, 1, column=[5000], colname='c_int')
+        self.assertEqual(self.check_query('c_int == 5000'), 3)
+        self._reopen(mode='a', **self.open_kwargs)
+        self.table = table = self.h5file.root.table
+        self.assertEqual(table._unsaved_indexedrows, 0)
+        self.check_queries()
+
+    def test02_compact(self):
+        """Deltas are merged when rebuilding indexes."""
+
+        table = self.table
+        table.modify_column(0, 500, column=[5000] * 500, colname='c_int')
+        self.assertTrue(table.cols.c_int.index.has_delta)
+        # Growing the delta over its maximum size rebuilds the index
+        table.modify_column(500, 1100, column=[5000] * 600, colname='c_int')
+        self.assertFalse(table.cols.c_int.index.has_delta)
+        self.assertEqual(self.check_query('c_int == 5000'), 1100)
+        table.remove_rows(0, 10)
+        self.assertTrue(table.cols.c_int.index.has_delta)
+        table.reindex_dirty()
+        self.assertFalse(table.cols.c_int.index.has_delta)
+        self.check_queries()
+
+    def test03_append(self):
+        """Appending rows after removing others rebuilds indexes."""
+
+        table = self.table
+        table.remove_rows(0, 10)
+        table.append([(5000, -1)] * 10)
+        table.flush()
+        self.assertFalse(table.cols.c_int.index.has_delta)
+        self.assertEqual(self.check_query('c_int == 5000'), 10)
+        self.check_queries()
+
+    def test05_remove_where(self):
+        """Rows removed by a condition are kept in the delta."""
+
+        table = self.table
+        table.modify_rows(10, 15, rows=[(5000, i) for i in range(5)])
+        # Evaluated in-kernel
+        nrows = (table.col('c_int') % 100 == 1).sum()
+        self.assertEqual(table.remove_where('c_int % 100 == 1'), nrows)
+        # Using the index
+        self.assertEqual(
+            table.remove_where('(c_int == 5000) & (c_float > 2)'), 2)
+        self.assertFalse(table.cols.c_int.index.dirty)
+        self.assertEqual(table._indexedrows, table.nrows)
+        self.assertEqual(self.check_query('c_int == 5000'), 3)
+        self.check_queries()
+
+    def test06_remove_where_unindexed(self):
+        """Rows not flushed to the index are removed by a condition."""
+
+        table = self.table
+        table.append([(5000, i) for i in range(3)])
+        self.assertGreater(table._unsaved_indexedrows, 0)
+        self.assertEqual(table.remove_where('c_int == 5000'), 3)
+        self.assertEqual(table.nrows, self.nrows)
+        self.assertEqual(table.remove_where('c_int == 5000'), 0)
+        self.assertEqual(table._indexedrows, table.nrows)
+        self.check_queries()
+
+
+class IndexDeltaUltraLightTestCase(IndexDeltaTestCase):
+    kind = 'ultralight'
+
+
+class IndexDeltaFullTestCase(IndexDeltaTestCase):
+    kind = 'full'
+
+    def create_csindex(self):
+        column = self.table.cols.c_int
+        column.remove_index()
+        column.create_csindex(_blocksizes=small_blocksizes)
+
+    def check_sorted(self):
+        table = self.table
+        values = table.col('c_int')
+        expected = values[numpy.argsort(values, kind='mergesort')]
+        for kwargs in [{}, {'checkCSI': True}]:
+            self.assertTrue(allequal(
+                table.read_sorted('c_int', field='c_int', **kwargs),
+                expected))
+        self.assertTrue(allequal(
+            table.read_sorted('c_int', field='c_int', step=-1),
+            expected[::-1]))
+        self.assertEqual([row['c_int'] for row in table.itersorted('c_int')],
+                         expected.tolist())
+        copy = table.copy('/', 'sortedcopy', sortby='c_int')
+        self.assertTrue(allequal(copy.col('c_int'), expected))
+        copy.remove()
+
+    def test04_sorted(self):
+        """Sorted reads merge the delta in memory."""
+
+        self.create_csindex()
+        table = self.table
+        table.modify_column(0, 1, column=[-1], colname='c_int')
+        table.modify_rows(20, 22, rows=[(5000, -1), (3000, -2)])
+        table.remove_rows(100, 200, 3)
+        self.assertEqual(table.read_sorted('c_int', start=0, stop=1)[0][0],
+                         -1)
+        self.check_sorted()
+        self.assertTrue(table.cols.c_int.index.has_delta)
+        table.modify_column(30, 31, column=[-2], colname='c_int')
+        self.check_sorted()
+
+    def test05_sorted_readonly(self):
+        """Sorted reads with a delta work in read-only files."""
+
+        self.create_csindex()
+        table = self.table
+        table.modify_column(0, 10, column=[7] * 10, colname='c_int')
+        self._reopen(mode='r', **self.open_kwargs)
+        self.table = table = self.h5file.root.table
+        self.assertTrue(table.cols.c_int.index.has_delta)
+        values = table.col('c_int')
+        expected = values[numpy.argsort(values, kind='mergesort')]
+        self.assertTrue(allequal(
+            table.read_sorted('c_int', checkCSI=True, field='c_int'),
+            expected))
+        self.assertEqual([row['c_int'] for row in table.itersorted('c_int')],
+                         expected.tolist())
+
+
+class SharedCacheTestCase(TempFileMixin, TestCase):
+    """Index data and table chunks can be shared among processes."""
+
+    nrows = 5000
+    conditions = ['c_int < 10', '(c_int > 100) & (c_int < 120)']
+
+    def setUp(self):
+        super(SharedCacheTestCase, self).setUp()
+        self.cachename = tempfile.mktemp(prefix='pytables-cache-')
+        description = dict(c_int=Int32Col(pos=0), c_float=FloatCol(pos=1))
+        table = self.h5file.create_table('/', 'table', description,
+                                         chunkshape=100,
+                                         filters=tables.Filters(1))
+        values = numpy.random.RandomState(0).randint(0, 1000, self.nrows)
+        table.append([(i, i / 2.) for i in values])
+        table.cols.c_int.create_index(kind='full',
+                                      _blocksizes=small_blocksizes)
+        self.expected = [table.get_where_list(condition)
+                         for condition in self.conditions]
+        self.open_kwargs = dict(shared_cache_size=4 * 1024 * 1024,
+                                shared_cache_set_size=64 * 1024,
+                                shared_cache_name=self.cachename)
+        self._reopen(**self.open_kwargs)
+
+    def tearDown(self):
+        for path in [self.cachename, self.cachename + '-small']:
+            tables.file._shared_caches.pop(path, None)
+            if os.path.exists(path):
+                os.remove(path)
+        super(SharedCacheTestCase, self).tearDown()
+
+    def check_queries(self, h5file):
+        table = h5file.root.table
+        for condition, expected in zip(self.conditions, self.expected):
+            self.assertTrue(table.will_query_use_indexing(condition))
+            result = table.get_where_list(condition)
+            self.assertTrue(allequal(numpy.sort(result), expected), condition)
+
+    def test00_cache(self):
+        """Least recently used items are evicted."""
+
+        path = self.cachename + '-small'
+        cache = tables.lrucacheextension.SharedCache(path, 4096, 4096,
+                                                     nways=4)
+        self.assertEqual((cache.nsets, cache.setsize), (1, 4096))
+        arrays = [numpy.arange(i, i + 100) for i in range(5)]
+        for i in range(4):
+            self.assertTrue(cache.setitem(1, i, arrays[i]))
+        out = numpy.empty(100, dtype=arrays[0].dtype)
+        self.assertTrue(cache.getitem(1, 0, out))
+        self.assertTrue(allequal(out, arrays[0]))
+        self.assertFalse(cache.getitem(2, 0, out))
+        # Item 1 is the least recently used one now
+        self.assertTrue(cache.setitem(1, 4, arrays[4]))
+        self.assertFalse(cache.getitem(1, 1, out))
+        for i in [0, 2, 3, 4]:
+            self.assertTrue(cache.getitem(1, i, out))
+            self.assertTrue(allequal(out, arrays[i]))
+        self.assertEqual((cache.hits, cache.misses), (5, 2))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertFalse(cache.setitem(1, 5, numpy.arange(1000)))
+            self.assertFalse(cache.setitem(1, 6, numpy.arange(1000)))
+        self.assertEqual(cache.oversized, 2)
+        self.assertEqual([w.category for w in caught], [PerformanceWarning])
+
+        # The geometry of an existing cache is kept
+        cache2 = tables.lrucacheextension.SharedCache(path, 1 << 20, 64)
+        self.assertEqual((cache2.nsets, cache2.setsize), (1, 4096))
+        self.assertTrue(cache2.getitem(1, 4, out))
+        self.assertTrue(allequal(out, arrays[4]))
+
+    def test00b_sizes(self):
+        """Items only take the bytes they need."""
+
+        path = self.cachename + '-small'
+        cache = tables.lrucacheextension.SharedCache(path, 4096, 4096,
+                                                     nways=64)
+        arrays = [numpy.arange(i, i + 8) for i in range(50)]
+        for i, array in enumerate(arrays):
+            self.assertTrue(cache.setitem(1, i, array))
+        self.assertEqual(cache.nitems, 50)
+        out = numpy.empty(8, dtype=arrays[0].dtype)
+        for i, array in enumerate(arrays):
+            self.assertTrue(cache.getitem(1, i, out))
+            self.assertTrue(allequal(out, array))
+
+        # Free bytes are compacted to make room for larger items
+        cache = tables.lrucacheextension.SharedCache(path + '2', 4096, 4096)
+        try:
+            arrays = [numpy.arange(i, i + 125) for i in range(4)]
+            for i, array in enumerate(arrays):
+                self.assertTrue(cache.setitem(1, i, array))
+            out = numpy.empty(125, dtype=arrays[0].dtype)
+            for i in [0, 2]:
+                self.assertTrue(cache.getitem(1, i, out))
+            large = numpy.arange(1000, 1200)
+            self.assertTrue(cache.setitem(1, 4, large))
+            for i in [1, 3]:
+                self.assertFalse(cache.getitem(1, i, out))
+            for i in [0, 2]:
+                self.assertTrue(cache.getitem(1, i, out))
+                self.assertTrue(allequal(out, arrays[i]))
+            out = numpy.empty_like(large)
+            self.assertTrue(cache.getitem(1, 4, out))
+            self.assertTrue(allequal(out, large))
+        finally:
+            os.remove(path + '2')
+
+    def test01_handles(self):
+        """Handles of the same file share the cached data."""
+
+        cache = self.h5file._v_shared_cache
+        self.assertTrue(cache is not None)
+        self.check_queries(self.h5file)
+        self.assertTrue(cache.misses > 0)
+        hits, misses = cache.hits, cache.misses
+        h5file2 = tables.open_file(self.h5fname, **self.open_kwargs)
+        try:
+            self.assertTrue(h5file2._v_shared_cache is cache)
+            self.check_queries(h5file2)
+        finally:
+            h5file2.close()
+        self.assertEqual(cache.misses, misses)
+        self.assertTrue(cache.hits > hits)
+
+    def test02_processes(self):
+        """Processes share the cached data."""
+
+        script = ("import tables\n"
+                  "h5file = tables.open_file(%r, **%r)\n"
+                  "for condition in %r:\n"
+                  "    h5file.root.table.get_where_list(condition)\n"
+                  "h5file.close()\n" % (
+                      self.h5fname, self.open_kwargs, self.conditions))
+        subprocess.check_call([sys.executable, '-c', script])
+        cache = self.h5file._v_shared_cache
+        self.check_queries(self.h5file)
+        self.assertEqual(cache.misses, 0)
+        self.assertTrue(cache.hits > 0)
+
+    def test03_writable(self):
+        """Writable files do not use the shared cache."""
+
+        self._reopen(mode='a', **self.open_kwargs)
+        self.assertTrue(self.h5file._v_shared_cache is None)
+        self.check_queries(self.h5file)
+
+
 def suite():
     theSuite = unittest.TestSuite()
 
@@ -2693,6 +3088,11 @@ def suite():
         theSuite.addTest(unittest.makeSuite(Issue119Time32ColTestCase))
         theSuite.addTest(unittest.makeSuite(Issue119Time64ColTestCase))
         theSuite.addTest(unittest.makeSuite(TestIndexingNans))
+        theSuite.addTest(unittest.makeSuite(ParallelIndexTestCase))
+        theSuite.addTest(unittest.makeSuite(IndexDeltaTestCase))
+        theSuite.addTest(unittest.makeSuite(IndexDeltaUltraLightTestCase))
+        theSuite.addTest(unittest.makeSuite(IndexDeltaFullTestCase))
+        theSuite.addTest(unittest.makeSuite(SharedCacheTestCase))
     if heavy:
         # These are too heavy for normal testing
         theSuite.addTest(unittest.makeSuite(AI4bTestCase))
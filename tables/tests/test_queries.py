@@ -15,10 +15,13 @@ from __future__ import absolute_import
 
 import re
 import sys
+import time
 import types
 import functools
+import threading
 
 import numpy
+import numexpr
 
 import tables
 from tables.utils import SizeType
@@ -763,6 +766,477 @@ class MDTableUsageTestCase(MDTableMixin, BaseTableUsageTestCase):
         self.assertRaises(NotImplementedError, self.table.where, 'c_bool')
 
 
+class ParallelQueryTestCase(common.TempFileMixin, TestCase):
+    """Test case for in-kernel queries evaluated by several threads."""
+
+    nrows = 1000
+    open_kwargs = {'max_query_threads': 4, 'io_buffer_size': 1024,
+                   'max_numexpr_threads': 1, 'max_blosc_threads': 1}
+
+    def setUp(self):
+        # Leave room for the workers whatever the cores of the machine.
+        self.detect_number_of_cores = tables.table.detect_number_of_cores
+        tables.table.detect_number_of_cores = lambda: 8
+        super(ParallelQueryTestCase, self).setUp()
+        description = {'c_int': tables.Int32Col(pos=0),
+                       'c_float': tables.Float64Col(pos=1)}
+        self.table = self.h5file.create_table('/', 'table', description,
+                                              chunkshape=16)
+        rows = [(i, i * 0.5) for i in range(self.nrows)]
+        self.table.append(rows)
+        self.table.flush()
+
+    def check_queries(self, condition, condvars=None, **kwargs):
+        table = self.table
+        params = self.h5file.params
+        params['MAX_QUERY_THREADS'] = 1
+        ref_list = table.get_where_list(condition, condvars, **kwargs)
+        ref_rows = table.read_where(condition, condvars, **kwargs)
+        ref_iter = [r['c_int'] for r in
+                    table.where(condition, condvars, **kwargs)]
+        params['MAX_QUERY_THREADS'] = 4
+        self.assertTrue(table.nrowsinbuf < self.nrows)
+        self.assertTrue(numpy.all(
+            table.get_where_list(condition, condvars, **kwargs) == ref_list))
+        self.assertTrue(numpy.all(
+            table.read_where(condition, condvars, **kwargs) == ref_rows))
+        self.assertEqual(
+            [r['c_int'] for r in table.where(condition, condvars, **kwargs)],
+            ref_iter)
+
+    def test00_full_range(self):
+        """Parallel queries over the whole table."""
+
+        self.check_queries('(c_int % 7 == 0) | (c_float > 400)')
+
+    def test01_range(self):
+        """Parallel queries with start, stop and step."""
+
+        self.check_queries('c_int % 3 == 0', start=5, stop=901, step=4)
+
+    def test02_condvars(self):
+        """Parallel queries with user variables."""
+
+        self.check_queries('c_float < limit', {'limit': 123.25,
+                                               'c_float':
+                                               self.table.cols.c_float})
+
+    def test03_no_match(self):
+        """Parallel queries that yield no results."""
+
+        self.check_queries('c_int < 0')
+        self.assertEqual(len(self.table.read_where('c_int < 0')), 0)
+
+    def test04_field(self):
+        """Parallel ``read_where()`` of a single field."""
+
+        result = self.table.read_where('c_int >= 990', field='c_float')
+        self.assertTrue(numpy.all(result == numpy.arange(990, 1000) * 0.5))
+
+    def test05_global_threads(self):
+        """Parallel queries do not change the process-wide thread pools."""
+
+        calls = []
+        set_num_threads = numexpr.set_num_threads
+        numexpr.set_num_threads = lambda n: calls.append(n)
+        try:
+            self.check_queries('c_int % 5 == 0')
+        finally:
+            numexpr.set_num_threads = set_num_threads
+        self.assertEqual(calls, [])
+
+    def tearDown(self):
+        tables.table.detect_number_of_cores = self.detect_number_of_cores
+        super(ParallelQueryTestCase, self).tearDown()
+
+    def test06_thread_budget(self):
+        """The workers do not oversubscribe the cores."""
+
+        table = self.table
+        params = self.h5file.params
+        compiled = table._compile_condition('c_int > 0',
+                                            {'c_int': table.cols.c_int})
+        self.assertEqual(table._get_query_threads(compiled, 0, 1000), 4)
+        params['MAX_NUMEXPR_THREADS'] = 4
+        self.assertEqual(table._get_query_threads(compiled, 0, 1000), 2)
+        params['MAX_BLOSC_THREADS'] = 8
+        self.assertEqual(table._get_query_threads(compiled, 0, 1000), 1)
+        tables.table.detect_number_of_cores = lambda: 1
+        params['MAX_NUMEXPR_THREADS'] = params['MAX_BLOSC_THREADS'] = 1
+        self.assertEqual(table._get_query_threads(compiled, 0, 1000), 1)
+
+    def test07_streaming(self):
+        """Parallel ``where()`` yields rows before evaluating the rest."""
+
+        table = self.table
+        reads = []
+        read_records = table._read_records
+        table._read_records = lambda *args: (reads.append(args[0]) or
+                                             read_records(*args))
+        nthreads = threading.active_count()
+        rows = table.where('c_int % 2 == 0')
+        self.assertEqual(next(rows)['c_int'], 0)
+        # Just a few pieces (and the first rows) have been read yet
+        npieces = -(-self.nrows // table.nrowsinbuf)
+        self.assertTrue(len(reads) <= 6 < npieces, (reads, npieces))
+        self.assertEqual(next(rows)['c_int'], 2)
+        rows.close()
+        self.assertEqual(threading.active_count(), nthreads)
+
+
+class QueryCacheTestCase(common.TempFileMixin, TestCase):
+    """Test case for the persistent cache of query results."""
+
+    nrows = 500
+    open_kwargs = {'query_cache_slots': 2, 'query_cache_write': True}
+
+    def setUp(self):
+        super(QueryCacheTestCase, self).setUp()
+        description = {'c_int': tables.Int32Col(pos=0),
+                       'c_float': tables.Float64Col(pos=1)}
+        self.table = self.h5file.create_table('/', 'table', description)
+        self.table.append([(i, i * 0.5) for i in range(self.nrows)])
+
+    def cached_queries(self):
+        qcgroup = self.table._get_query_cache()
+        if qcgroup is None:
+            return 0
+        return len(qcgroup._v_children)
+
+    def test00_reuse(self):
+        """Cached results are reused after reopening the file."""
+
+        limit = 100
+        ref = self.table.get_where_list('c_int < limit')
+        self.assertEqual(self.cached_queries(), 1)
+        self._reopen(mode='r', query_cache_slots=2)
+        self.table = self.h5file.root.table
+        # Spelling the condition differently does not matter.
+        key, coords = self.table._query_cache_get(
+            '(c_int<limit)', {'c_int': self.table.cols.c_int,
+                              'limit': numpy.asarray(limit)},
+            None, None, None)
+        self.assertTrue(numpy.all(coords == ref))
+        self.assertTrue(numpy.all(
+            self.table.get_where_list('(c_int<limit)') == ref))
+        self.assertTrue(numpy.all(self.table.read_where('c_int < limit') ==
+                                  self.table[:limit]))
+
+    def test01_keys(self):
+        """Different variables and ranges are cached separately."""
+
+        table = self.table
+        self.assertEqual(len(table.get_where_list('c_int < 10')), 10)
+        self.assertEqual(len(table.get_where_list('c_int < 20')), 20)
+        self.assertEqual(
+            len(table.get_where_list('c_int < 20', start=15, stop=100)), 5)
+        # Only the two last queries are kept.
+        self.assertEqual(self.cached_queries(), 2)
+        self.assertEqual(len(table.get_where_list('c_int < 10')), 10)
+
+    def test02_invalidate(self):
+        """Modifying the table drops the cache."""
+
+        table = self.table
+        for modify in [lambda: table.append([(-1, -1.)]),
+                       lambda: table.modify_rows(0, 1, rows=[(-2, -2.)]),
+                       lambda: table.modify_column(1, 2, column=[-3],
+                                                   colname='c_int'),
+                       lambda: table.remove_rows(0, 1)]:
+            ref = list(table.get_where_list('c_int < 0'))
+            self.assertEqual(self.cached_queries(), 1)
+            modify()
+            self.assertEqual(self.cached_queries(), 0)
+            self.assertNotEqual(list(table.get_where_list('c_int < 0')), ref)
+
+    def test03_row_update(self):
+        """Updating rows through ``Row`` objects drops the cache."""
+
+        table = self.table
+        self.assertEqual(len(table.get_where_list('c_int < 0')), 0)
+        for row in table.iterrows(0, 3):
+            row['c_int'] = -1
+            row.update()
+        table.flush()
+        self.assertEqual(self.cached_queries(), 0)
+        self.assertEqual(len(table.get_where_list('c_int < 0')), 3)
+
+    def test04_move_remove(self):
+        """The cache follows the table when moved and goes with it."""
+
+        self.table.get_where_list('c_int < 0')
+        self.h5file.rename_node(self.table, 'table2')
+        self.assertTrue('/_p_qcache_table2' in self.h5file)
+        self.assertEqual(self.cached_queries(), 1)
+        self.table.remove()
+        self.assertFalse('/_p_qcache_table2' in self.h5file)
+
+    def test05_no_write(self):
+        """Queries do not write to the file unless asked to."""
+
+        ref = self.table.get_where_list('c_int < 10')
+        self._reopen(mode='a', query_cache_slots=2)
+        self.table = self.h5file.root.table
+        # Existing results are still used...
+        self.assertTrue(numpy.all(
+            self.table.get_where_list('c_int < 10') == ref))
+        # ...but new ones are not saved
+        self.assertEqual(len(self.table.get_where_list('c_int < 20')), 20)
+        self.assertEqual(self.cached_queries(), 1)
+
+    def test06_foreign_change(self):
+        """Tables changed without PyTables knowing ignore their cache."""
+
+        table = self.table
+        self.assertEqual(len(table.get_where_list('c_int < 10')), 10)
+        self.assertEqual(self.cached_queries(), 1)
+        # Change the table behind the back of the cache in a later second,
+        # keeping the same number of rows
+        time.sleep(1.1)
+        table._g_truncate(self.nrows + 10)
+        table._g_truncate(self.nrows)
+        self.assertEqual(self.cached_queries(), 0)
+        self.assertEqual(len(table.get_where_list('c_int < 10')), 10)
+        self.assertEqual(self.cached_queries(), 1)
+
+
+class ZoneMapTestCase(common.TempFileMixin, TestCase):
+    """Test case for queries on columns with zone maps."""
+
+    nrows = 1000
+    chunkshape = 50
+
+    def setUp(self):
+        super(ZoneMapTestCase, self).setUp()
+        description = {'c_int': tables.Int32Col(pos=0),
+                       'c_float': tables.Float64Col(pos=1),
+                       'c_bool': tables.BoolCol(pos=2),
+                       'c_string': tables.StringCol(4, pos=3),
+                       'c_complex': tables.ComplexCol(16, pos=4)}
+        self.table = self.h5file.create_table('/', 'table', description,
+                                              chunkshape=self.chunkshape)
+        rows = [(i, i * 0.5 if i % 300 else numpy.nan, i < 100,
+                 str(i // 100).encode('ascii'), 0)
+                for i in range(self.nrows)]
+        self.table.append(rows)
+        for colname in ['c_int', 'c_float', 'c_bool', 'c_string']:
+            self.table.colinstances[colname].create_zonemap()
+
+    def check_query(self, condition):
+        table = self.table
+        result = table.get_where_list(condition)
+        table._disable_indexing_in_queries()
+        try:
+            expected = table.get_where_list(condition)
+        finally:
+            table._enable_indexing_in_queries()
+        self.assertTrue(numpy.all(result == expected))
+
+    def test00_queries(self):
+        """Queries on zone-mapped columns give the right results."""
+
+        for condition in ['c_int < 120', '(c_int >= 333) & (c_int < 340)',
+                          'c_int == 999', '(c_int < 20) | (c_int > 950)',
+                          '~(c_float < 400)', 'c_float > 200',
+                          'c_bool', '~c_bool', 'c_string == b"7"',
+                          '(c_string > b"2") & (c_int % 3 == 0)']:
+            self.assertTrue(self.table.will_query_use_indexing(condition),
+                            condition)
+            self.check_query(condition)
+
+    def test01_chunkmap(self):
+        """Zone maps select the chunks which may fulfill a condition."""
+
+        zmgroup = self.table._get_zonemaps()
+        nchunks = self.nrows // self.chunkshape
+        chunkmap = zmgroup.get_chunkmap('c_int', ('ge', 'lt'), (120, 260),
+                                        nchunks, self.table.coldtypes['c_int'])
+        self.assertEqual(list(numpy.where(chunkmap)[0]), [2, 3, 4, 5])
+        # Chunks with NaNs are always selected.
+        chunkmap = zmgroup.get_chunkmap('c_float', ('gt',), (1000,),
+                                        nchunks,
+                                        self.table.coldtypes['c_float'])
+        self.assertEqual(list(numpy.where(chunkmap)[0]), [0, 6, 12, 18])
+
+    def test02_maintenance(self):
+        """Zone maps are kept up to date when modifying the table."""
+
+        table = self.table
+        table.append([(-1, -1, False, b'z', 0)] * 10)
+        table.modify_column(0, 1, column=[5000], colname='c_int')
+        table.modify_rows(10, 11, rows=[(-2, 0, True, b'y', 0)])
+        table.modify_coordinates([500], [(-3, 0, True, b'x', 0)])
+        for row in table.iterrows(900, 901):
+            row['c_int'] = -4
+            row.update()
+        table.flush()
+        for condition in ['c_int < 0', 'c_int > 1000',
+                          'c_string > b"9"', 'c_bool & (c_int > 400)']:
+            self.check_query(condition)
+        table.remove_rows(30, 330)
+        self.assertEqual(table._get_zonemaps().nzones,
+                         int(numpy.ceil(table.nrows / float(self.chunkshape))))
+        for condition in ['c_int < 0', '(c_int > 300) & (c_int < 340)']:
+            self.check_query(condition)
+
+    def test03_persistence(self):
+        """Zone maps are kept in the file and follow their table."""
+
+        self._reopen(mode='a')
+        table = self.h5file.root.table
+        self.assertTrue(table.cols.c_int.has_zonemap)
+        self.assertFalse(table.cols.c_complex.has_zonemap)
+        self.h5file.rename_node(table, 'table2')
+        self.assertTrue('/_p_zonemap_table2' in self.h5file)
+        self.table = table
+        self.check_query('c_int < 120')
+        table.cols.c_int.remove_zonemap()
+        self.assertFalse(table.cols.c_int.has_zonemap)
+        self.assertEqual(table.will_query_use_indexing('c_int < 120'),
+                         frozenset())
+        table.remove()
+        self.assertFalse('/_p_zonemap_table2' in self.h5file)
+
+    def test04_unsupported(self):
+        """Zone maps can not be created for unordered types."""
+
+        self.assertRaises(TypeError,
+                          self.table.cols.c_complex.create_zonemap)
+
+
+class BloomIndexTestCase(common.TempFileMixin, TestCase):
+    """Test case for queries on columns with Bloom filters."""
+
+    nrows = 2000
+    chunkshape = 100
+
+    def setUp(self):
+        super(BloomIndexTestCase, self).setUp()
+        description = {'c_id': tables.Int64Col(pos=0),
+                       'c_key': tables.StringCol(8, pos=1),
+                       'c_float': tables.Float64Col(pos=2),
+                       'c_bool': tables.BoolCol(pos=3)}
+        self.table = self.h5file.create_table('/', 'table', description,
+                                              chunkshape=self.chunkshape)
+        # Unclustered, high-cardinality values
+        ids = numpy.random.RandomState(0).permutation(self.nrows) * 7
+        rows = [(i, ('k%d' % i).encode('ascii'), i / 4., i % 2)
+                for i in ids]
+        self.ids = ids
+        self.table.append(rows)
+        for colname in ['c_id', 'c_key', 'c_float']:
+            self.table.colinstances[colname].create_index(kind='bloom')
+
+    def check_query(self, condition, condvars=None):
+        table = self.table
+        result = table.get_where_list(condition, condvars)
+        table._disable_indexing_in_queries()
+        try:
+            expected = table.get_where_list(condition, condvars)
+        finally:
+            table._enable_indexing_in_queries()
+        self.assertTrue(numpy.all(result == expected), condition)
+        return result
+
+    def test00_queries(self):
+        """Queries on columns with Bloom filters give the right results."""
+
+        for condition in ['c_id == 700', 'c_id == 701',
+                          '(c_id == 7) | (c_id == 14000)',
+                          'c_key == b"k350"', 'c_key == b"missing"',
+                          'c_float == 17.5', '(c_id == 70) & c_bool']:
+            self.assertTrue(self.table.will_query_use_indexing(condition),
+                            condition)
+            self.check_query(condition)
+        self.assertEqual(len(self.check_query('c_id == v', {'v': 700})), 1)
+        self.assertEqual(len(self.check_query('c_id == 7.5')), 0)
+        self.assertIsNone(self.table.cols.c_id.index)
+        self.assertFalse(self.table.cols.c_id.has_zonemap)
+
+    def test01_chunkmap(self):
+        """Bloom filters select few chunks for equality lookups."""
+
+        zmgroup = self.table._get_zonemaps()
+        nchunks = self.nrows // self.chunkshape
+        dtype = self.table.coldtypes['c_id']
+        value = self.ids[1234]
+        chunkmap = zmgroup.get_chunkmap('c_id', ('eq',), (value,),
+                                        nchunks, dtype)
+        self.assertTrue(chunkmap[1234 // self.chunkshape])
+        self.assertTrue(chunkmap.sum() <= 3)
+        # Bloom filters are not used for ranges.
+        chunkmap = zmgroup.get_chunkmap('c_id', ('lt',), (value,),
+                                        nchunks, dtype)
+        self.assertTrue(chunkmap.all())
+
+    def test02_maintenance(self):
+        """Bloom filters are kept up to date when modifying the table."""
+
+        table = self.table
+        table.append([(-1, b'new', -1, False)] * 10)
+        table.modify_column(0, 1, column=[-2], colname='c_id')
+        table.modify_coordinates([500], [(-3, b'mod', 0, True)])
+        for row in table.iterrows(900, 901):
+            row['c_key'] = b'upd'
+            row.update()
+        table.flush()
+        for condition in ['c_id == -1', 'c_id == -2', 'c_id == -3',
+                          'c_key == b"mod"', 'c_key == b"upd"',
+                          'c_id == %d' % self.ids[1]]:
+            self.assertEqual(len(self.check_query(condition)),
+                             10 if condition == 'c_id == -1' else 1)
+        table.remove_rows(30, 330)
+        self.check_query('c_id == %d' % self.ids[1000])
+
+    def test03_remove(self):
+        """Bloom filters are removed with the index of their column."""
+
+        table = self.table
+        table.cols.c_id.create_zonemap()
+        table.cols.c_id.remove_index()
+        self.assertTrue(table.cols.c_id.has_zonemap)
+        self.assertTrue(table.will_query_use_indexing('c_id == 7'))
+        table.cols.c_id.remove_zonemap()
+        self.assertEqual(table.will_query_use_indexing('c_id == 7'),
+                         frozenset())
+        table.cols.c_key.remove_index()
+        table.cols.c_float.remove_index()
+        self.assertFalse('/_p_zonemap_table' in self.h5file)
+
+    def test04_unsupported(self):
+        """Bloom filters can not be created for unsupported types."""
+
+        self.assertRaises(TypeError, self.table.cols.c_bool.create_index,
+                          kind='bloom')
+        # Conditions can not use 64-bit unsigned integer columns
+        table = self.h5file.create_table('/', 'table2',
+                                         {'c_uint': tables.UInt64Col()},
+                                         chunkshape=self.chunkshape)
+        table.append([(i,) for i in range(10)])
+        self.assertRaises(TypeError, table.cols.c_uint.create_index,
+                          kind='bloom')
+        self.assertFalse('/_p_zonemap_table2' in self.h5file)
+
+    def test05_ranges(self):
+        """Bloom filters are only used for equality comparisons."""
+
+        table = self.table
+        for condition in ['c_id < 70', '(c_id > 100) & (c_id < 5000)',
+                          '(c_id == 7) | (c_id > 14000)', '~(c_id == 7)',
+                          'c_float >= 17.5']:
+            self.assertEqual(table.will_query_use_indexing(condition),
+                             frozenset(), condition)
+            self.check_query(condition)
+        self.assertEqual(
+            table.will_query_use_indexing('(c_id == 7) & (c_float > 1)'),
+            frozenset(['c_id']))
+        # Zone maps do support ranges.
+        table.cols.c_id.create_zonemap()
+        self.assertEqual(
+            table.will_query_use_indexing('(c_id > 100) & (c_id < 5000)'),
+            frozenset(['c_id']))
+
+
 class IndexedTableUsage(ScalarTableMixin, BaseTableUsageTestCase):
     """Test case for query usage on indexed tables.
 
@@ -1235,6 +1709,10 @@ def suite():
         # Tests on query usage.
         testSuite.addTest(unittest.makeSuite(ScalarTableUsageTestCase))
         testSuite.addTest(unittest.makeSuite(MDTableUsageTestCase))
+        testSuite.addTest(unittest.makeSuite(ParallelQueryTestCase))
+        testSuite.addTest(unittest.makeSuite(QueryCacheTestCase))
+        testSuite.addTest(unittest.makeSuite(ZoneMapTestCase))
+        testSuite.addTest(unittest.makeSuite(BloomIndexTestCase))
         testSuite.addTest(unittest.makeSuite(IndexedTableUsage1))
         testSuite.addTest(unittest.makeSuite(IndexedTableUsage2))
         testSuite.addTest(unittest.makeSuite(IndexedTableUsage3))
@@ -1501,6 +1501,73 @@ class BasicTestCase(common.TempFileMixin, TestCase):
         self.assertEqual(table.shape, (outnrows,))
         self.assertEqual(len(result2), outnrows)
 
+    def test04f_delete_mask(self):
+        """Checking whether a boolean mask of rows is deleted."""
+
+        self.h5file = tables.open_file(self.h5fname, "a")
+        table = self.h5file.get_node("/table0")
+        result = table.read()
+        table.nrowsinbuf = 4  # small value of the buffer
+        mask = result['var2'] % 3 == 1
+        self.assertEqual(table.remove_rows(coords=mask), mask.sum())
+        self.assertTrue(common.areArraysEqual(table.read(), result[~mask]))
+
+        self._reopen()
+        table = self.h5file.get_node("/table0")
+        self.assertEqual(table.nrows, len(result) - mask.sum())
+        self.assertTrue(common.areArraysEqual(table.read(), result[~mask]))
+
+    def test04g_delete_coords(self):
+        """Checking whether a list of rows is deleted."""
+
+        self.h5file = tables.open_file(self.h5fname, "a")
+        table = self.h5file.get_node("/table0")
+        result = table.read()
+        nrows = table.nrows
+        table.nrowsinbuf = 4  # small value of the buffer
+        coords = [nrows - 1, 7, 3, 7, -2]
+        self.assertEqual(table.remove_rows(coords=coords), 4)
+        kept = [i for i in range(nrows) if i not in (3, 7, nrows - 2, nrows - 1)]
+        self.assertTrue(common.areArraysEqual(table.read(), result[kept]))
+        self.assertEqual(table.remove_rows(coords=[]), 0)
+        self.assertEqual(table.nrows, nrows - 4)
+        self.assertRaises(IndexError, table.remove_rows, coords=[nrows])
+        self.assertRaises(ValueError, table.remove_rows, 0, coords=[0])
+
+    def test04h_delete_where(self):
+        """Checking whether the rows fulfilling a condition are deleted."""
+
+        self.h5file = tables.open_file(self.h5fname, "a")
+        table = self.h5file.get_node("/table0")
+        result = table.read()
+        table.nrowsinbuf = 4  # small value of the buffer
+        low = 10
+        mask = (result['var2'] % 3 == 1) | (result['var2'] < low)
+        self.assertEqual(table.remove_where('(var2 % 3 == 1) | (var2 < low)'),
+                         mask.sum())
+        self.assertTrue(common.areArraysEqual(table.read(), result[~mask]))
+        self.assertEqual(table.remove_where('var2 < 0'), 0)
+
+        self._reopen()
+        table = self.h5file.get_node("/table0")
+        self.assertEqual(table.nrows, len(result) - mask.sum())
+        self.assertTrue(common.areArraysEqual(table.read(), result[~mask]))
+
+    def test04i_delete_where_range(self):
+        """Checking whether rows fulfilling a condition in a range are
+        deleted."""
+
+        self.h5file = tables.open_file(self.h5fname, "a")
+        table = self.h5file.get_node("/table0")
+        result = table.read()
+        nrows = table.nrows
+        table.nrowsinbuf = 4  # small value of the buffer
+        mask = np.zeros(nrows, dtype=bool)
+        mask[5:nrows - 5:2] = result['var2'][5:nrows - 5:2] % 2 == 0
+        self.assertEqual(table.remove_where('var2 % 2 == 0', None,
+                                           5, nrows - 5, 2), mask.sum())
+        self.assertTrue(common.areArraysEqual(table.read(), result[~mask]))
+
     def test05_filtersTable(self):
         """Checking tablefilters."""
 
@@ -3711,6 +3778,206 @@ class UpdateRowTestCase4(UpdateRowTestCase):
     buffersize = 1000
 
 
+class ScatterUpdateTestCase(common.TempFileMixin, TestCase):
+    """Tests for scattered updates of rows grouped by chunk."""
+
+    filters = None
+    nrows = 1000
+    ncoords = 50
+    chunkshape = (32,)
+
+    def setUp(self):
+        super(ScatterUpdateTestCase, self).setUp()
+        self.table = self.h5file.create_table(
+            '/', 'table', {'c_int': tables.Int32Col(),
+                           'c_arr': tables.Float64Col(shape=(2,))},
+            filters=self.filters, chunkshape=self.chunkshape)
+        self.table.nrowsinbuf = 100
+        rows = np.empty(self.nrows, dtype=self.table.dtype)
+        rows['c_int'] = np.arange(self.nrows)
+        rows['c_arr'][:, 0] = rows['c_int']
+        rows['c_arr'][:, 1] = -rows['c_int']
+        self.table.append(rows)
+        self.expected = self.table.read()
+        random = np.random.RandomState(1)
+        self.coords = random.randint(0, self.nrows, self.ncoords)
+        # Make sure that the last of the repeated coordinates is kept
+        self.coords[-1] = self.coords[0]
+
+    def check(self):
+        if self.reopen:
+            self._reopen()
+            self.table = self.h5file.root.table
+        self.assertTrue(areArraysEqual(self.table.read(), self.expected))
+
+    def test00_modify_coordinates(self):
+        """Modifying scattered rows with Table.modify_coordinates()"""
+
+        rows = np.empty(self.ncoords, dtype=self.expected.dtype)
+        rows['c_int'] = -np.arange(self.ncoords)
+        rows['c_arr'] = np.arange(2 * self.ncoords).reshape(-1, 2)
+        nmod = self.table.modify_coordinates(self.coords, rows)
+        self.assertEqual(nmod, self.ncoords)
+        self.expected[self.coords] = rows
+        self.check()
+
+    def test01_column_setitem(self):
+        """Modifying scattered rows with Column.__setitem__()"""
+
+        cols = self.table.cols
+        values = -np.arange(self.ncoords)
+        cols.c_int[self.coords] = values
+        cols.c_arr[list(self.coords)] = 42
+        self.expected['c_int'][self.coords] = values
+        self.expected['c_arr'][self.coords] = 42
+        self.check()
+
+    def test02_column_setitem_mask(self):
+        """Modifying rows with Column.__setitem__() and a boolean mask"""
+
+        mask = np.zeros(self.nrows, dtype=bool)
+        mask[self.coords] = True
+        self.table.cols.c_int[mask] = -1
+        self.expected['c_int'][mask] = -1
+        self.check()
+
+    def test03_column_setitem_error(self):
+        """Modifying rows with Column.__setitem__() and bad values"""
+
+        cols = self.table.cols
+        self.assertRaises(ValueError, cols.c_int.__setitem__,
+                          self.coords, range(self.ncoords + 1))
+        self.assertRaises(IndexError, cols.c_int.__setitem__,
+                          [self.nrows], 0)
+        self.assertRaises(ValueError, cols.c_int.__setitem__, 1.5, 0)
+        self.check()
+
+    def test04_row_update(self):
+        """Modifying scattered rows with Row.update()"""
+
+        selected = set(self.coords)
+        for row in self.table:
+            if row.nrow in selected:
+                row['c_int'] = -row['c_int']
+                row.update()
+        self.table.flush()
+        coords = sorted(selected)
+        self.expected['c_int'][coords] *= -1
+        self.check()
+
+
+class ScatterUpdateTestCase1(ScatterUpdateTestCase):
+    reopen = 0
+    ncoords = 200
+
+
+class ScatterUpdateTestCase2(ScatterUpdateTestCase):
+    reopen = 1
+    filters = tables.Filters(complevel=1)
+
+
+class ScatterUpdateTestCase3(ScatterUpdateTestCase):
+    reopen = 0
+    filters = tables.Filters(complevel=1)
+    ncoords = 1000
+
+
+class ScatterUpdateTestCase4(ScatterUpdateTestCase):
+    reopen = 1
+    ncoords = 5
+
+
+class GroupedReadTestCase(common.TempFileMixin, TestCase):
+    """Tests for reads of scattered rows grouped by chunk."""
+
+    filters = None
+    nrows = 1000
+    ncoords = 50
+    chunkshape = (32,)
+    nrowsinbuf = 100
+
+    def setUp(self):
+        super(GroupedReadTestCase, self).setUp()
+        self.table = self.h5file.create_table(
+            '/', 'table', {'c_int': tables.Int32Col(),
+                           'c_arr': tables.Float64Col(shape=(2,))},
+            filters=self.filters, chunkshape=self.chunkshape)
+        self.table.nrowsinbuf = self.nrowsinbuf
+        random = np.random.RandomState(2)
+        rows = np.empty(self.nrows, dtype=self.table.dtype)
+        rows['c_int'] = random.permutation(self.nrows)
+        rows['c_arr'][:, 0] = np.arange(self.nrows)
+        rows['c_arr'][:, 1] = -rows['c_int']
+        self.table.append(rows)
+        self.expected = rows
+        self.coords = random.randint(0, self.nrows, self.ncoords)
+        self.coords[-1] = self.coords[0]
+
+    def test00_read_coordinates(self):
+        """Reading unsorted rows with Table.read_coordinates()"""
+
+        rows = self.table.read_coordinates(self.coords)
+        self.assertTrue(areArraysEqual(rows, self.expected[self.coords]))
+
+    def test01_read_coordinates_field(self):
+        """Reading unsorted rows of a field with read_coordinates()"""
+
+        values = self.table.read_coordinates(self.coords, 'c_arr')
+        self.assertTrue(areArraysEqual(values,
+                                       self.expected['c_arr'][self.coords]))
+
+    def test02_getitem_mask(self):
+        """Reading rows with a boolean mask"""
+
+        mask = np.zeros(self.nrows, dtype=bool)
+        mask[self.coords] = True
+        rows = self.table[mask]
+        self.assertTrue(areArraysEqual(rows, self.expected[mask]))
+
+    def test03_itersequence(self):
+        """Iterating over unsorted rows with Table.itersequence()"""
+
+        values = [(row.nrow, row['c_int'])
+                  for row in self.table.itersequence(self.coords)]
+        self.assertEqual(values,
+                         [(coord, self.expected['c_int'][coord])
+                          for coord in self.coords])
+
+    def test04_read_sorted(self):
+        """Reading rows sorted by a column with Table.read_sorted()"""
+
+        self.table.cols.c_int.create_index(kind='full')
+        rows = self.table.read_sorted('c_int')
+        order = np.argsort(self.expected['c_int'])
+        self.assertTrue(areArraysEqual(rows, self.expected[order]))
+
+    def test05_out_of_bounds(self):
+        """Reading rows past the end of the table"""
+
+        coords = [5, self.nrows + 50]
+        self.assertRaises(IndexError, self.table.read_coordinates, coords)
+        self.assertRaises(IndexError, list, self.table.itersequence(coords))
+        self.assertEqual(len(self.table.read_coordinates([-1])), 1)
+
+
+class GroupedReadTestCase1(GroupedReadTestCase):
+    ncoords = 200
+
+
+class GroupedReadTestCase2(GroupedReadTestCase):
+    filters = tables.Filters(complevel=1)
+
+
+class GroupedReadTestCase3(GroupedReadTestCase):
+    filters = tables.Filters(complevel=1, fletcher32=True)
+    ncoords = 1000
+    nrowsinbuf = 10
+
+
+class GroupedReadTestCase4(GroupedReadTestCase):
+    ncoords = 5
+
+
 class RecArrayIO(common.TempFileMixin, TestCase):
     def test00(self):
         """Checking saving a regular recarray"""
@@ -6214,6 +6481,154 @@ class ColumnIterationTestCase(common.TempFileMixin, TestCase):
         self.iterate(array, table)
 
 
+class PrefetchIterTestCase(common.TempFileMixin, TestCase):
+    """Tests for row iterators with a read-ahead thread."""
+
+    nrows = 2000
+
+    def setUp(self):
+        super(PrefetchIterTestCase, self).setUp()
+        self.h5file.create_table(
+            '/', 'table', {'c1': Int32Col(), 'c2': Float64Col()},
+            filters=tables.Filters(complevel=1), chunkshape=32).append(
+                [(i, i * 2.) for i in range(self.nrows)])
+        # Background reads are only done in thread-safe files
+        self._reopen(thread_safe=True)
+        self.h5file.root.table.nrowsinbuf = 100
+
+    def test00_ranges(self):
+        """Prefetching iterators return the same rows than regular ones."""
+
+        table = self.h5file.root.table
+        nrows = self.nrows
+        for start, stop, step in [(None, None, None), (3, nrows - 7, 1),
+                                  (10, nrows, 7), (0, nrows, 150),
+                                  (5, nrows, 1001), (nrows - 3, nrows, 1)]:
+            rows1 = [row.fetch_all_fields() for row in
+                     table.iterrows(start, stop, step)]
+            rows2 = [row.fetch_all_fields() for row in
+                     table.iterrows(start, stop, step, prefetch=True)]
+            self.assertEqual(rows1, rows2)
+
+    def test01_break(self):
+        """Leaving a prefetching iterator with ``break``."""
+
+        table = self.h5file.root.table
+        for row in table.iterrows(prefetch=True):
+            if row.nrow == 150:
+                break
+        # No read is left in flight
+        self.assertEqual(len(table._prefetchers), 0)
+        self.assertEqual(row['c1'], 150)
+        self.assertEqual(table.read(self.nrows - 1)['c1'].tolist(),
+                         [self.nrows - 1])
+
+    def test01b_close(self):
+        """Closing a prefetching iterator or the file before its end."""
+
+        table = self.h5file.root.table
+        rows = table.iterrows(prefetch=True)
+        self.assertEqual(next(rows)['c1'], 0)
+        self.assertEqual(len(table._prefetchers), 1)
+        rows.close()
+        self.assertEqual(len(table._prefetchers), 0)
+        rows = table.iterrows(prefetch=True)
+        self.assertEqual(next(rows)['c1'], 0)
+        self._reopen()
+        table = self.h5file.root.table
+        self.assertEqual(table.nrows, self.nrows)
+
+    def test02_io(self):
+        """Doing I/O in the body of a prefetching loop."""
+
+        table = self.h5file.root.table
+        c2 = []
+        for row in table.iterrows(step=3, prefetch=True):
+            self.assertEqual(len(table._prefetchers), 1)
+            nrow = self.nrows - 1 - row.nrow
+            c2.append(table.read(nrow, nrow + 1, field='c2')[0])
+            self.assertEqual(row['c1'], row.nrow)
+        self.assertEqual(len(table._prefetchers), 0)
+        self.assertEqual(
+            c2, [(self.nrows - 1 - i) * 2. for i in range(0, self.nrows, 3)])
+
+    def test03_not_thread_safe(self):
+        """Prefetching is ignored for files which are not thread-safe."""
+
+        self._reopen()
+        table = self.h5file.root.table
+        rows = table.iterrows(prefetch=True)
+        self.assertEqual(next(rows)['c1'], 0)
+        self.assertEqual(len(table._prefetchers), 0)
+        self.assertEqual([row['c1'] for row in rows],
+                         list(range(1, self.nrows)))
+
+
+class IterBatchesTestCase(common.TempFileMixin, TestCase):
+    """Tests for the columnar batch iterator of tables."""
+
+    nrows = 1000
+
+    def setUp(self):
+        super(IterBatchesTestCase, self).setUp()
+        self.table = self.h5file.create_table(
+            '/', 'table', {'c1': Int32Col(), 'c2': Float64Col(),
+                           'c3': {'x': Int16Col()}})
+        self.table.append([(i, i * 2., (-i,)) for i in range(self.nrows)])
+
+    def test00_all(self):
+        """Batches cover the whole table in order."""
+
+        c1, c2 = [], []
+        for batch in self.table.iter_batches(batch_rows=64):
+            self.assertEqual(sorted(batch.keys()), ['c1', 'c2', 'c3'])
+            self.assertTrue(len(batch['c1']) <= 64)
+            c1.append(batch['c1'].copy())
+            c2.append(batch['c2'].copy())
+        self.assertTrue(allequal(np.concatenate(c1),
+                                 np.arange(self.nrows, dtype='int32')))
+        self.assertTrue(allequal(np.concatenate(c2),
+                                 np.arange(self.nrows) * 2.))
+
+    def test01_columns_range(self):
+        """Selecting columns and a range of rows."""
+
+        for start, stop, step in [(3, 997, 1), (10, None, 7), (0, 100, 150)]:
+            batches = list(b['c3/x'].copy() for b in self.table.iter_batches(
+                batch_rows=50, columns=['c3/x'],
+                start=start, stop=stop, step=step))
+            expected = -np.arange(self.nrows, dtype='int16')[start:stop:step]
+            self.assertTrue(allequal(np.concatenate(batches), expected))
+
+    def test02_condition(self):
+        """Filtering the rows in batches with a condition."""
+
+        lim = 333
+        result = np.concatenate([
+            b['c1'].copy() for b in self.table.iter_batches(
+                batch_rows=100, columns=['c1'], condition='c2 > 2 * lim')])
+        expected = np.arange(lim + 1, self.nrows, dtype='int32')
+        self.assertTrue(allequal(result, expected))
+
+    def test03_errors(self):
+        """Wrong arguments raise at call time."""
+
+        self.assertRaises(ValueError, self.table.iter_batches, batch_rows=0)
+        self.assertRaises(KeyError, self.table.iter_batches,
+                          columns=['c4'])
+        self.assertRaises(ValueError, self.table.iter_batches, step=-1)
+
+    def test04_reused_buffers(self):
+        """Batches are copied into the same column buffers."""
+
+        addresses = set()
+        for batch in self.table.iter_batches(batch_rows=100,
+                                             condition='c1 % 3 == 0'):
+            addresses.add(batch['c1'].__array_interface__['data'][0])
+            self.assertTrue((batch['c1'] % 3 == 0).all())
+        self.assertEqual(len(addresses), 1)
+
+
 class TestCreateTableArgs(common.TempFileMixin, TestCase):
     obj = np.array(
         [('aaaa', 1, 2.1), ('bbbb', 2, 3.2)],
@@ -6422,6 +6837,14 @@ def suite():
         theSuite.addTest(unittest.makeSuite(UpdateRowTestCase2))
         theSuite.addTest(unittest.makeSuite(UpdateRowTestCase3))
         theSuite.addTest(unittest.makeSuite(UpdateRowTestCase4))
+        theSuite.addTest(unittest.makeSuite(ScatterUpdateTestCase1))
+        theSuite.addTest(unittest.makeSuite(ScatterUpdateTestCase2))
+        theSuite.addTest(unittest.makeSuite(ScatterUpdateTestCase3))
+        theSuite.addTest(unittest.makeSuite(ScatterUpdateTestCase4))
+        theSuite.addTest(unittest.makeSuite(GroupedReadTestCase1))
+        theSuite.addTest(unittest.makeSuite(GroupedReadTestCase2))
+        theSuite.addTest(unittest.makeSuite(GroupedReadTestCase3))
+        theSuite.addTest(unittest.makeSuite(GroupedReadTestCase4))
         theSuite.addTest(unittest.makeSuite(RecArrayIO1))
         theSuite.addTest(unittest.makeSuite(RecArrayIO2))
         theSuite.addTest(unittest.makeSuite(OpenCopyTestCase))
@@ -6457,6 +6880,8 @@ def suite():
         theSuite.addTest(unittest.makeSuite(RowContainsTestCase))
         theSuite.addTest(unittest.makeSuite(AccessClosedTestCase))
         theSuite.addTest(unittest.makeSuite(ColumnIterationTestCase))
+        theSuite.addTest(unittest.makeSuite(PrefetchIterTestCase))
+        theSuite.addTest(unittest.makeSuite(IterBatchesTestCase))
         theSuite.addTest(unittest.makeSuite(TestCreateTableArgs))
 
     if common.heavy:
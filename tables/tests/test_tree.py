@@ -770,6 +770,113 @@ class WideTreeTestCase(common.TempFileMixin, TestCase):
             print()  # This flush the stdout buffer
 
 
+class LazyChildrenTestCase(common.TempFileMixin, TestCase):
+    """Checks that children of groups are only listed when needed."""
+
+    nchildren = 51
+
+    def setUp(self):
+        super(LazyChildrenTestCase, self).setUp()
+        runs = self.h5file.create_group('/', 'runs')
+        for i in range(self.nchildren):
+            self.h5file.create_group(runs, 'run_%03d' % i)
+        self.h5file.create_array(runs, 'array', [1, 2])
+        self.h5file.create_soft_link(runs, 'link', '/runs/run_000')
+        self.h5file.create_group(runs, '_p_hidden')
+        self._reopen(mode='a')
+
+    def test00_getNode(self):
+        """Getting a child does not list the children of its parent."""
+
+        node = self.h5file.get_node('/runs/run_012')
+        self.assertEqual(node._v_pathname, '/runs/run_012')
+        self.assertFalse('_v_children' in node._v_parent.__dict__)
+
+    def test01_createNode(self):
+        """Creating a child does not list the children of its parent."""
+
+        runs = self.h5file.root.runs
+        self.h5file.create_group(runs, 'new')
+        self.assertFalse('_v_children' in runs.__dict__)
+        self.assertTrue('new' in runs._v_children)
+        self.assertFalse('_v_groups' in runs.__dict__)
+        self.h5file.create_group(runs, 'new2')
+        self.assertTrue('new2' in runs._v_children)
+        self.assertTrue('new2' in runs._v_groups)
+        self.assertEqual(runs._v_nchildren, self.nchildren + 4)
+
+    def test02_childrenKinds(self):
+        """Listing children in several batches."""
+
+        runs = self.h5file.root.runs
+        # The number of links (54) is a multiple of the batch size.
+        runs._c_names_batch_size = 6
+        groups = set('run_%03d' % i for i in range(self.nchildren))
+        self.assertEqual(set(runs._v_children),
+                         groups | set(['array', 'link']))
+        self.assertEqual(set(runs._v_links), set(['link']))
+        self.assertEqual(set(runs._v_hidden), set(['_p_hidden']))
+        self.assertFalse('_v_groups' in runs.__dict__)
+        self.assertEqual(set(runs._v_groups), groups)
+        self.assertEqual(set(runs._v_leaves), set(['array']))
+        self.assertEqual(set(runs._v_unknown), set())
+        self.assertEqual(
+            sorted(runs.__members__),
+            sorted(groups | set(['array', 'link'])))
+
+    def test03_widthWarning(self):
+        """Warning on too many children without listing them."""
+
+        self.h5file.close()
+        self.h5file = tables.open_file(self.h5fname, 'a', max_group_width=10)
+        runs = self.h5file.root.runs
+        with warnings.catch_warnings(record=True) as warns:
+            warnings.simplefilter('always')
+            self.h5file.create_group(runs, 'new')
+        self.assertTrue(any(issubclass(w.category, tables.PerformanceWarning)
+                            for w in warns))
+        self.assertFalse('_v_children' in runs.__dict__)
+
+    def test04_removeNode(self):
+        """Removing a child before and after listing children."""
+
+        runs = self.h5file.root.runs
+        self.h5file.remove_node('/runs/run_000')
+        self.assertFalse('run_000' in runs._v_children)
+        self.h5file.remove_node('/runs/array')
+        self.assertFalse('array' in runs._v_children)
+        self.assertFalse('array' in runs._v_leaves)
+        self.assertEqual(runs._v_nchildren, self.nchildren)
+
+
+class NamedTypeChildrenTestCase(common.TestFileMixin, TestCase):
+    """Checks that named datatypes are not listed as children."""
+
+    # Created with ``create-named-type.c``.
+    h5fname = common.test_filename('named-type.h5')
+
+    def test00_iterate(self):
+        """Named datatypes are skipped when loading children."""
+
+        root = self.h5file.root
+        self.assertEqual([node._v_name for node in root], ['array', 'group'])
+        self.assertEqual(sorted(root._v_children), ['array', 'group'])
+        self.assertEqual(sorted(root.__members__), ['array', 'group'])
+        self.assertEqual([node._v_pathname for node in self.h5file],
+                         ['/', '/array', '/group'])
+        self.assertEqual(root.group._v_children.values(), [])
+
+    def test01_kinds(self):
+        """Named datatypes are skipped when looking up kinds."""
+
+        root = self.h5file.root
+        self.assertEqual(list(root._v_leaves), ['array'])
+        self.assertEqual(list(root._v_unknown), [])
+        self.assertEqual(sorted(root._v_children), ['array', 'group'])
+        self.assertEqual(list(root.group._v_groups), [])
+        self.assertEqual(root.group._v_nchildren, 0)
+
+
 class HiddenTreeTestCase(common.TempFileMixin, TestCase):
     """Check for hidden groups, leaves and hierarchies."""
 
@@ -1021,6 +1128,8 @@ def suite():
         theSuite.addTest(unittest.makeSuite(TreeTestCase))
         theSuite.addTest(unittest.makeSuite(DeepTreeTestCase))
         theSuite.addTest(unittest.makeSuite(WideTreeTestCase))
+        theSuite.addTest(unittest.makeSuite(LazyChildrenTestCase))
+        theSuite.addTest(unittest.makeSuite(NamedTypeChildrenTestCase))
         theSuite.addTest(unittest.makeSuite(HiddenTreeTestCase))
         theSuite.addTest(unittest.makeSuite(CreateParentsTestCase))
 
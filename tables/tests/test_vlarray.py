@@ -1907,6 +1907,238 @@ class MDTypesNumPyTestCase(MDTypesTestCase):
     title = "MDTypes"
 
 
+class ExtendTestCase(common.TempFileMixin, TestCase):
+    """Tests for VLArray.extend()."""
+
+    def test00_rows(self):
+        """Extending with a sequence of rows."""
+
+        vlarray = self.h5file.create_vlarray('/', 'vlarray', Int32Atom())
+        vlarray.append([1, 2])
+        rows = [[3], [], list(range(10)), numpy.arange(4, dtype='int16')]
+        vlarray.extend(rows)
+        self.assertEqual(vlarray.nrows, 5)
+        self._reopen()
+        vlarray = self.h5file.root.vlarray
+        self.assertEqual(vlarray.nrows, 5)
+        for row, expected in zip(vlarray.read(), [[1, 2]] + rows):
+            self.assertTrue(allequal(row, numpy.array(expected, 'int32')))
+
+    def test01_flat(self):
+        """Extending with flat values and offsets."""
+
+        vlarray = self.h5file.create_vlarray('/', 'vlarray',
+                                             Int32Atom(shape=(2,)))
+        values = numpy.arange(20, dtype='int32').reshape(10, 2)
+        vlarray.extend(values, [0, 3, 3, 10])
+        vlarray.extend(values, [4, 6])
+        self.assertEqual(vlarray.nrows, 4)
+        rows = vlarray.read()
+        self.assertTrue(allequal(rows[0], values[0:3]))
+        self.assertEqual(rows[1].shape, (0, 2))
+        self.assertTrue(allequal(rows[2], values[3:10]))
+        self.assertTrue(allequal(rows[3], values[4:6]))
+
+    def test02_read_flat_roundtrip(self):
+        """Extending with the output of read_flat()."""
+
+        vlarray = self.h5file.create_vlarray('/', 'vlarray', Int32Atom())
+        vlarray.extend([list(range(i)) for i in range(30)])
+        vlarray2 = self.h5file.create_vlarray('/', 'vlarray2', Int32Atom())
+        vlarray2.extend(*vlarray.read_flat())
+        for row, row2 in zip(vlarray.read(), vlarray2.read()):
+            self.assertTrue(allequal(row, row2))
+
+    def test03_pseudo_atoms(self):
+        """Extending arrays of pseudo-atoms."""
+
+        vlarray = self.h5file.create_vlarray('/', 'vlstr', VLStringAtom())
+        vlarray.extend(["abc", "", "de"])
+        self.assertEqual(vlarray.read(), [b"abc", b"", b"de"])
+        vlarray = self.h5file.create_vlarray('/', 'obj', ObjectAtom())
+        vlarray.extend([{'a': 1}, [1, 2], None])
+        self.assertEqual(vlarray.read(), [{'a': 1}, [1, 2], None])
+        self.assertRaises(TypeError, vlarray.extend, b"abc", [0, 3])
+
+    def test04_empty(self):
+        """Extending with no rows."""
+
+        vlarray = self.h5file.create_vlarray('/', 'vlarray', Int32Atom())
+        vlarray.extend([])
+        vlarray.extend([], [0])
+        self.assertEqual(vlarray.nrows, 0)
+
+    def test05_bad_offsets(self):
+        """Checking errors on bad offsets."""
+
+        vlarray = self.h5file.create_vlarray('/', 'vlarray', Int32Atom())
+        values = numpy.arange(10, dtype='int32')
+        self.assertRaises(ValueError, vlarray.extend, values, [])
+        self.assertRaises(ValueError, vlarray.extend, values, [0, 11])
+        self.assertRaises(ValueError, vlarray.extend, values, [-1, 2])
+        self.assertRaises(ValueError, vlarray.extend, values, [0, 5, 3])
+        self.assertEqual(vlarray.nrows, 0)
+
+    def test06_read_only(self):
+        """Extending in a read-only file is not allowed."""
+
+        self.h5file.create_vlarray('/', 'vlarray', Int32Atom())
+        self._reopen()
+        self.assertRaises(tables.FileModeError,
+                          self.h5file.root.vlarray.extend, [[1]])
+
+
+class PagedStorageTestCase(common.TempFileMixin, TestCase):
+    """Tests for VLArrays with paged storage."""
+
+    def setUp(self):
+        super(PagedStorageTestCase, self).setUp()
+        self.rows = [numpy.arange(i % 5, dtype='int32') for i in range(50)]
+        self.filters = tables.Filters(complevel=1, complib='zlib')
+        vlarray = self.h5file.create_vlarray(
+            '/', 'vlarray', Int32Atom(), "paged ragged array",
+            filters=self.filters, chunkshape=16, storage='paged')
+        vlarray.append(self.rows[0])
+        vlarray.extend(self.rows[1:])
+
+    def check_rows(self, rows, expected):
+        self.assertEqual(len(rows), len(expected))
+        for row, row2 in zip(rows, expected):
+            self.assertTrue(allequal(row, row2))
+
+    def test00_attributes(self):
+        """Checking the attributes of a paged vlarray."""
+
+        self._reopen()
+        vlarray = self.h5file.root.vlarray
+        self.assertTrue(isinstance(vlarray, tables.PagedVLArray))
+        self.assertEqual(vlarray.nrows, 50)
+        self.assertEqual(len(vlarray), 50)
+        self.assertEqual(vlarray.shape, (50,))
+        self.assertEqual(vlarray.atom, Int32Atom())
+        self.assertEqual(vlarray.title, "paged ragged array")
+        self.assertEqual(vlarray.filters, self.filters)
+        self.assertEqual(vlarray.chunkshape, (16,))
+        self.assertEqual(vlarray.flavor, 'numpy')
+        self.assertEqual(list(self.h5file.root._v_children), ['vlarray'])
+
+    def test01_read(self):
+        """Reading rows of a paged vlarray."""
+
+        self._reopen()
+        vlarray = self.h5file.root.vlarray
+        self.check_rows(vlarray.read(), self.rows)
+        self.check_rows(vlarray.read(3, 33, 4), self.rows[3:33:4])
+        self.check_rows(vlarray[10:20], self.rows[10:20])
+        self.check_rows(vlarray[[1, 7, -1]],
+                        [self.rows[1], self.rows[7], self.rows[-1]])
+        self.assertTrue(allequal(vlarray[4], self.rows[4]))
+        self.assertTrue(allequal(vlarray[-2], self.rows[-2]))
+        self.assertEqual(vlarray.read(5, 5), [])
+        self.assertRaises(IndexError, vlarray.__getitem__, 50)
+
+    def test02_read_flat(self):
+        """Reading rows of a paged vlarray flat."""
+
+        vlarray = self.h5file.root.vlarray
+        values, offsets = vlarray.read_flat(2, 12, 3)
+        self.check_rows([values[offsets[i]:offsets[i + 1]]
+                         for i in range(len(offsets) - 1)], self.rows[2:12:3])
+
+    def test03_iterrows(self):
+        """Iterating over the rows of a paged vlarray."""
+
+        vlarray = self.h5file.root.vlarray
+        vlarray.nrowsinbuf = 7
+        self.check_rows(list(vlarray), self.rows)
+        nrows = []
+        rows = []
+        for row in vlarray.iterrows(1, 40, 3):
+            nrows.append(vlarray.nrow)
+            rows.append(row)
+        self.assertEqual(nrows, list(range(1, 40, 3)))
+        self.check_rows(rows, self.rows[1:40:3])
+
+    def test04_setitem(self):
+        """Modifying rows of a paged vlarray in place."""
+
+        vlarray = self.h5file.root.vlarray
+        vlarray[4] = [10, 20, 30, 40]
+        vlarray[6:8] = [[5], [6, 7]]
+        self.assertRaises(ValueError, vlarray.__setitem__, 1, [1, 2])
+        self._reopen()
+        vlarray = self.h5file.root.vlarray
+        self.assertEqual(vlarray[4].tolist(), [10, 20, 30, 40])
+        self.assertEqual(vlarray[6].tolist(), [5])
+        self.assertEqual(vlarray[7].tolist(), [6, 7])
+        self.check_rows(vlarray[8:], self.rows[8:])
+
+    def test05_truncate(self):
+        """Truncating a paged vlarray."""
+
+        vlarray = self.h5file.root.vlarray
+        vlarray.truncate(10)
+        self.check_rows(vlarray[:], self.rows[:10])
+        vlarray.append([1, 2])
+        vlarray.truncate(13)
+        self.assertEqual(vlarray.nrows, 13)
+        self.assertEqual([row.tolist() for row in vlarray[10:]],
+                         [[1, 2], [], []])
+
+    def test06_pseudo_atoms(self):
+        """Paged vlarrays of pseudo-atoms."""
+
+        vlarray = self.h5file.create_vlarray('/', 'vlstr', VLStringAtom(),
+                                             storage='paged')
+        vlarray.extend(["abc", "", "de"])
+        vlarray2 = self.h5file.create_vlarray('/', 'obj', ObjectAtom(),
+                                              storage='paged')
+        vlarray2.append({'a': [1, 2]})
+        vlarray2.append(None)
+        self._reopen()
+        self.assertEqual(self.h5file.root.vlstr.read(), [b"abc", b"", b"de"])
+        self.assertEqual(self.h5file.root.obj.read(), [{'a': [1, 2]}, None])
+
+    def test07_copy(self):
+        """Copying a paged vlarray."""
+
+        vlarray = self.h5file.root.vlarray
+        vlarray.attrs.user_attr = 1
+        vlarray2 = vlarray.copy('/', 'vlarray2', filters=tables.Filters())
+        self.assertTrue(isinstance(vlarray2, tables.PagedVLArray))
+        self.assertEqual(vlarray2.filters, tables.Filters())
+        self.assertEqual(vlarray2.attrs.user_attr, 1)
+        self.check_rows(vlarray2.read(), self.rows)
+        vlarray3 = vlarray.copy('/', 'vlarray3', start=3, stop=30, step=2)
+        self.check_rows(vlarray3.read(), self.rows[3:30:2])
+
+    def test08_remove(self):
+        """Removing a paged vlarray."""
+
+        self.h5file.remove_node('/vlarray')
+        self.assertFalse('/vlarray' in self.h5file)
+        self._reopen()
+        self.assertFalse('/vlarray' in self.h5file)
+
+    def test09_undo(self):
+        """Undoing the creation of a paged vlarray."""
+
+        self.h5file.enable_undo()
+        self.h5file.create_vlarray('/', 'other', Int32Atom(),
+                                   storage='paged').append([1])
+        self.h5file.undo()
+        self.assertFalse('/other' in self.h5file)
+        self.h5file.redo()
+        self.assertEqual(self.h5file.root.other.read()[0].tolist(), [1])
+        self.h5file.disable_undo()
+
+    def test10_bad_storage(self):
+        """Checking errors on bad storage values."""
+
+        self.assertRaises(ValueError, self.h5file.create_vlarray,
+                          '/', 'other', Int32Atom(), storage='foo')
+
+
 class AppendShapeTestCase(common.TempFileMixin, TestCase):
     open_mode = "w"
 
@@ -2797,6 +3029,71 @@ class ReadRangeTestCase(common.TempFileMixin, TestCase):
             print("row-->", row)
 
 
+class ReadFlatTestCase(common.TempFileMixin, TestCase):
+    """Tests for VLArray.read_flat()."""
+
+    def setUp(self):
+        super(ReadFlatTestCase, self).setUp()
+        vlarray = self.h5file.create_vlarray('/', 'vlarray', Int32Atom())
+        vlarray2 = self.h5file.create_vlarray('/', 'vlarray2',
+                                              tables.Float64Atom(shape=(2,)))
+        for i in range(20):
+            vlarray.append(list(range(i % 7)))
+            vlarray2.append([[j, -j] for j in range(i % 3)])
+        self._reopen()
+
+    def check_flat(self, vlarray, start=None, stop=None, step=1):
+        values, offsets = vlarray.read_flat(start, stop, step)
+        rows = vlarray.read(start, stop, step)
+        self.assertEqual(offsets.dtype, numpy.int64)
+        self.assertEqual(len(offsets), len(rows) + 1)
+        self.assertEqual(offsets[0], 0)
+        self.assertEqual(offsets[-1], len(values))
+        for i, row in enumerate(rows):
+            self.assertTrue(allequal(values[offsets[i]:offsets[i + 1]], row))
+
+    def test00_all(self):
+        """Reading all the rows flat."""
+
+        self.check_flat(self.h5file.root.vlarray)
+        self.check_flat(self.h5file.root.vlarray2)
+        values, offsets = self.h5file.root.vlarray.read_flat()
+        self.assertEqual(values.dtype, numpy.int32)
+        self.assertEqual(values.shape, (sum(i % 7 for i in range(20)),))
+        values, offsets = self.h5file.root.vlarray2.read_flat()
+        self.assertEqual(values.shape, (sum(i % 3 for i in range(20)), 2))
+
+    def test01_range(self):
+        """Reading ranges of rows flat."""
+
+        vlarray = self.h5file.root.vlarray
+        self.check_flat(vlarray, 3, 17)
+        self.check_flat(vlarray, 1, 20, 3)
+        self.check_flat(vlarray, 0)
+        self.check_flat(vlarray, -5)
+
+    def test02_empty(self):
+        """Reading an empty range of rows flat."""
+
+        values, offsets = self.h5file.root.vlarray2.read_flat(5, 5)
+        self.assertEqual(values.shape, (0, 2))
+        self.assertEqual(values.dtype, numpy.float64)
+        self.assertEqual(offsets.tolist(), [0])
+
+    def test03_vlstring(self):
+        """Reading a vlstring array flat gives the raw bytes."""
+
+        self._reopen(mode='a')
+        vlarray = self.h5file.create_vlarray('/', 'vlstr', VLStringAtom())
+        vlarray.append("abc")
+        vlarray.append("")
+        vlarray.append("de")
+        values, offsets = vlarray.read_flat()
+        self.assertEqual(values.dtype, numpy.uint8)
+        self.assertEqual(values.tostring(), b"abcde")
+        self.assertEqual(offsets.tolist(), [0, 3, 3, 5])
+
+
 class GetItemRangeTestCase(common.TempFileMixin, TestCase):
     nrows = 100
     open_mode = "w"
@@ -4352,11 +4649,14 @@ def suite():
         theSuite.addTest(unittest.makeSuite(TypesReopenTestCase))
         theSuite.addTest(unittest.makeSuite(TypesNoReopenTestCase))
         theSuite.addTest(unittest.makeSuite(MDTypesNumPyTestCase))
+        theSuite.addTest(unittest.makeSuite(ExtendTestCase))
+        theSuite.addTest(unittest.makeSuite(PagedStorageTestCase))
         theSuite.addTest(unittest.makeSuite(OpenAppendShapeTestCase))
         theSuite.addTest(unittest.makeSuite(CloseAppendShapeTestCase))
         theSuite.addTest(unittest.makeSuite(PythonFlavorTestCase))
         theSuite.addTest(unittest.makeSuite(NumPyFlavorTestCase))
         theSuite.addTest(unittest.makeSuite(ReadRangeTestCase))
+        theSuite.addTest(unittest.makeSuite(ReadFlatTestCase))
         theSuite.addTest(unittest.makeSuite(GetItemRangeTestCase))
         theSuite.addTest(unittest.makeSuite(SetRangeTestCase))
         theSuite.addTest(unittest.makeSuite(ShuffleComprTestCase))
@@ -18,6 +18,8 @@ import os
 import sys
 import warnings
 import subprocess
+import functools
+import threading
 from time import time
 
 import numpy
@@ -245,6 +247,55 @@ def lazyattr(fget):
     return property(newfget, None, None, fget.__doc__)
 
 
+hdf5_lock = threading.RLock()
+"""The lock serializing the calls to the HDF5 library made on behalf of
+the files opened with the ``THREAD_SAFE`` parameter (see
+:data:`parameters.THREAD_SAFE`)."""
+
+
+def synchronized(method):
+    """Run `method` with the lock of its object held.
+
+    This function is intended to be used as a *method decorator* in
+    classes having a ``_v_lock`` attribute.  That attribute is either
+    :data:`hdf5_lock` (for objects in thread-safe files) or None, in which
+    case `method` is just called.
+
+    """
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        lock = self._v_lock
+        if lock is None:
+            return method(self, *args, **kwargs)
+        with lock:
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+# The code of the wrappers created by `synchronized()`
+_locked_code = synchronized(lambda self: None).__code__
+
+
+def get_caller_frame(depth):
+    """Get the frame `depth` levels up the caller in the call stack.
+
+    This works like ``sys._getframe(depth)`` called from the caller,
+    except that the frames of methods wrapped by `synchronized()` are
+    not counted, so that they can look up the variables of the user
+    frame at a fixed depth.
+
+    """
+
+    frame = sys._getframe(1)
+    while depth > 0:
+        frame = frame.f_back
+        if frame.f_code is not _locked_code:
+            depth -= 1
+    return frame
+
+
 def show_stats(explain, tref, encoding=None):
     """Show the used memory (only works for Linux 2.6.x)."""
 
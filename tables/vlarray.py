@@ -18,12 +18,14 @@ import sys
 import numpy
 
 from . import hdf5extension
-from .atom import ObjectAtom, VLStringAtom, VLUnicodeAtom
+from .atom import Int64Atom, ObjectAtom, VLStringAtom, VLUnicodeAtom
+from .earray import EArray
 from .flavor import internal_to_flavor
+from .group import Group
 from .leaf import Leaf, calc_chunksize
 from .utils import (
     convert_to_np_atom, convert_to_np_atom2, idx2long, correct_byteorder,
-    SizeType, is_idx, lazyattr)
+    SizeType, is_idx, lazyattr, synchronized)
 
 from six.moves import range
 from six.moves import zip
@@ -38,6 +40,101 @@ import six
 obversion = "1.4"    # Numeric and numarray flavors are gone.
 
 
+def _get_nobjects(atom, nparr):
+    """Return the number of `atom` objects in a NumPy array."""
+
+    # Check for zero dimensionality array
+    zerodims = numpy.sum(numpy.array(nparr.shape) == 0)
+    if zerodims > 0:
+        # No objects to be added
+        return 0
+    shape = nparr.shape
+    atom_shape = atom.shape
+    shapelen = len(nparr.shape)
+    if isinstance(atom_shape, tuple):
+        atomshapelen = len(atom.shape)
+    else:
+        atom_shape = (atom.shape,)
+        atomshapelen = 1
+    diflen = shapelen - atomshapelen
+    if shape == atom_shape:
+        nobjects = 1
+    elif (diflen == 1 and shape[diflen:] == atom_shape):
+        # Check if the leading dimensions are all ones
+        # if shape[:diflen-1] == (1,)*(diflen-1):
+        #    nobjects = shape[diflen-1]
+        #    shape = shape[diflen:]
+        # It's better to accept only inputs with the exact dimensionality
+        # i.e. a dimensionality only 1 element larger than atom
+        nobjects = shape[0]
+        shape = shape[1:]
+    elif atom_shape == (1,) and shapelen == 1:
+        # Case where shape = (N,) and shape_atom = 1 or (1,)
+        nobjects = shape[0]
+    else:
+        raise ValueError("The object '%s' is composed of elements with "
+                         "shape '%s', which is not compatible with the "
+                         "atom shape ('%s')." % (nparr, shape, atom_shape))
+    return nobjects
+
+
+def _flatten_rows(atom, sequences, offsets=None):
+    """Get the rows to be added to a VLArray of `atom` as a flat array.
+
+    Returns a ``(values, offsets)`` tuple, as described in
+    :meth:`VLArray.extend`.
+
+    """
+
+    statom = atom
+    if not hasattr(atom, 'size'):  # it is a pseudo-atom
+        statom = atom.base
+    atom_shape = statom.shape
+
+    if offsets is None:
+        nparrs = []
+        offsets = [0]
+        for sequence in sequences:
+            if statom is not atom:
+                sequence = atom.toarray(sequence)
+            else:
+                try:  # fastest check in most cases
+                    len(sequence)
+                except TypeError:
+                    raise TypeError("argument is not a sequence")
+            if len(sequence) > 0:
+                nparr = convert_to_np_atom2(sequence, statom)
+                nobjects = _get_nobjects(atom, nparr)
+                if nobjects:
+                    nparrs.append(nparr.reshape((nobjects,) + atom_shape))
+            else:
+                nobjects = 0
+            offsets.append(offsets[-1] + nobjects)
+        if nparrs:
+            values = numpy.concatenate(nparrs)
+        else:
+            values = numpy.empty((0,) + atom_shape, dtype=statom.dtype.base)
+    else:
+        if statom is not atom:
+            raise TypeError("offsets are not supported for "
+                            "pseudo-atoms of kind ``%s``" % atom.kind)
+        values = convert_to_np_atom2(sequences, statom)
+        if values.ndim == 0 or values.shape[1:] != atom_shape:
+            raise ValueError("The object '%s' is composed of elements "
+                             "with shape '%s', which is not compatible "
+                             "with the atom shape ('%s')."
+                             % (values, values.shape[1:], atom_shape))
+    offsets = numpy.array(offsets, dtype=numpy.int64)
+
+    if offsets.ndim != 1 or len(offsets) == 0:
+        raise ValueError("offsets must be a non-empty sequence of integers")
+    if (offsets[0] < 0 or offsets[-1] > len(values) or
+            (offsets[1:] < offsets[:-1]).any()):
+        raise ValueError("offsets must be non-decreasing and within "
+                         "the bounds of the values")
+    return numpy.ascontiguousarray(values), offsets
+
+
 class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
     """This class represents variable length (ragged) arrays in an HDF5 file.
 
@@ -450,39 +547,7 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
     def _getnobjects(self, nparr):
         """Return the number of objects in a NumPy array."""
 
-        # Check for zero dimensionality array
-        zerodims = numpy.sum(numpy.array(nparr.shape) == 0)
-        if zerodims > 0:
-            # No objects to be added
-            return 0
-        shape = nparr.shape
-        atom_shape = self.atom.shape
-        shapelen = len(nparr.shape)
-        if isinstance(atom_shape, tuple):
-            atomshapelen = len(self.atom.shape)
-        else:
-            atom_shape = (self.atom.shape,)
-            atomshapelen = 1
-        diflen = shapelen - atomshapelen
-        if shape == atom_shape:
-            nobjects = 1
-        elif (diflen == 1 and shape[diflen:] == atom_shape):
-            # Check if the leading dimensions are all ones
-            # if shape[:diflen-1] == (1,)*(diflen-1):
-            #    nobjects = shape[diflen-1]
-            #    shape = shape[diflen:]
-            # It's better to accept only inputs with the exact dimensionality
-            # i.e. a dimensionality only 1 element larger than atom
-            nobjects = shape[0]
-            shape = shape[1:]
-        elif atom_shape == (1,) and shapelen == 1:
-            # Case where shape = (N,) and shape_atom = 1 or (1,)
-            nobjects = shape[0]
-        else:
-            raise ValueError("The object '%s' is composed of elements with "
-                             "shape '%s', which is not compatible with the "
-                             "atom shape ('%s')." % (nparr, shape, atom_shape))
-        return nobjects
+        return _get_nobjects(self.atom, nparr)
 
     def get_enum(self):
         """Get the enumerated type associated with this array.
@@ -537,6 +602,33 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
         self._append(nparr, nobjects)
         self.nrows += 1
 
+    def extend(self, sequences, offsets=None):
+        """Add several rows to the end of the dataset at once.
+
+        If offsets is None, sequences is an iterable with a sequence per
+        row to be appended, each one following the rules of
+        :meth:`VLArray.append`.  Else, sequences is a single sequence with
+        the atoms of all the rows one after another, and offsets a
+        sequence of integers with one entry more than rows to append, so
+        that the i-th row is ``sequences[offsets[i]:offsets[i+1]]`` (the
+        layout returned by :meth:`VLArray.read_flat`).  For pseudo-atoms,
+        only the first form is supported.
+
+        All the rows are written with a single extension of the dataset
+        and a single write, which is much faster than calling
+        :meth:`VLArray.append` per row.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        self._v_file._check_writable()
+
+        values, offsets = _flatten_rows(self.atom, sequences, offsets)
+        self._append_rows(values, offsets)
+        self.nrows += len(offsets) - 1
+
     def iterrows(self, start=None, stop=None, step=None):
         """Iterate over the rows of the array.
 
@@ -786,6 +878,7 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
         self._assign_values(coords, value)
 
     # Accessor for the _read_array method in superclass
+    @synchronized
     def read(self, start=None, stop=None, step=1):
         """Get data in the array as a list of objects of the current flavor.
 
@@ -819,6 +912,90 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
             outlistarr = [internal_to_flavor(arr, flavor) for arr in listarr]
         return outlistarr
 
+    def aread(self, start=None, stop=None, step=1):
+        """Get an awaitable future for ``self.read(start, stop, step)``.
+
+        The read does not block the asyncio event loop, see
+        :meth:`Table.aread`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        return aio.get_reader(self._v_file).read(self, start, stop, step)
+
+    def agetitem(self, key):
+        """Get an awaitable future for ``self[key]``.
+
+        See :meth:`VLArray.aread`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        return aio.get_reader(self._v_file).getitem(self, key)
+
+    def aiter_batches(self, batch_rows=None, start=None, stop=None):
+        """Iterate asynchronously over the rows from *start* to *stop*.
+
+        Use it with ``async for``: every iteration yields a list of rows with
+        *batch_rows* rows (by default, the :attr:`Leaf.nrowsinbuf` buffer
+        size of the array), except maybe the last one.  The next batch is
+        read in the thread pool of the file while the current one is used.
+        See :meth:`VLArray.aread`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from . import aio
+
+        self._g_check_open()
+        return aio.get_reader(self._v_file).iter_batches(
+            self, batch_rows, start, stop)
+
+    @synchronized
+    def read_flat(self, start=None, stop=None, step=1):
+        """Get a range of rows as a flat array of values plus their offsets.
+
+        Returns a ``(values, offsets)`` tuple, where values is a single
+        array (of the current flavor) holding the atoms of all the
+        selected rows one after another, and offsets is a NumPy int64
+        array with one entry more than rows selected, so that the i-th
+        row is ``values[offsets[i]:offsets[i+1]]``.  This avoids creating
+        an object per row, which is what dominates the time of
+        :meth:`VLArray.read` when rows are short.
+
+        The start, stop and step parameters have the same meaning as in
+        :meth:`VLArray.read`.  For pseudo-atoms (e.g. vlstring or object),
+        values are given as the underlying bytes (an uint8 array), and it
+        is up to the caller to decode each row.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        start, stop, step = self._process_range_read(start, stop, step)
+        if start == stop:
+            atom = self.atom
+            if not hasattr(atom, 'size'):  # it is a pseudo-atom
+                atom = atom.base
+            values = numpy.empty((0,) + atom.shape, dtype=atom.dtype.base)
+            offsets = numpy.zeros(1, dtype=numpy.int64)
+        else:
+            values, offsets = self._read_array_flat(start, stop, step)
+
+        if hasattr(self.atom, 'size'):
+            values = internal_to_flavor(values, self.flavor)
+        return values, offsets
+
     def _read_coordinates(self, coords):
         """Read rows specified in `coords`."""
         rows = []
@@ -872,3 +1049,534 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
   nrows = %s
   flavor = %r""" % (self, self.atom, self.byteorder, self.nrows,
                     self.flavor)
+
+
+class PagedVLArray(Group, six.Iterator):
+    """A variable length array keeping its rows in paged, filtered storage.
+
+    This is an alternative storage for variable length arrays, created
+    by passing ``storage='paged'`` to :meth:`File.create_vlarray`.
+    Instead of keeping each row as an HDF5 variable-length object in the
+    global heap, the atoms of all the rows are stored one after another
+    in a chunked :class:`EArray` (so that the filters of the array are
+    applied to the data itself) and the end of each row is stored in a
+    second, int64 EArray of offsets.  Both arrays are hidden children of
+    this node, which is a :class:`Group` on disk.
+
+    The interface for reading and writing rows is the one of
+    :class:`VLArray` (append, extend, read, read_flat, iterrows,
+    __getitem__, __setitem__, truncate...).  Reading a range of rows
+    results in a sequential read of the values array, and rows can be
+    compressed by any of the supported filters.  Rows can be updated in
+    place like in VLArray, i.e. provided that their length does not
+    grow.
+
+    .. versionadded:: 3.3
+
+    .. rubric:: PagedVLArray attributes
+
+    .. attribute:: atom
+
+        An Atom instance representing the *type* and *shape* of the
+        atomic objects to be saved.  Pseudo-atoms are supported too.
+
+    .. attribute:: nrow
+
+        On iterators, this is the index of the current row.
+
+    .. attribute:: extdim
+
+       The index of the enlargeable dimension (always 0).
+
+    """
+
+    # Class identifier.
+    _c_classid = 'PAGEDVLARRAY'
+
+    _pseudo_atoms = {
+        'vlstring': VLStringAtom,
+        'vlunicode': VLUnicodeAtom,
+        'object': ObjectAtom,
+    }
+
+    # Node property aliases, like in Leaf
+    attrs = Leaf.attrs
+    title = Leaf.title
+    name = Leaf.name
+
+    # Properties
+    # ~~~~~~~~~~
+    @property
+    def _values(self):
+        "The array with the atoms of all the rows."
+        return self._f_get_child('_p_values')
+
+    @property
+    def _offsets(self):
+        "The array with the offset of the end of each row in `_values`."
+        return self._f_get_child('_p_offsets')
+
+    @property
+    def nrows(self):
+        "The current number of rows in the array."
+        return self._offsets.nrows
+
+    @property
+    def shape(self):
+        "The shape of the stored array."
+        return (self.nrows,)
+
+    @property
+    def dtype(self):
+        """The NumPy ``dtype`` that most closely matches this array."""
+        return self.atom.dtype
+
+    @property
+    def filters(self):
+        "Filter properties for the values of this array."
+        return self._values.filters
+
+    @property
+    def chunkshape(self):
+        "The HDF5 chunk size for the values of this array."
+        return self._values.chunkshape
+
+    @property
+    def byteorder(self):
+        "The byteorder of the values of this array on disk."
+        return self._values.byteorder
+
+    @property
+    def flavor(self):
+        "The type of data object read from this array."
+        return self._values.flavor
+
+    @flavor.setter
+    def flavor(self, flavor):
+        self._values.flavor = flavor
+
+    @property
+    def size_on_disk(self):
+        "The size of this array's data in bytes as it is stored on disk."
+        return self._values.size_on_disk + self._offsets.size_on_disk
+
+    @property
+    def size_in_memory(self):
+        "The size of this array's data in bytes when fully loaded in memory."
+        return self._values.size_in_memory + self._offsets.size_in_memory
+
+    def __init__(self, parentnode, name, atom=None, title="",
+                 filters=None, expectedrows=None,
+                 chunkshape=None, byteorder=None,
+                 new=None, _log=True):
+
+        if new is None:
+            new = atom is not None
+
+        if new:
+            if atom is None:
+                raise ValueError("an atom is needed for creating a "
+                                 "PagedVLArray")
+            if 0 in atom.shape:
+                raise ValueError("When creating VLArrays, none of the "
+                                 "dimensions of the Atom instance can be "
+                                 "zero.")
+            if expectedrows is None:
+                expectedrows = parentnode._v_file.params[
+                    'EXPECTED_ROWS_VLARRAY']
+            if chunkshape is not None:
+                if isinstance(chunkshape, (int, numpy.integer)):
+                    chunkshape = (chunkshape,)
+                chunkshape = tuple(chunkshape)
+                if len(chunkshape) != 1:
+                    raise ValueError("`chunkshape` rank (length) must be 1: "
+                                     "%r" % (chunkshape,))
+
+        self._v_new_atom = atom
+        self._v_new_expectedrows = expectedrows
+        self._v_new_chunkshape = chunkshape
+        self._v_new_byteorder = byteorder
+
+        self.atom = atom
+        """The atom of the objects saved in the array."""
+
+        self.nrow = None
+        """On iterators, this is the index of the current row."""
+
+        self.extdim = 0
+        """The index of the enlargeable dimension (always 0)."""
+
+        self.nrowsinbuf = 100
+        """The number of rows read at once while iterating."""
+
+        super(PagedVLArray, self).__init__(parentnode, name, title, new,
+                                           filters, _log)
+
+    def _g_post_init_hook(self):
+        super(PagedVLArray, self)._g_post_init_hook()
+
+        if not self._v_new:
+            atom = self._values.atom
+            kind = getattr(self._v_attrs, 'PSEUDOATOM', None)
+            if kind is not None:
+                if kind not in self._pseudo_atoms:
+                    raise ValueError(
+                        "pseudo-atom name ``%s`` not known." % kind)
+                atom = self._pseudo_atoms[kind]()
+            self.atom = atom
+            return
+
+        atom = self.atom
+        statom = atom
+        if not hasattr(atom, 'size'):  # it is a pseudo-atom
+            statom = atom.base
+            self._v_attrs.PSEUDOATOM = atom.kind
+        filters = self._v_new_filters
+        if self._v_new_chunkshape is not None:
+            chunkshape = self._v_new_chunkshape + statom.shape
+        else:
+            chunkshape = None
+        EArray(self, '_p_values', statom, (0,) + statom.shape,
+               "Values of the rows", filters, self._v_new_expectedrows,
+               chunkshape, self._v_new_byteorder, _log=False)
+        EArray(self, '_p_offsets', Int64Atom(), (0,), "End of the rows",
+               filters, self._v_new_expectedrows, None,
+               self._v_new_byteorder, _log=False)
+
+    def __len__(self):
+        return self.nrows
+
+    def __repr__(self):
+        """This provides more metainfo in addition to standard __str__"""
+
+        return """%s
+  atom = %r
+  byteorder = %r
+  nrows = %s
+  flavor = %r""" % (self, self.atom, self.byteorder, self.nrows,
+                    self.flavor)
+
+    def get_enum(self):
+        """Get the enumerated type associated with this array.
+
+        See :meth:`VLArray.get_enum`.
+
+        """
+
+        if self.atom.kind != 'enum':
+            raise TypeError("array ``%s`` is not of an enumerated type"
+                            % self._v_pathname)
+
+        return self.atom.enum
+
+    def append(self, sequence):
+        """Add a sequence of data to the end of the dataset.
+
+        See :meth:`VLArray.append`.
+
+        """
+
+        self.extend([sequence])
+
+    def extend(self, sequences, offsets=None):
+        """Add several rows to the end of the dataset at once.
+
+        See :meth:`VLArray.extend`.
+
+        """
+
+        self._g_check_open()
+        self._v_file._check_writable()
+
+        values, offsets = _flatten_rows(self.atom, sequences, offsets)
+        nrows = len(offsets) - 1
+        if nrows == 0:
+            return
+        # Values go first, so that rows are never left pointing nowhere
+        vstart = self._values.nrows
+        values = values[offsets[0]:offsets[-1]]
+        if len(values):
+            self._values.append(values)
+        self._offsets.append(offsets[1:] - offsets[0] + vstart)
+
+    def _row_bounds(self, start, stop):
+        """Get the offsets of the rows in ``range(start, stop)``.
+
+        An array with the start of the first row followed by the end of
+        each row is returned.
+
+        """
+
+        if start > 0:
+            return self._offsets._read(start - 1, stop, 1)
+        bounds = numpy.zeros(stop + 1, dtype=numpy.int64)
+        bounds[1:] = self._offsets._read(0, stop, 1)
+        return bounds
+
+    def _read_flat(self, start, stop, step):
+        """Read a range of rows as a ``(values, offsets)`` tuple."""
+
+        bounds = self._row_bounds(start, stop)
+        begin = bounds[0]
+        if step > 1:
+            rowstarts = bounds[:-1:step]
+            rowends = bounds[1::step]
+        else:
+            rowstarts, rowends = bounds[:-1], bounds[1:]
+        # Read all the values in the range at once and keep the selected
+        # rows from them
+        values = self._values._read(begin, rowends[-1], 1)
+        if step > 1:
+            values = numpy.concatenate(
+                [values[s - begin:e - begin]
+                 for (s, e) in zip(rowstarts, rowends)] or [values[:0]])
+        offsets = numpy.zeros(len(rowends) + 1, dtype=numpy.int64)
+        numpy.cumsum(rowends - rowstarts, out=offsets[1:])
+        return values, offsets
+
+    def read_flat(self, start=None, stop=None, step=1):
+        """Get a range of rows as a flat array of values plus their offsets.
+
+        See :meth:`VLArray.read_flat`.
+
+        """
+
+        self._g_check_open()
+        start, stop, step = self._offsets._process_range_read(
+            start, stop, step)
+        if start == stop:
+            atom = self._values.atom
+            values = numpy.empty((0,) + atom.shape, dtype=atom.dtype.base)
+            offsets = numpy.zeros(1, dtype=numpy.int64)
+        else:
+            values, offsets = self._read_flat(start, stop, step)
+
+        if hasattr(self.atom, 'size'):
+            values = internal_to_flavor(values, self.flavor)
+        return values, offsets
+
+    def read(self, start=None, stop=None, step=1):
+        """Get data in the array as a list of objects of the current flavor.
+
+        See :meth:`VLArray.read`.
+
+        """
+
+        self._g_check_open()
+        start, stop, step = self._offsets._process_range_read(
+            start, stop, step)
+        if start == stop:
+            return []
+        values, offsets = self._read_flat(start, stop, step)
+        listarr = [values[offsets[i]:offsets[i + 1]]
+                   for i in range(len(offsets) - 1)]
+
+        atom = self.atom
+        if not hasattr(atom, 'size'):  # it is a pseudo-atom
+            return [atom.fromarray(arr) for arr in listarr]
+        flavor = self.flavor
+        return [internal_to_flavor(arr, flavor) for arr in listarr]
+
+    def iterrows(self, start=None, stop=None, step=None):
+        """Iterate over the rows of the array.
+
+        See :meth:`VLArray.iterrows`.
+
+        """
+
+        self._g_check_open()
+        start, stop, step = self._offsets._process_range(start, stop, step)
+        return self._iterrows(start, stop, step)
+
+    def _iterrows(self, start, stop, step):
+        nrowsinbuf = self.nrowsinbuf
+        for startb in range(start, stop, step * nrowsinbuf):
+            stopb = min(startb + step * nrowsinbuf, stop)
+            for i, row in enumerate(self.read(startb, stopb, step)):
+                self.nrow = SizeType(startb + i * step)
+                yield row
+
+    def __iter__(self):
+        """Iterate over all the rows of the array.
+
+        See :meth:`VLArray.__iter__`.
+
+        """
+
+        return self.iterrows()
+
+    def __getitem__(self, key):
+        """Get a row or a range of rows from the array.
+
+        See :meth:`VLArray.__getitem__`.
+
+        """
+
+        self._g_check_open()
+        if is_idx(key):
+            key = operator.index(key)
+
+            # Index out of range protection
+            if key >= self.nrows:
+                raise IndexError("Index out of range")
+            if key < 0:
+                # To support negative values
+                key += self.nrows
+            (start, stop, step) = self._offsets._process_range(
+                key, key + 1, 1)
+            return self.read(start, stop, step)[0]
+        elif isinstance(key, slice):
+            start, stop, step = self._offsets._process_range(
+                key.start, key.stop, key.step)
+            return self.read(start, stop, step)
+        # Try with a boolean or point selection
+        elif type(key) in (list, tuple) or isinstance(key, numpy.ndarray):
+            coords = self._offsets._point_selection(key)
+            return [self.read(int(coord))[0] for coord in coords]
+        else:
+            raise IndexError("Invalid index or slice: %r" % (key,))
+
+    def __setitem__(self, key, value):
+        """Set a row, or set of rows, in the array.
+
+        See :meth:`VLArray.__setitem__`.  Rows are overwritten in place,
+        so, as with VLArray, values can not be longer than the rows that
+        they replace.
+
+        """
+
+        self._g_check_open()
+        self._v_file._check_writable()
+
+        if is_idx(key):
+            # If key is not a sequence, convert to it
+            coords = [key]
+            value = [value]
+        elif isinstance(key, slice):
+            start, stop, step = self._offsets._process_range(
+                key.start, key.stop, key.step)
+            coords = range(start, stop, step)
+        # Try with a boolean or point selection
+        elif type(key) in (list, tuple) or isinstance(key, numpy.ndarray):
+            coords = self._offsets._point_selection(key)
+        else:
+            raise IndexError("Invalid index or slice: %r" % (key,))
+
+        atom = self.atom
+        statom = atom
+        if not hasattr(atom, 'size'):  # it is a pseudo-atom
+            statom = atom.base
+        for nrow, object_ in zip(coords, value):
+            nrow = idx2long(nrow)
+            if nrow >= self.nrows:
+                raise IndexError("First index out of range")
+            if nrow < 0:
+                # To support negative values
+                nrow += self.nrows
+            if statom is not atom:
+                object_ = atom.toarray(object_)
+            value_ = convert_to_np_atom(object_, statom)
+
+            begin, end = self._row_bounds(nrow, nrow + 1)
+            nparr = self._values._read(begin, end, 1)
+            if len(value_) > len(nparr):
+                raise ValueError("Length of value (%s) is larger than number "
+                                 "of elements in row (%s)" % (len(value_),
+                                                              len(nparr)))
+            try:
+                nparr[:] = value_
+            except Exception as exc:  # XXX
+                raise ValueError("Value parameter:\n'%r'\n"
+                                 "cannot be converted into an array object "
+                                 "compliant vlarray[%s] row: \n'%r'\n"
+                                 "The error was: <%s>" % (value_, nrow,
+                                                          nparr[:], exc))
+            if nparr.size > 0:
+                self._values[begin:end] = nparr
+
+    def truncate(self, size):
+        """Truncate the array to be size rows.
+
+        If the array previously had more rows, they are lost.  If it had
+        less rows, it is extended with empty rows.
+
+        """
+
+        self._g_check_open()
+        self._v_file._check_writable()
+        nrows = self.nrows
+        if size < nrows:
+            end = self._row_bounds(size, size)[0]
+            self._offsets.truncate(size)
+            self._values.truncate(end)
+        elif size > nrows:
+            end = self._row_bounds(nrows, nrows)[0]
+            self._offsets.append(numpy.repeat(end, size - nrows))
+
+    def flush(self):
+        """Flush pending data to disk."""
+
+        self._f_flush()
+
+    def remove(self):
+        """Remove this array from the hierarchy."""
+
+        self._f_remove(recursive=True)
+
+    def copy(self, newparent=None, newname=None,
+             overwrite=False, createparents=False, **kwargs):
+        """Copy this array and return the new one.
+
+        See :meth:`Leaf.copy`.  The start, stop, step, title, filters,
+        chunkshape and copyuserattrs keyword arguments are supported.
+
+        """
+
+        return self._f_copy(newparent, newname, overwrite, True,
+                            createparents, **kwargs)
+
+    def _g_remove(self, recursive=False, force=False):
+        # The children are hidden, so the group looks empty
+        self._g_close_descendents()
+        super(PagedVLArray, self)._g_remove(True, force)
+
+    def _g_copy(self, newparent, newname, recursive, _log=True, **kwargs):
+        start = kwargs.pop('start', None)
+        stop = kwargs.pop('stop', None)
+        step = kwargs.pop('step', None)
+        title = kwargs.pop('title', self._v_title)
+        filters = kwargs.pop('filters', self.filters)
+        chunkshape = kwargs.pop('chunkshape', self.chunkshape)
+        copyuserattrs = kwargs.pop('copyuserattrs', True)
+        stats = kwargs.pop('stats', None)
+        if chunkshape == 'keep':
+            chunkshape = self.chunkshape
+        if chunkshape is not None:
+            chunkshape = chunkshape[:1]
+
+        new_node = PagedVLArray(
+            newparent, newname, self.atom, title=title, filters=filters,
+            expectedrows=self.nrows, chunkshape=chunkshape,
+            byteorder=self.byteorder, _log=_log)
+        new_node.flavor = self.flavor
+        if copyuserattrs:
+            self._v_attrs._g_copy(new_node._v_attrs, copyclass=True)
+
+        # Copy the rows in blocks, so that the data is not converted
+        start, stop, step = self._offsets._process_range_read(
+            start, stop, step)
+        nrowsinbuf = self._offsets.nrowsinbuf
+        nbytes = 0
+        for start2 in range(start, stop, step * nrowsinbuf):
+            stop2 = min(start2 + step * nrowsinbuf, stop)
+            values, offsets = self._read_flat(start2, stop2, step)
+            vstart = new_node._values.nrows
+            if len(values):
+                new_node._values.append(values)
+            new_node._offsets.append(offsets[1:] + vstart)
+            nbytes += values.nbytes
+
+        if stats is not None:
+            stats['leaves'] += 1
+            stats['bytes'] += nbytes
+        return new_node
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 18, 2026
+#
+# $Id$
+#
+########################################################################
+
+"""Zone maps and Bloom filters: per-chunk summaries of table columns.
+
+A zone map keeps the minimum and maximum values (and, for floating point
+columns, the number of NaNs) of a column for every chunk of its table,
+while a Bloom filter records (with some false positives) the set of
+values in every chunk.  Queries over columns with such summaries use
+them to build a chunkmap (like the ones obtained from indexes) so that
+chunks which can not contain matching rows are neither read nor
+decompressed.
+
+"""
+
+from __future__ import absolute_import
+
+import numpy
+
+from .node import NotLoggedMixin
+from .group import Group
+from .earray import EArray
+from .atom import Atom, Int64Atom, UInt8Atom
+from .filters import Filters
+from .path import join_path, split_path
+
+
+zonemap_filters = Filters(complevel=1, complib='zlib', shuffle=True)
+"""The filters used for the arrays of zone maps."""
+
+
+def _zonemap_name_of(table):
+    return '_p_zonemap_%s' % table._v_name
+
+
+def _zonemap_pathname_of(table):
+    parentpath = split_path(table._v_pathname)[0]
+    return join_path(parentpath, _zonemap_name_of(table))
+
+
+def check_zonemap_dtype(dtype):
+    """Raise a `TypeError` if columns of `dtype` can not have zone maps."""
+
+    if dtype.shape != () or dtype.kind not in 'biufS':
+        raise TypeError("zone maps are not supported for columns "
+                        "of type ``%s``" % dtype)
+
+
+bloom_bits_per_row = 10
+"""The number of bits per row in the Bloom filter of a chunk."""
+
+bloom_nhashes = 7
+"""The number of hash functions used by Bloom filters."""
+
+
+def check_bloom_dtype(dtype):
+    """Raise a `TypeError` if columns of `dtype` can not have Bloom filters.
+    """
+
+    if dtype.shape != () or dtype.kind not in 'iufS':
+        raise TypeError("Bloom filters are not supported for columns "
+                        "of type ``%s``" % dtype)
+    if dtype == numpy.uint64:
+        # They would never be used, since conditions reject these columns
+        raise TypeError("Bloom filters are not supported for columns "
+                        "of type ``uint64``, since they can not be used "
+                        "in conditions")
+
+
+def _bloom_hash(values):
+    """Get 64-bit hashes for the `values` of a column."""
+
+    if values.dtype.kind == 'S':
+        # FNV-1a over the bytes of the (fixed-length) strings
+        data = numpy.ascontiguousarray(values).view(numpy.uint8)
+        data = data.reshape(len(values), -1)
+        keys = numpy.empty(len(values), dtype=numpy.uint64)
+        keys.fill(0xcbf29ce484222325)
+        prime = numpy.uint64(0x100000001b3)
+        for i in range(data.shape[1]):
+            keys ^= data[:, i]
+            keys *= prime
+    elif values.dtype.kind == 'f':
+        # Adding zero turns -0. into 0., which compare equal
+        keys = (values.astype(numpy.float64) + 0.).view(numpy.uint64)
+    else:
+        keys = values.astype(numpy.uint64)
+    # Mix the bits of the keys (splitmix64 finalizer)
+    keys = keys ^ (keys >> numpy.uint64(30))
+    keys *= numpy.uint64(0xbf58476d1ce4e5b9)
+    keys ^= keys >> numpy.uint64(27)
+    keys *= numpy.uint64(0x94d049bb133111eb)
+    keys ^= keys >> numpy.uint64(31)
+    return keys
+
+
+def _bloom_positions(values, nbits):
+    """Get the bit positions of `values` in Bloom filters of `nbits` bits.
+
+    The result has a row of `bloom_nhashes` positions for every value.
+
+    """
+
+    hashes = _bloom_hash(values)
+    h1 = hashes & numpy.uint64(0xffffffff)
+    h2 = (hashes >> numpy.uint64(32)) | numpy.uint64(1)
+    steps = numpy.arange(bloom_nhashes, dtype=numpy.uint64)
+    positions = (h1[:, None] + steps * h2[:, None]) % numpy.uint64(nbits)
+    return positions.astype(numpy.int64)
+
+
+def compute_blooms(values, chunksize, nbytes):
+    """Get the Bloom filters of the `values` in a sequence of chunks.
+
+    An array with `nbytes` rows and a column per chunk is returned.
+
+    """
+
+    nchunks = (len(values) + chunksize - 1) // chunksize
+    nbits = nbytes * 8
+    bits = numpy.zeros((nchunks, nbits), dtype=bool)
+    chunks = numpy.arange(len(values)) // chunksize
+    bits[chunks[:, None], _bloom_positions(values, nbits)] = True
+    return numpy.packbits(bits, axis=1).T
+
+
+def compute_zones(values, chunksize):
+    """Get the zones of the `values` in a sequence of whole chunks.
+
+    A ``(mins, maxs, nans)`` tuple is returned, where `nans` is None
+    for non-floating point values.  The minimum and maximum of a chunk
+    are computed over its non-NaN values, so they are respectively
+    ``inf`` and ``-inf`` for chunks full of NaNs.
+
+    """
+
+    offsets = numpy.arange(0, len(values), chunksize)
+    nans = None
+    if values.dtype.kind == 'S':
+        # Ufuncs do not support strings: sort chunks one by one
+        mins = numpy.empty(len(offsets), dtype=values.dtype)
+        maxs = numpy.empty(len(offsets), dtype=values.dtype)
+        for i, offset in enumerate(offsets):
+            chunk = numpy.sort(values[offset:offset + chunksize])
+            mins[i], maxs[i] = chunk[0], chunk[-1]
+        return mins, maxs, nans
+    vmin = vmax = values
+    if values.dtype.kind == 'f':
+        isnan = numpy.isnan(values)
+        nans = numpy.add.reduceat(isnan, offsets, dtype=numpy.int64)
+        if nans.any():
+            vmin = numpy.where(isnan, numpy.inf, values)
+            vmax = numpy.where(isnan, -numpy.inf, values)
+    mins = numpy.minimum.reduceat(vmin, offsets).astype(values.dtype)
+    maxs = numpy.maximum.reduceat(vmax, offsets).astype(values.dtype)
+    return mins, maxs, nans
+
+
+class ZoneMapG(NotLoggedMixin, Group):
+    """Container for the zone maps and Bloom filters of a table.
+
+    The minimum and maximum values of the column with path name
+    ``colpathname`` are kept in the ``min_<name>`` and ``max_<name>``
+    arrays, where ``<name>`` is the path name with slashes replaced by
+    double underscores.  The number of NaNs in floating point columns
+    is kept in ``nan_<name>``.  The Bloom filters of the column are kept
+    in the ``bloom_<name>`` array, with a row per byte of the filters
+    and a column per chunk (so that probing a value only needs to read
+    a few rows).
+
+    """
+
+    _c_classid = 'ZONEMAP'
+
+    def _g_check_name(self, name):
+        if not name.startswith('_p_zonemap_'):
+            raise ValueError(
+                "names of zone map groups must start with "
+                "``_p_zonemap_``: %s" % name)
+
+    def _colpathnames(self, prefix):
+        return sorted(name[len(prefix):].replace('__', '/')
+                      for name in self._v_children if name.startswith(prefix))
+
+    @property
+    def colpathnames(self):
+        """The path names of the columns having a zone map."""
+        return self._colpathnames('min_')
+
+    @property
+    def bloomcolpathnames(self):
+        """The path names of the columns having a Bloom filter."""
+        return self._colpathnames('bloom_')
+
+    @property
+    def nzones(self):
+        """The smallest number of chunks summarized in the group."""
+
+        return min([self._f_get_child(name).nrows
+                    for name in self._v_children
+                    if name.startswith('min_') or name.startswith('bloom_')]
+                   or [0])
+
+    def _get_array(self, prefix, colpathname):
+        name = prefix + colpathname.replace('/', '__')
+        if name not in self:
+            return None
+        return self._f_get_child(name)
+
+    def _arrays(self, colpathname):
+        return tuple(self._get_array(prefix, colpathname)
+                     for prefix in ('min_', 'max_', 'nan_'))
+
+    def add_column(self, colpathname, dtype, expectedchunks):
+        """Add the (empty) zone map of a column with the given `dtype`."""
+
+        name = colpathname.replace('/', '__')
+        atom = Atom.from_dtype(dtype)
+        kwargs = dict(filters=zonemap_filters, _log=False,
+                      expectedrows=max(expectedchunks, 1))
+        EArray(self, 'min_' + name, atom, (0,), "Chunk minimums", **kwargs)
+        EArray(self, 'max_' + name, atom, (0,), "Chunk maximums", **kwargs)
+        if dtype.kind == 'f':
+            EArray(self, 'nan_' + name, Int64Atom(), (0,),
+                   "Chunk NaN counts", **kwargs)
+
+    def add_bloom(self, colpathname, nbytes, expectedchunks):
+        """Add the (empty) Bloom filters of `nbytes` bytes of a column."""
+
+        name = colpathname.replace('/', '__')
+        # Bloom filters do not compress, so no filters are used
+        EArray(self, 'bloom_' + name, UInt8Atom(), (nbytes, 0),
+               "Chunk Bloom filters", chunkshape=(1, 16 * 1024),
+               expectedrows=max(expectedchunks, 1), _log=False)
+
+    def remove_column(self, colpathname):
+        """Remove the zone map of a column."""
+
+        for array in self._arrays(colpathname):
+            if array is not None:
+                array._g_remove(False, False)
+
+    def remove_bloom(self, colpathname):
+        """Remove the Bloom filters of a column."""
+
+        self._get_array('bloom_', colpathname)._g_remove(False, False)
+
+    def set_zones(self, colpathname, firstchunk, zones):
+        """Save the `zones` of a column, starting at chunk `firstchunk`.
+
+        `zones` is a tuple as returned by `compute_zones()`.  The zone
+        map must not be shorter than `firstchunk`.
+
+        """
+
+        for array, values in zip(self._arrays(colpathname), zones):
+            if array is None:
+                continue
+            nupdate = min(len(values), array.nrows - firstchunk)
+            if nupdate > 0:
+                array[firstchunk:firstchunk + nupdate] = values[:nupdate]
+            if nupdate < len(values):
+                array.append(values[nupdate:])
+
+    def set_blooms(self, colpathname, firstchunk, blooms):
+        """Save the `blooms` of a column, starting at chunk `firstchunk`.
+
+        `blooms` is an array as returned by `compute_blooms()`.  The
+        Bloom filters must not be shorter than `firstchunk`.
+
+        """
+
+        array = self._get_array('bloom_', colpathname)
+        nblooms = blooms.shape[1]
+        nupdate = min(nblooms, array.nrows - firstchunk)
+        if nupdate > 0:
+            array[:, firstchunk:firstchunk + nupdate] = blooms[:, :nupdate]
+        if nupdate < nblooms:
+            array.append(blooms[:, nupdate:])
+
+    def truncate(self, nchunks):
+        """Truncate the summaries longer than `nchunks`."""
+
+        for name in list(self._v_children):
+            array = self._f_get_child(name)
+            if array.nrows > nchunks:
+                array.truncate(nchunks)
+
+    def _get_zone_chunkmap(self, colpathname, ops, lims, nchunks):
+        mins, maxs, nans = self._arrays(colpathname)
+        chunkmap = numpy.ones(nchunks, dtype=bool)
+        if mins is None or mins.nrows != nchunks:
+            return chunkmap
+        mins, maxs = mins.read(), maxs.read()
+        for op, lim in zip(ops, lims):
+            if op == 'lt':
+                chunkmap &= mins < lim
+            elif op == 'le':
+                chunkmap &= mins <= lim
+            elif op == 'gt':
+                chunkmap &= maxs > lim
+            elif op == 'ge':
+                chunkmap &= maxs >= lim
+            elif op == 'eq':
+                chunkmap &= (mins <= lim) & (maxs >= lim)
+        if nans is not None:
+            chunkmap |= nans.read() > 0
+        return chunkmap
+
+    def _get_bloom_chunkmap(self, colpathname, ops, lims, nchunks, dtype):
+        blooms = self._get_array('bloom_', colpathname)
+        chunkmap = numpy.ones(nchunks, dtype=bool)
+        if blooms is None or blooms.nrows != nchunks or ops != ('eq',):
+            return chunkmap
+        value = numpy.array(lims[0]).astype(dtype)
+        if value != lims[0]:
+            # The value is not representable in the column type (or it
+            # is NaN): do not risk missing rows matching after a cast.
+            return chunkmap
+        nbits = blooms.shape[0] * 8
+        for position in _bloom_positions(value.reshape(1), nbits)[0]:
+            mask = 1 << (7 - position % 8)  # bits are packed big-endian
+            chunkmap &= (blooms[position // 8] & mask) != 0
+        return chunkmap
+
+    def get_chunkmap(self, colpathname, ops, lims, nchunks, dtype):
+        """Get the chunkmap for the comparisons `ops` with limits `lims`.
+
+        Comparisons are the ones found in the index expressions of
+        compiled conditions (see the ``conditions`` module) for a column
+        of the given `dtype`, in a table with `nchunks` chunks.  Zone maps
+        are used for every comparison, while Bloom filters are only
+        used for equalities.  Chunks with NaNs are always selected,
+        since they may fulfill negated comparisons.  All the chunks are
+        selected if the summaries are out of sync with the table.
+
+        """
+
+        return (self._get_zone_chunkmap(colpathname, ops, lims, nchunks) &
+                self._get_bloom_chunkmap(colpathname, ops, lims, nchunks,
+                                         dtype))
+
+
+def create_zonemap_group(table):
+    zmgroup = ZoneMapG(
+        table._v_parent, _zonemap_name_of(table),
+        "Zone maps for table " + table._v_pathname, new=True)
+    return zmgroup